@@ -0,0 +1,59 @@
+"""
+DataFrame -> 시트 행 변환 벤치마크 (quality_report._iter_rows vs 기존 iterrows 루프)
+
+실행 예:
+  python benchmarks/bench_export.py --rows 500000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from quality_report import _iter_rows  # noqa: E402
+
+
+def make_lint_df(n: int) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "filename": [f"src/pkg/mod{i % 5000}.py" for i in range(n)],
+        "line": range(1, n + 1),
+        "col": [i % 80 + 1 for i in range(n)],
+        "code": [f"E{700 + i % 50}" for i in range(n)],
+        "message": "Multiple statements on one line (semicolon)",
+    })
+    df.loc[::97, "message"] = None  # 결측 섞기
+    return df
+
+
+def iterrows_rows(df: pd.DataFrame) -> list:
+    # 기존 quality_report의 시트 채우기 방식
+    return [[("" if pd.isna(v) else v) for v in r.tolist()] for _, r in df.iterrows()]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--min-speedup", type=float, default=10.0)
+    args = ap.parse_args()
+
+    df = make_lint_df(args.rows)
+
+    t = time.perf_counter()
+    old = iterrows_rows(df)
+    t_old = time.perf_counter() - t
+
+    t = time.perf_counter()
+    new = list(_iter_rows(df))
+    t_new = time.perf_counter() - t
+
+    assert [list(r) for r in new] == old, "결과가 다릅니다"
+    speedup = t_old / t_new
+    print(f"rows={args.rows} iterrows={t_old:.3f}s _iter_rows={t_new:.3f}s speedup={speedup:.1f}x")
+    if speedup < args.min_speedup:
+        sys.exit(f"speedup {speedup:.1f}x < {args.min_speedup}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+성적 판정 벤치마크 (grade_sheet.grade_workbook vs test1/ex13.py 방식)
+
+합성 성적표(이름, 국어, 영어, 수학, 평균)를 만들어 ex13처럼 load_workbook + ws.cell() + 칸마다 Font로
+판정한 결과와 grade_workbook의 결과가 같은지 확인하고, 각각 새 프로세스(spawn)에서 돌려 시간과
+import 이후 늘어난 최대 RSS를 비교한다.
+
+실행 예:
+  python benchmarks/bench_grade_sheet.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sys
+import multiprocessing
+import resource
+import tempfile
+import time
+
+import openpyxl as op
+from openpyxl.styles.fonts import Font
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_sheet import grade_workbook  # noqa: E402
+
+
+def make_sheet(path: str, n: int) -> None:
+    # 일반 모드로 저장해 Excel 파일처럼 <dimension>이 들어가게 한다(없으면 read-only가 시트를 한 번 더 훑는다)
+    rnd = random.Random(0)
+    wb = op.Workbook()
+    ws = wb.active
+    ws.append(["이름", "국어", "영어", "수학", "평균"])
+    for i in range(n):
+        s = [rnd.randint(0, 100) for _ in range(3)]
+        ws.append([f"학생{i}", *s, sum(s) / 3])
+    wb.save(path)
+
+
+def ex13(src: str, dst: str) -> None:
+    # test1/ex13.py와 같은 방식
+    wb = op.load_workbook(src, data_only=True)
+    ws = wb.active
+    max_row = ws.max_row
+    for row_index in range(2, max_row + 1):
+        average = ws.cell(row=row_index, column=5).value
+        ws.cell(row=row_index, column=6).value = "합격" if average >= 70 else "불합격"
+    for row_index in range(2, max_row + 1):
+        color = "000000FF" if ws.cell(row=row_index, column=6).value == "합격" else "00FF0000"
+        ws.cell(row=row_index, column=6).font = Font(size=12, name="굴림", color=color)
+    wb.save(dst)
+
+
+def _maxrss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(name: str, src: str, dst: str, q) -> None:
+    fn = ex13 if name == "ex13" else grade_workbook
+    base = _maxrss_mb()  # openpyxl 등 import까지의 최대 RSS
+    t = time.perf_counter()
+    fn(src, dst)
+    q.put((time.perf_counter() - t, _maxrss_mb() - base))
+
+
+def measure(name: str, src: str, dst: str):
+    """새 프로세스에서 실행해 (초, import 이후 늘어난 최대 RSS MB)를 돌려준다."""
+    ctx = multiprocessing.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_child, args=(name, src, dst, q))
+    p.start()
+    out = q.get()
+    p.join()
+    return out
+
+
+def results(path: str) -> list:
+    wb = op.load_workbook(path, read_only=True)
+    out = [r[5] for r in wb.active.iter_rows(min_row=2, values_only=True)]
+    wb.close()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--min-speedup", type=float, default=1.0)
+    ap.add_argument("--min-memory-ratio", type=float, default=5.0, help="ex13 대비 최소 메모리 증가량 절감 배수")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as wd:
+        src = os.path.join(wd, "scores.xlsx")
+        make_sheet(src, args.rows)
+        old_dst, new_dst = os.path.join(wd, "old.xlsx"), os.path.join(wd, "new.xlsx")
+        t_old, m_old = measure("ex13", src, old_dst)
+        t_new, m_new = measure("grade_workbook", src, new_dst)
+        assert results(new_dst) == results(old_dst), "판정 결과가 다릅니다"
+
+    speedup, ratio = t_old / t_new, m_old / max(m_new, 1.0)
+    print(f"rows={args.rows:,} ex13={t_old:.2f}s +{m_old:.0f}MB  grade_workbook={t_new:.2f}s +{m_new:.0f}MB  "
+          f"speedup={speedup:.1f}x memory={ratio:.1f}x")
+    if speedup < args.min_speedup or ratio < args.min_memory_ratio:
+        sys.exit(f"speedup {speedup:.1f}x (min {args.min_speedup}x), memory {ratio:.1f}x (min {args.min_memory_ratio}x)")
+
+
+if __name__ == "__main__":
+    main()
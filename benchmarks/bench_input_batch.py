@@ -0,0 +1,75 @@
+"""
+input_test 배치 함수 벤치마크 (weighted_sum / moving_average / revenue / grade: 스칼라 루프 vs NumPy 배치)
+
+같은 합성 데이터로 두 버전을 돌려 결과가 같은지(부동소수는 상대 오차 1e-9 이내) 확인하고 속도를 비교한다.
+
+실행 예:
+  python benchmarks/bench_input_batch.py --rows 2000000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import input_test as m  # noqa: E402
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--window", type=int, default=30)
+    ap.add_argument("--min-speedup", type=float, default=5.0, help="가장 느린 함수의 최소 배속")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.rows
+    values = rng.uniform(0, 100, n)
+    weights = rng.uniform(0, 1, n)
+    qty = rng.integers(0, 20, n).astype(float)
+    qty[::37] = np.nan  # 결측 섞기 (DataFrame 열에서는 NaN, dict 입력에서는 None)
+    price = rng.integers(100, 50_000, n).astype(float)
+    scores = rng.uniform(0, 100, n)
+
+    # 스칼라 버전 입력은 기존 호출 형태(튜플, dict, 파이썬 float)로 미리 만든다
+    pairs = list(zip(values.tolist(), weights.tolist()))
+    seq = values.tolist()
+    items = [{"qty": None if math.isnan(q) else q, "unit_price": p} for q, p in zip(qty.tolist(), price.tolist())]
+    score_list = scores.tolist()
+
+    cases = [
+        ("weighted_sum", lambda: m.weighted_sum(pairs), lambda: m.weighted_sum_batch(values, weights)),
+        ("moving_average", lambda: m.moving_average(seq, args.window),
+         lambda: m.moving_average_batch(values, args.window)),
+        ("revenue", lambda: m.revenue(items), lambda: m.revenue_batch(qty, price)),
+        ("grade", lambda: [m.grade(s) for s in score_list], lambda: m.grade_batch(scores)),
+    ]
+    worst = None
+    for name, scalar, batch in cases:
+        old, t_old = timed(scalar)
+        new, t_new = timed(batch)
+        if isinstance(old, list) and old and isinstance(old[0], str):
+            assert new.tolist() == old, f"{name}: 결과가 다릅니다"
+        elif isinstance(old, list):
+            assert np.allclose(new, old, rtol=1e-9, atol=1e-9), f"{name}: 결과가 다릅니다"
+        else:
+            assert math.isclose(new, old, rel_tol=1e-9), f"{name}: {new} != {old}"
+        speedup = t_old / t_new
+        worst = speedup if worst is None else min(worst, speedup)
+        print(f"{name:15s} rows={n:,} scalar={t_old:.3f}s batch={t_new:.4f}s speedup={speedup:.1f}x")
+
+    if worst < args.min_speedup:
+        sys.exit(f"speedup {worst:.1f}x < {args.min_speedup}x")
+
+
+if __name__ == "__main__":
+    main()
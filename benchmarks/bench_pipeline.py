@@ -0,0 +1,203 @@
+"""
+품질 파이프라인 단계별 벤치마크
+
+합성 입력(synth_inputs.py)을 만들고 read_junit / read_coverage / read_ruff / write_csvs /
+quality_report.main 등을 단계마다 새 프로세스에서 실행해 시간과 최대 RSS를 잰 뒤 JSON으로 저장한다.
+이전 결과와 비교해 허용치보다 느려지거나 메모리가 늘면 종료 코드 1을 돌려준다.
+
+실행 예:
+  python benchmarks/bench_pipeline.py --size 100000 --out bench_results.json
+  python benchmarks/bench_pipeline.py --size 100000 --compare bench_results.json --tolerance 0.2
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import quality_to_csv as q  # noqa: E402
+from synth_inputs import generate  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _parse_all(inputs: dict):
+    return (q.read_junit(Path(inputs["junit"])), q.read_coverage(Path(inputs["coverage"])),
+            q.read_ruff(Path(inputs["ruff"])))
+
+
+# 단계 이름 -> (준비, 측정 대상). 측정 대상은 처리한 행 수를 돌려준다.
+STAGES = {
+    "read_junit": (lambda inp, wd: Path(inp["junit"]), lambda p: len(q.read_junit(p)["cases"])),
+    "stream_junit": (lambda inp, wd: Path(inp["junit"]), lambda p: sum(1 for _ in q.stream_junit(p)["cases"])),
+    "read_coverage": (lambda inp, wd: Path(inp["coverage"]), lambda p: len(q.read_coverage(p)["files"])),
+    "stream_coverage": (lambda inp, wd: Path(inp["coverage"]), lambda p: len(q.stream_coverage(p)["files"])),
+    "read_ruff": (lambda inp, wd: Path(inp["ruff"]), lambda p: len(q.read_ruff(p))),
+    "write_csvs": (
+        lambda inp, wd: (Path(wd) / "csv_bench", *_parse_all(inp)),
+        lambda st: (q.write_csvs(*st), len(st[1]["cases"]) + len(st[3]))[1],
+    ),
+    "quality_report": (
+        lambda inp, wd: wd,
+        lambda wd: (_run_report(wd), None)[1],
+    ),
+}
+
+
+def _run_report(wd: str) -> None:
+    import quality_report
+    quality_report.main(["--input-dir", os.path.join(wd, "csv"), "--output-dir", os.path.join(wd, "report"),
+                         "--no-cache"])
+
+
+def _child(name: str, inputs: dict, workdir: str, conn) -> None:
+    try:
+        setup, run = STAGES[name]
+        state = setup(inputs, workdir)
+        t0, c0 = time.perf_counter(), time.process_time()
+        rows = run(state)
+        conn.send({"seconds": round(time.perf_counter() - t0, 4), "cpu_seconds": round(time.process_time() - c0, 4),
+                   "peak_rss_mb": _peak_rss_mb(), "rows": rows})
+    except Exception as e:  # 한 단계 실패가 전체 벤치마크를 멈추지 않도록
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def _noop() -> None:
+    pass
+
+
+def _mp_context():
+    # 리눅스의 ru_maxrss는 fork/exec 후에도 부모의 최댓값을 물려받으므로, 부모가 작을 때 띄운
+    # forkserver에서 단계 프로세스를 만든다(가능한 플랫폼에서만)
+    if "forkserver" in mp.get_all_start_methods():
+        return mp.get_context("forkserver")
+    return mp.get_context("spawn")
+
+
+def run_stage(name: str, inputs: dict, workdir: str, repeat: int = 1, ctx=None) -> dict:
+    """단계를 새 프로세스에서 repeat번 실행하고 가장 빠른 결과를 돌려준다."""
+    ctx = ctx or _mp_context()
+    best = None
+    for _ in range(repeat):
+        parent, child = ctx.Pipe(duplex=False)
+        p = ctx.Process(target=_child, args=(name, inputs, workdir, child))
+        p.start()
+        child.close()
+        res = parent.recv()
+        p.join()
+        if "error" in res:
+            return res
+        if best is None or res["seconds"] < best["seconds"]:
+            best = res
+    return best
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """baseline보다 tolerance 비율 이상 느려졌거나 메모리가 늘어난 단계 목록."""
+    regressions = []
+    for name, cur in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or "error" in cur or "error" in base:
+            continue
+        for key in ("seconds", "peak_rss_mb"):
+            if cur.get(key) is None or not base.get(key):
+                continue
+            ratio = cur[key] / base[key]
+            mark = "REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"  {name:16s} {key:12s} {base[key]:>10} -> {cur[key]:>10} ({ratio:.2f}x) {mark}")
+            if mark:
+                regressions.append(f"{name}.{key}")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=10_000, help="testcase/diagnostic 수(파일 수는 size/100)")
+    ap.add_argument("--tests", type=int)
+    ap.add_argument("--diagnostics", type=int)
+    ap.add_argument("--files", type=int)
+    ap.add_argument("--lines-per-file", type=int, default=200)
+    ap.add_argument("--stages", default=",".join(STAGES), help="쉼표로 구분한 단계 목록")
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--workdir", help="입력/중간 산출물 위치(기본: 임시 폴더)")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", help="비교할 이전 결과 JSON")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    args = ap.parse_args()
+
+    sizes = {
+        "tests": args.tests or args.size,
+        "diagnostics": args.diagnostics or args.size,
+        "files": args.files or max(10, args.size // 100),
+        "lines_per_file": args.lines_per_file,
+    }
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    ctx = _mp_context()
+    warm = ctx.Process(target=_noop)  # 입력 생성 전에 forkserver를 띄워 둔다
+    warm.start()
+    warm.join()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        t = time.perf_counter()
+        inputs = generate(os.path.join(workdir, "inputs"), sizes["tests"], sizes["files"],
+                          sizes["lines_per_file"], sizes["diagnostics"])
+        print(f"입력 생성: {time.perf_counter() - t:.1f}s", {k: f"{os.path.getsize(p) / 1e6:.1f}MB" for k, p in inputs.items()})
+        if "quality_report" in stages:
+            q.write_csvs(Path(workdir) / "csv", *_parse_all(inputs))
+
+        results = {}
+        for name in stages:
+            results[name] = run_stage(name, inputs, workdir, args.repeat, ctx)
+            print(f"- {name:16s} {results[name]}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+        },
+        "stages": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"비교 기준: {args.compare}")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            sys.exit(f"성능 회귀: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
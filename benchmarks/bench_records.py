@@ -0,0 +1,89 @@
+"""
+파싱 결과 메모리 벤치마크 (quality_records 열 저장소 vs 행마다 dict 리스트)
+
+합성 입력을 read_junit / read_coverage / read_ruff로 읽어 결과가 차지하는 메모리(tracemalloc)와
+캐시 pickle 크기를, 같은 행을 dict 리스트로 들고 있을 때와 비교한다. to_frame()의 숫자 열이
+원본 배열과 메모리를 공유하는지도 확인한다(pandas 필요).
+
+실행 예:
+  python benchmarks/bench_records.py --tests 200000 --diagnostics 1000000
+"""
+import argparse
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import quality_to_csv as q  # noqa: E402
+from synth_inputs import generate  # noqa: E402
+
+
+def retained_mb(build) -> tuple:
+    """build()가 돌려준 객체가 들고 있는 메모리(MB)와 그 객체."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / (1 << 20), obj
+
+
+def as_dicts(parsed: dict) -> dict:
+    # 이전 방식: 행마다 dict (같은 키/값 문자열을 행마다 참조, float/int를 행마다 박싱)
+    return {k: [dict(r) for r in v] if k in ("cases", "files", "uncovered") else v for k, v in parsed.items()}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tests", type=int, default=200_000)
+    ap.add_argument("--files", type=int, default=2_000)
+    ap.add_argument("--lines-per-file", type=int, default=200)
+    ap.add_argument("--diagnostics", type=int, default=1_000_000)
+    ap.add_argument("--min-reduction", type=float, default=2.0, help="dict 대비 최소 메모리 절감 배수")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as wd:
+        inputs = generate(wd, args.tests, args.files, args.lines_per_file, args.diagnostics)
+        cases = [
+            ("junit", lambda: q.read_junit(Path(inputs["junit"]))),
+            ("coverage", lambda: q.read_coverage(Path(inputs["coverage"]))),
+            ("ruff", lambda: q.read_ruff(Path(inputs["ruff"]))),
+        ]
+        worst = None
+        for name, read in cases:
+            new_mb, parsed = retained_mb(read)
+            if isinstance(parsed, dict):
+                old_mb, old = retained_mb(lambda parsed=parsed: as_dicts(parsed))
+                rows = sum(len(parsed[k]) for k in ("cases", "files", "uncovered") if k in parsed)
+            else:
+                old_mb, old = retained_mb(lambda parsed=parsed: [dict(r) for r in parsed])
+                rows = len(parsed)
+            new_pk = len(pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)) / (1 << 20)
+            old_pk = len(pickle.dumps(old, protocol=pickle.HIGHEST_PROTOCOL)) / (1 << 20)
+            ratio = old_mb / new_mb
+            worst = ratio if worst is None else min(worst, ratio)
+            print(f"{name:9s} rows={rows:>9,} dicts={old_mb:8.1f}MB records={new_mb:7.1f}MB ({ratio:4.1f}x) "
+                  f"pickle {old_pk:7.1f}MB -> {new_pk:6.1f}MB")
+            del old, parsed
+
+        lint = q.read_ruff(Path(inputs["ruff"]))
+        df = lint.to_frame()
+        assert np.shares_memory(df["line"].to_numpy(), np.frombuffer(lint.line, dtype=np.intc)), "line 열이 복사됨"
+        print(f"to_frame: {len(df):,} rows, numeric columns share memory with the arrays")
+
+    if worst < args.min_reduction:
+        sys.exit(f"reduction {worst:.1f}x < {args.min_reduction}x")
+
+
+if __name__ == "__main__":
+    main()
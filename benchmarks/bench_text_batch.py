@@ -0,0 +1,88 @@
+"""
+문자열 정규화 벤치마크 (input_test 스칼라 함수를 한 행씩 vs *_batch vs text_batch 파일 처리)
+
+합성 고객 데이터로 함수별 스칼라/배치 시간을 재고 결과가 같은지 확인한 뒤, 같은 데이터를 CSV로 써서
+text_batch.process_file을 --jobs 값별로 돌려 처리량(행/초)과 출력 일치를 본다.
+
+실행 예:
+  python benchmarks/bench_text_batch.py --rows 1000000 --jobs 1 4
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import input_test as m  # noqa: E402
+from text_batch import process_file  # noqa: E402
+
+WORDS = ["Seoul", "  Gangnam-gu ", "Teheran-ro\t", "123", "Apt　 4B", "level", "Never odd or even", "İzmir"]
+
+
+def make_values(n: int) -> list:
+    rnd = random.Random(0)
+    out = []
+    for i in range(n):
+        if i % 3 == 0:
+            out.append(f"user{i % 9973}.{rnd.choice('abcxyz')}@example{i % 7}.com")
+        else:
+            out.append("  ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 6))))
+    return out
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    ap.add_argument("--min-speedup", type=float, default=1.5, help="normalize_whitespace/is_palindrome 최소 배속")
+    args = ap.parse_args()
+
+    values = make_values(args.rows)
+    cases = [
+        ("normalize_whitespace", lambda: [m.normalize_whitespace(s) for s in values],
+         lambda: m.normalize_whitespace_batch(values)),
+        ("is_palindrome", lambda: [m.is_palindrome(s) for s in values], lambda: m.is_palindrome_batch(values)),
+        ("mask_email", lambda: [m.mask_email(s) for s in values], lambda: m.mask_email_batch(values)),
+        ("summarize", lambda: [m.summarize(s, 20) for s in values], lambda: m.summarize_batch(values, 20)),
+    ]
+    slow = []
+    for name, scalar, batch in cases:
+        old, t_old = timed(scalar)
+        new, t_new = timed(batch)
+        assert new == old, f"{name}: 결과가 다릅니다"
+        speedup = t_old / t_new
+        print(f"{name:21s} rows={args.rows:,} scalar={t_old:.3f}s batch={t_new:.3f}s speedup={speedup:.1f}x")
+        if name in ("normalize_whitespace", "is_palindrome") and speedup < args.min_speedup:
+            slow.append(f"{name} {speedup:.1f}x")
+
+    expected = [m.normalize_whitespace(s) for s in values]
+    with tempfile.TemporaryDirectory() as wd:
+        src = os.path.join(wd, "customers.csv")
+        with open(src, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["id", "address"])
+            w.writerows(enumerate(values))
+        for jobs in args.jobs:
+            dst = os.path.join(wd, f"out{jobs}.csv")
+            n, t = timed(lambda dst=dst, jobs=jobs: process_file("normalize_whitespace", src, dst, column="address",
+                                                                 jobs=jobs))
+            with open(dst, encoding="utf-8", newline="") as f:
+                got = [r[1] for r in list(csv.reader(f))[1:]]
+            assert n == args.rows and got == expected, f"jobs={jobs}: 파일 출력이 다릅니다"
+            print(f"process_file jobs={jobs}: {n / t:,.0f} rows/s ({t:.2f}s)")
+
+    if slow:
+        sys.exit("speedup below threshold: " + ", ".join(slow))
+
+
+if __name__ == "__main__":
+    main()
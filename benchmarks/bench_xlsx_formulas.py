@@ -0,0 +1,68 @@
+"""
+수식 캐시값 채우기 벤치마크 (xlsx_formulas.fill_cached_values -> grade_sheet.grade_workbook)
+
+test1/ex12처럼 openpyxl로 =AVERAGE(B{i}:D{i}) 와 =IF(E{i}>=70,...) 수식을 쓴 성적표를 만들고, 캐시값을 채운 뒤
+data_only=True로 읽은 값이 numpy로 직접 계산한 값과 같은지, grade_sheet가 Excel 없이 판정하는지(점수 없음 0개)
+확인한다. 계산 시간과 쓰기 시간, 수식 처리량을 출력한다.
+
+실행 예:
+  python benchmarks/bench_xlsx_formulas.py --rows 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import openpyxl as op
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_sheet import grade_workbook  # noqa: E402
+from xlsx_formulas import evaluate_workbook, write_cached_values  # noqa: E402
+
+
+def make_sheet(path: str, scores: np.ndarray) -> None:
+    # 일반 모드로 저장해 Excel 파일처럼 <dimension>이 들어가게 한다
+    wb = op.Workbook()
+    ws = wb.active
+    ws.append(["이름", "국어", "영어", "수학", "평균", "판정"])
+    for i, row in enumerate(scores.tolist(), start=2):
+        ws.append([f"학생{i}", *row, f"=AVERAGE(B{i}:D{i})", f'=IF(E{i}>=70,"합격","불합격")'])
+    wb.save(path)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50_000)
+    args = ap.parse_args()
+
+    scores = np.random.default_rng(0).integers(0, 101, (args.rows, 3))
+    expected = scores.mean(axis=1)
+    with tempfile.TemporaryDirectory() as d:
+        src, dst, graded = (os.path.join(d, f) for f in ("src.xlsx", "cached.xlsx", "graded.xlsx"))
+        make_sheet(src, scores)
+
+        t = time.perf_counter()
+        values, stats = evaluate_workbook(src)
+        t_eval = time.perf_counter() - t
+        t = time.perf_counter()
+        write_cached_values(src, dst, values)
+        t_write = time.perf_counter() - t
+
+        wb = op.load_workbook(dst, read_only=True, data_only=True)
+        rows = list(wb.active.iter_rows(min_row=2, min_col=5, max_col=6, values_only=True))
+        wb.close()
+        avg = np.array([r[0] for r in rows], dtype=float)
+        assert np.allclose(avg, expected, rtol=1e-12), "AVERAGE 값이 다릅니다"
+        assert [r[1] for r in rows] == np.where(expected >= 70, "합격", "불합격").tolist(), "IF 값이 다릅니다"
+        counts = grade_workbook(dst, graded, score_column="평균")
+        assert counts["missing"] == 0, f"점수 없음 {counts['missing']}개"
+
+    n = stats["evaluated"]
+    print(f"rows={args.rows:,} formulas={n:,} {stats} eval={t_eval:.2f}s write={t_write:.2f}s "
+          f"({n / (t_eval + t_write):,.0f} formulas/s)")
+
+
+if __name__ == "__main__":
+    main()
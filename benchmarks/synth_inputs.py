@@ -0,0 +1,138 @@
+"""
+벤치마크용 합성 입력 생성기 (pytest junit XML, Cobertura coverage XML, ruff JSON)
+
+실행 예:
+  python benchmarks/synth_inputs.py --outdir bench_inputs --tests 100000 --diagnostics 100000
+"""
+import argparse
+import json
+import os
+import random
+from xml.sax.saxutils import quoteattr
+
+RULES = [
+    ("E501", "Line too long"),
+    ("E701", "Multiple statements on one line (colon)"),
+    ("E702", "Multiple statements on one line (semicolon)"),
+    ("F401", "`os` imported but unused"),
+    ("F841", "Local variable `x` is assigned to but never used"),
+    ("E401", "Multiple imports on one line"),
+    ("W291", "Trailing whitespace"),
+    ("B006", "Do not use mutable data structures for argument defaults"),
+]
+
+
+def write_junit(path: str, tests: int, suites: int = 10, fail_rate: float = 0.01,
+                skip_rate: float = 0.02, seed: int = 0) -> None:
+    rnd = random.Random(seed)
+    per_suite = max(1, tests // suites)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?><testsuites name="pytest tests">')
+        done = 0
+        for s in range(suites):
+            n = per_suite if s < suites - 1 else tests - done
+            cases, fails, skips, t_sum = [], 0, 0, 0.0
+            for i in range(n):
+                t = round(rnd.expovariate(50), 3)
+                t_sum += t
+                head = f'<testcase classname="pkg.mod{s}.Test{i % 50}" name="test_{done + i}" time="{t}"'
+                r = rnd.random()
+                if r < fail_rate:
+                    fails += 1
+                    cases.append(head + '><failure message="assert 1 == 2">AssertionError</failure></testcase>')
+                elif r < fail_rate + skip_rate:
+                    skips += 1
+                    cases.append(head + '><skipped message="skip" /></testcase>')
+                else:
+                    cases.append(head + " />")
+            f.write(f'<testsuite name="pytest{s}" errors="0" failures="{fails}" skipped="{skips}" '
+                    f'tests="{n}" time="{t_sum:.3f}">')
+            f.write("".join(cases))
+            f.write("</testsuite>")
+            done += n
+        f.write("</testsuites>")
+
+
+def write_coverage(path: str, files: int, lines_per_file: int = 200, hit_rate: float = 0.7,
+                   seed: int = 0) -> None:
+    rnd = random.Random(seed)
+    total_valid = total_cov = 0
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        for i in range(files):
+            hits = [1 if rnd.random() < hit_rate else 0 for _ in range(lines_per_file)]
+            covered = sum(hits)
+            total_valid += lines_per_file
+            total_cov += covered
+            fn = f"pkg/mod{i // 100}/file{i}.py"
+            f.write(f'<class name={quoteattr(os.path.basename(fn))} filename={quoteattr(fn)} complexity="0" '
+                    f'line-rate="{covered / lines_per_file:.4f}" branch-rate="0"><methods/><lines>')
+            f.write("".join(f'<line number="{n}" hits="{h}"/>' for n, h in enumerate(hits, 1)))
+            f.write("</lines></class>")
+    rate = total_cov / total_valid if total_valid else 0.0
+    with open(path, "w", encoding="utf-8") as out, open(path + ".tmp", encoding="utf-8") as body:
+        out.write(f'<?xml version="1.0" ?><coverage version="7.11.2" lines-valid="{total_valid}" '
+                  f'lines-covered="{total_cov}" line-rate="{rate:.4f}" branches-covered="0" '
+                  f'branches-valid="0" branch-rate="0" complexity="0"><sources><source>.</source></sources>'
+                  '<packages><package name="." line-rate="0" branch-rate="0" complexity="0"><classes>')
+        for chunk in iter(lambda: body.read(1 << 20), ""):
+            out.write(chunk)
+        out.write("</classes></package></packages></coverage>")
+    os.remove(path + ".tmp")
+
+
+def write_ruff(path: str, diagnostics: int, files: int = 1000, seed: int = 0) -> None:
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(diagnostics):
+            code, msg = rnd.choice(RULES)
+            row, col = rnd.randint(1, 2000), rnd.randint(1, 120)
+            item = {
+                "cell": None,
+                "code": code,
+                "end_location": {"column": col + 5, "row": row},
+                "filename": f"/work/repo/pkg/mod{i % files // 100}/file{i % files}.py",
+                "fix": {
+                    "applicability": "safe",
+                    "edits": [{"content": "", "end_location": {"column": col + 5, "row": row},
+                               "location": {"column": col, "row": row}}],
+                    "message": "Remove",
+                } if code in ("F401", "W291") else None,
+                "location": {"column": col, "row": row},
+                "message": msg,
+                "noqa_row": row,
+                "url": f"https://docs.astral.sh/ruff/rules/{code.lower()}",
+            }
+            f.write(("," if i else "") + json.dumps(item))
+        f.write("]")
+
+
+def generate(outdir: str, tests: int, files: int, lines_per_file: int, diagnostics: int, seed: int = 0) -> dict:
+    os.makedirs(outdir, exist_ok=True)
+    paths = {
+        "junit": os.path.join(outdir, "pytest.xml"),
+        "coverage": os.path.join(outdir, "coverage.xml"),
+        "ruff": os.path.join(outdir, "ruff.json"),
+    }
+    write_junit(paths["junit"], tests, seed=seed)
+    write_coverage(paths["coverage"], files, lines_per_file, seed=seed)
+    write_ruff(paths["ruff"], diagnostics, seed=seed)
+    return paths
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--outdir", default="bench_inputs")
+    ap.add_argument("--tests", type=int, default=10_000)
+    ap.add_argument("--files", type=int, default=1_000)
+    ap.add_argument("--lines-per-file", type=int, default=200)
+    ap.add_argument("--diagnostics", type=int, default=10_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    paths = generate(args.outdir, args.tests, args.files, args.lines_per_file, args.diagnostics, args.seed)
+    for k, p in paths.items():
+        print(f"- {k}: {p} ({os.path.getsize(p) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
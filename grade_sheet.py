@@ -0,0 +1,165 @@
+# grade_sheet.py
+"""
+엑셀 성적표 합격/불합격 판정 (test1/ex13.py의 일반화)
+
+ex13은 load_workbook으로 통합문서 전체를 메모리에 올리고 ws.cell()로 한 칸씩 읽고 써서, 수십만 행이면
+메모리가 모자라고 느리다. 여기서는 read-only 모드의 iter_rows(values_only=True)로 한 행씩 읽고
+write-only 통합문서에 바로 써 나가므로 행 수와 상관없이 메모리가 일정하다. 결과 칸의 글꼴은 합격/불합격
+두 개만 만들어 모든 칸이 함께 쓴다.
+
+- 점수 열: 열 문자(E), 1부터 시작하는 번호(5), 또는 머리글 이름(평균)
+- 결과 열: 기본은 마지막 열 다음에 추가, --result-column을 주면 그 열에 덮어쓴다
+- 점수가 비었거나 숫자가 아니면 결과를 비워 두고 개수만 센다(수식만 있고 캐시값이 없는 파일은
+  xlsx_formulas.py로 먼저 채운다)
+- 값만 복사한다(원본 서식/수식은 옮기지 않는다)
+
+실행 예:
+  python grade_sheet.py result.xlsx con_result.xlsx                      # ex13과 같은 동작 (E열, 70점)
+  python grade_sheet.py scores.xlsx graded.xlsx --score-column 평균 --threshold 60 --pass-label P --fail-label F
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from itertools import islice
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles.fonts import Font
+from openpyxl.utils import column_index_from_string
+
+PASS_LABEL, FAIL_LABEL = "합격", "불합격"
+PASS_COLOR, FAIL_COLOR = "000000FF", "00FF0000"
+
+
+def _column_index(spec, header) -> int:
+    """열 지정(문자/번호/머리글 이름)을 0부터 시작하는 번호로 바꾼다."""
+    spec = str(spec).strip()
+    if spec.isdigit():
+        if int(spec) < 1:
+            raise ValueError(f"열 번호는 1부터 시작합니다: {spec}")
+        return int(spec) - 1
+    if header and spec in header:
+        return list(header).index(spec)
+    try:
+        return column_index_from_string(spec.upper()) - 1
+    except ValueError:
+        names = ", ".join(str(h) for h in header or () if h is not None)
+        raise ValueError(f"열을 찾을 수 없습니다: {spec} (머리글: {names})")
+
+
+def _score(v):
+    if isinstance(v, bool) or v is None:
+        return None
+    if isinstance(v, (int, float)):
+        return v
+    try:
+        return float(str(v).strip())
+    except ValueError:
+        return None
+
+
+def grade_rows(rows, score_idx: int, result_idx: int, threshold: float = 70, pass_value=PASS_LABEL,
+               fail_value=FAIL_LABEL, counts: dict | None = None):
+    """값 행 이터러블의 각 행에 판정 결과를 result_idx 칸에 넣어 내보낸다(모자란 칸은 None으로 채운다).
+    pass_value/fail_value는 그대로 넣을 값(라벨 문자열이나 서식 입힌 셀)이다."""
+    counts = {"pass": 0, "fail": 0, "missing": 0} if counts is None else counts
+    width = result_idx + 1
+    for row in rows:
+        row = list(row)
+        if not any(v is not None for v in row):  # 빈 행은 판정하지 않고 그대로
+            yield row
+            continue
+        if len(row) < width:
+            row.extend([None] * (width - len(row)))
+        s = _score(row[score_idx]) if score_idx < len(row) else None
+        if s is None:
+            counts["missing"] += 1
+            row[result_idx] = None
+        elif s >= threshold:
+            counts["pass"] += 1
+            row[result_idx] = pass_value
+        else:
+            counts["fail"] += 1
+            row[result_idx] = fail_value
+        yield row
+
+
+def grade_workbook(src: str, dst: str, score_column="E", result_column=None, threshold: float = 70,
+                   pass_label: str = PASS_LABEL, fail_label: str = FAIL_LABEL, sheet: str | None = None,
+                   result_header: str = "결과", header_rows: int = 1, styled: bool = True) -> dict:
+    """src 시트를 한 행씩 판정해 dst에 쓴다. {"pass", "fail", "missing", "rows"} 개수를 돌려준다."""
+    wb_in = load_workbook(src, read_only=True, data_only=True)
+    try:
+        ws_in = wb_in[sheet] if sheet else wb_in.active
+        rows = ws_in.iter_rows(values_only=True)
+        header = [list(r) for r in islice(rows, header_rows)]
+        last = header[-1] if header else []
+        score_idx = _column_index(score_column, last)
+        if result_column is None:
+            while last and last[-1] is None:
+                last.pop()
+            result_idx = max(len(last), score_idx + 1)
+        else:
+            result_idx = _column_index(result_column, last)
+        if result_idx == score_idx:
+            raise ValueError("결과 열이 점수 열과 같습니다")
+
+        wb_out = Workbook(write_only=True)
+        ws_out = wb_out.create_sheet(ws_in.title)
+        for i, h in enumerate(header):
+            h.extend([None] * (result_idx + 1 - len(h)))
+            if i == len(header) - 1 and h[result_idx] is None:
+                h[result_idx] = result_header
+            ws_out.append(h)
+
+        pass_value, fail_value = pass_label, fail_label
+        if styled:
+            # 결과 칸마다 새 Font를 만들지 않고 두 셀 값을 같이 쓴다(write-only 셀은 append 시점에 직렬화된다)
+            pass_value = WriteOnlyCell(ws_out, value=pass_label)
+            pass_value.font = Font(size=12, name="굴림", color=PASS_COLOR)
+            fail_value = WriteOnlyCell(ws_out, value=fail_label)
+            fail_value.font = Font(size=12, name="굴림", color=FAIL_COLOR)
+
+        counts = {"pass": 0, "fail": 0, "missing": 0}
+        for row in grade_rows(rows, score_idx, result_idx, threshold, pass_value, fail_value, counts):
+            ws_out.append(row)
+        wb_out.save(dst)
+    finally:
+        wb_in.close()
+    counts["rows"] = counts["pass"] + counts["fail"] + counts["missing"]
+    return counts
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="엑셀 시트의 점수 열로 합격/불합격을 판정해 새 파일로 저장")
+    ap.add_argument("src")
+    ap.add_argument("dst")
+    ap.add_argument("--sheet", help="시트 이름(기본: 활성 시트)")
+    ap.add_argument("--score-column", default="E", help="점수 열: 문자(E), 번호(5) 또는 머리글 이름")
+    ap.add_argument("--result-column", help="결과 열(기본: 마지막 열 다음)")
+    ap.add_argument("--result-header", default="결과", help="새 결과 열의 머리글")
+    ap.add_argument("--threshold", type=float, default=70, help="이 점수 이상이면 합격")
+    ap.add_argument("--pass-label", default=PASS_LABEL)
+    ap.add_argument("--fail-label", default=FAIL_LABEL)
+    ap.add_argument("--header-rows", type=int, default=1, help="판정하지 않고 그대로 복사할 머리글 행 수")
+    ap.add_argument("--no-style", action="store_true", help="결과 칸에 글꼴 색을 입히지 않음")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        counts = grade_workbook(args.src, args.dst, args.score_column, args.result_column, args.threshold,
+                                args.pass_label, args.fail_label, args.sheet, args.result_header,
+                                args.header_rows, not args.no_style)
+    except (ValueError, KeyError) as e:
+        ap.error(str(e))
+    print(f"✔ {args.dst}: {counts['rows']:,}행 (합격 {counts['pass']:,}, 불합격 {counts['fail']:,}, "
+          f"점수 없음 {counts['missing']:,}) {time.perf_counter() - t0:.2f}s")
+    if counts["missing"]:
+        print(f"⚠ 점수가 비었거나 숫자가 아닌 행 {counts['missing']:,}개는 결과를 비워 두었습니다 "
+              f"(수식만 있고 저장된 값이 없는 파일이면 먼저 python xlsx_formulas.py {args.src} 로 캐시값을 채우세요)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
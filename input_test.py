@@ -16,7 +16,9 @@
 # -------------------------
 
 from __future__ import annotations
-from typing import Iterable, Sequence
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple, Sequence
+import math
 import re
 
 
@@ -79,7 +81,214 @@ def grade(total: float) -> str:
     return "F"
 
 
+# -------------------------
+# 배치(NumPy) 버전: 배열/DataFrame 열을 한 번에 계산 (numpy 필요)
+# -------------------------
+
+GRADE_EDGES = (60, 70, 80, 90)
+GRADE_LABELS = ("F", "D", "C", "B", "A")
+
+
+def _np():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise RuntimeError("배치 계산에는 numpy가 필요합니다: pip install numpy") from e
+    return np
+
+
+def _as_float_array(x):
+    """리스트/ndarray/Series를 float64 배열로 바꾼다. None/NA는 NaN이 된다."""
+    np = _np()
+    if hasattr(x, "to_numpy"):  # pandas Series (nullable dtype 포함)
+        return x.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(x, dtype=np.float64)
+
+
+def weighted_sum_batch(values, weights) -> float:
+    """
+    weighted_sum의 배열 버전. values와 weights는 같은 길이의 1차원 배열(또는 열)이다.
+    내적(np.dot) 한 번으로 계산한다. 합산 순서가 달라 큰 배열에서는 마지막 자리 반올림이 다를 수 있다.
+    """
+    np = _np()
+    v, w = _as_float_array(values), _as_float_array(weights)
+    if v.shape != w.shape:
+        raise ValueError("values and weights must have the same length")
+    return float(np.dot(v, w))
+
+
+def moving_average_batch(seq, window: int):
+    """
+    moving_average의 배열 버전. 누적합 차이로 모든 윈도우 합을 한 번에 구해 길이 n - window + 1의 ndarray를 반환한다.
+    """
+    np = _np()
+    if window <= 0:
+        raise ValueError("window must be >= 1")
+    a = _as_float_array(seq)
+    if window > len(a):
+        return np.empty(0)
+    c = np.concatenate(([0.0], np.cumsum(a)))
+    return (c[window:] - c[:-window]) / window
+
+
+def revenue_batch(qty, unit_price) -> float:
+    """
+    revenue의 배열 버전. qty와 unit_price는 같은 길이의 열이며 결측(None/NaN/NA)은 0으로 처리한다.
+    """
+    np = _np()
+    q, p = _as_float_array(qty), _as_float_array(unit_price)
+    if q.shape != p.shape:
+        raise ValueError("qty and unit_price must have the same length")
+    q = np.where(np.isnan(q), 0.0, q)
+    p = np.where(np.isnan(p), 0.0, p)
+    return float(np.dot(q, p))
+
+
+def grade_batch(totals):
+    """
+    grade의 배열 버전. 구간 경계(GRADE_EDGES)에서 searchsorted로 등급을 골라 문자열 ndarray를 반환한다.
+    NaN은 grade와 같이 "F"가 된다.
+    """
+    np = _np()
+    t = _as_float_array(totals)
+    idx = np.searchsorted(np.asarray(GRADE_EDGES, dtype=np.float64), t, side="right")
+    idx[np.isnan(t)] = 0
+    return np.asarray(GRADE_LABELS)[idx]
+
+
+# -------------------------
+# 스트리밍 버전: 끝이 없는 이터레이터를 한 값씩 소비 (메모리 O(window))
+# -------------------------
+
+class RollingStat(NamedTuple):
+    window: int
+    mean: float
+    var: float  # 모분산 (ddof=0)
+    min: float
+    max: float
+
+
+class _CompensatedSum:
+    """Neumaier 보정 합. 더하고 빼기를 수없이 반복해도 반올림 오차가 쌓이지 않는다."""
+
+    __slots__ = ("s", "c")
+
+    def __init__(self):
+        self.s = 0.0
+        self.c = 0.0
+
+    def add(self, x: float) -> None:
+        t = self.s + x
+        if abs(self.s) >= abs(x):
+            self.c += (self.s - t) + x
+        else:
+            self.c += (x - t) + self.s
+        self.s = t
+
+    def value(self) -> float:
+        return self.s + self.c
+
+    def reset(self, total: float = 0.0) -> None:
+        self.s = total
+        self.c = 0.0
+
+
+class RollingStats:
+    """
+    여러 윈도우 크기의 이동 평균/분산/최소/최대를 한 번에 갱신하는 누산기.
+    값은 가장 큰 윈도우 크기의 링 버퍼에만 보관하고, 최소/최대는 윈도우마다 단조 deque로 구한다.
+    분산은 윈도우 안의 값 K를 기준으로 Σ(x-K), Σ(x-K)²를 보정 합으로 유지해 구하고, K가 윈도우를 벗어나면
+    (w번에 한 번) 새 값을 K로 삼아 버퍼에서 두 합을 math.fsum으로 다시 계산한다. 값이 1e8 근처에서 0 근처로
+    바뀌어도 오차가 남거나 쌓이지 않는다.
+    update()는 윈도우가 다 찬 것만 {window: RollingStat} 으로 반환한다(moving_average와 같은 시작점).
+    """
+
+    def __init__(self, windows: Iterable[int] = (5,)):
+        ws = sorted({int(w) for w in windows})
+        if not ws or ws[0] <= 0:
+            raise ValueError("window must be >= 1")
+        self.windows = tuple(ws)
+        self.count = 0
+        self._buf = [0.0] * ws[-1]
+        self._sums = [_CompensatedSum() for _ in ws]
+        self._dev = [_CompensatedSum() for _ in ws]  # Σ(x-K)
+        self._dev2 = [_CompensatedSum() for _ in ws]  # Σ(x-K)²
+        self._shift = [0.0] * len(ws)  # K
+        self._shift_at = [-w for w in ws]  # K가 들어온 위치
+        self._mins: list[deque] = [deque() for _ in ws]
+        self._maxs: list[deque] = [deque() for _ in ws]
+
+    def update(self, x: float) -> dict[int, RollingStat]:
+        x = float(x)
+        i = self.count
+        buf = self._buf
+        out = {}
+        for k, w in enumerate(self.windows):
+            s, dev, dev2 = self._sums[k], self._dev[k], self._dev2[k]
+            n = min(i + 1, w)
+            # 다음 윈도우 = 이전 합 + 새로 들어온 값 - 윈도우에서 빠지는 값
+            old = buf[(i - w) % len(buf)] if i >= w else None
+            s.add(x)
+            if old is not None:
+                s.add(-old)
+            mean = s.value() / n
+            if i - self._shift_at[k] >= w:
+                shift = self._shift[k] = x
+                self._shift_at[k] = i
+                d = [buf[j % len(buf)] - shift for j in range(i - n + 1, i)] + [0.0]
+                dev.reset(math.fsum(d))
+                dev2.reset(math.fsum(v * v for v in d))
+            else:
+                shift = self._shift[k]
+                dx = x - shift
+                dev.add(dx)
+                dev2.add(dx * dx)
+                if old is not None:
+                    do = old - shift
+                    dev.add(-do)
+                    dev2.add(-do * do)
+            d1 = dev.value()
+            var = max(dev2.value() - d1 * d1 / n, 0.0) / n
+
+            mins, maxs = self._mins[k], self._maxs[k]
+            while mins and mins[-1][1] >= x:
+                mins.pop()
+            mins.append((i, x))
+            while maxs and maxs[-1][1] <= x:
+                maxs.pop()
+            maxs.append((i, x))
+            if mins[0][0] <= i - w:
+                mins.popleft()
+            if maxs[0][0] <= i - w:
+                maxs.popleft()
+
+            if i + 1 >= w:
+                out[w] = RollingStat(w, mean, var, mins[0][1], maxs[0][1])
+        buf[i % len(buf)] = x
+        self.count = i + 1
+        return out
+
+
+def rolling_stats(values: Iterable[float], windows: Iterable[int] = (5,)) -> Iterator[dict[int, RollingStat]]:
+    """
+    values를 한 값씩 소비하며 매 단계 RollingStats.update()의 결과를 내보낸다.
+    """
+    acc = RollingStats(windows)
+    for x in values:
+        yield acc.update(x)
+
+
+def moving_average_stream(values: Iterable[float], window: int) -> Iterator[float]:
+    """
+    moving_average의 스트리밍 버전. 시퀀스 대신 아무 이터러블이나 받아 윈도우가 찰 때마다 평균을 하나씩 낸다.
+    """
+    for stats in rolling_stats(values, (window,)):
+        if stats:
+            yield stats[window].mean
+
+
 _space_re = re.compile(r"\s+")
+_non_alnum_re = re.compile(r"[^0-9a-zA-Z]")
 
 
 def normalize_whitespace(s: str) -> str:
@@ -97,7 +306,7 @@ def is_palindrome(s: str) -> bool:
     """
     if s is None:
         return False
-    cleaned = re.sub(r"[^0-9a-zA-Z]", "", s).lower()
+    cleaned = _non_alnum_re.sub("", s).lower()
     return cleaned == cleaned[::-1]
 
 
@@ -129,6 +338,66 @@ def mask_email(email: str) -> str:
     return masked + "@" + domain
 
 
+# -------------------------
+# 문자열 배치 버전: 여러 값을 한 번에 처리 (결과는 스칼라 함수와 같다)
+# -------------------------
+
+# [^0-9a-zA-Z] 정규식과 같은 정리: 비 ASCII 문자는 encode("ascii", "ignore")로, ASCII 기호/공백은 bytes.translate로 지운다
+_NON_ALNUM_BYTES = bytes(c for c in range(128) if not chr(c).isalnum())
+
+
+def normalize_whitespace_batch(values: Iterable[str]) -> list[str]:
+    """
+    normalize_whitespace의 배치 버전. str.split()은 정규식 \\s와 같은 공백 문자로 나누므로 결과가 같다.
+    None이 섞여 있으면 normalize_whitespace와 같은 예외를 낸다.
+    """
+    values = list(values)
+    join = " ".join
+    try:
+        return [join(s.split()) for s in values]
+    except (AttributeError, TypeError):
+        return [normalize_whitespace(s) for s in values]
+
+
+def is_palindrome_batch(values: Iterable[str]) -> list[bool]:
+    """
+    is_palindrome의 배치 버전. None은 False.
+    """
+    values = list(values)
+    encode, drop = str.encode, _NON_ALNUM_BYTES
+    try:
+        return [(b := encode(s, "ascii", "ignore").translate(None, drop).lower()) == b[::-1] for s in values]
+    except (AttributeError, TypeError):
+        return [is_palindrome(s) for s in values]
+
+
+def summarize_batch(values: Iterable[str], max_len: int = 80) -> list[str]:
+    """
+    summarize의 배치 버전.
+    """
+    if max_len < 4:
+        raise ValueError("max_len must be >= 4")
+    cut = max_len - 3
+    return [t if len(t) <= max_len else t[:cut] + "..." for t in values]
+
+
+def mask_email_batch(values: Iterable[str]) -> list[str]:
+    """
+    mask_email의 배치 버전. 값마다 함수를 부르지 않고, "@"가 없으면 바로 넘기고 있으면 partition 한 번으로
+    나눠 로컬파트 길이별 분기를 한 식으로 처리한다. None이 섞여 있으면 mask_email과 같은 TypeError를 낸다.
+    """
+    out: list[str] = []
+    append = out.append
+    for e in values:
+        if "@" not in e:
+            append(e)
+            continue
+        local, _, domain = e.partition("@")
+        n = len(local)
+        append((local[0] + "*" * (n - 2) + local[-1] if n > 2 else local[0] + "*" if n == 2 else "*") + "@" + domain)
+    return out
+
+
 # -------------------------
 # 테스트 코드 (pytest가 이 파일에서 바로 수집)
 # -------------------------
@@ -167,6 +436,79 @@ def test_revenue_and_grade():
     assert grade(12) == "F"
 
 
+def test_batch_matches_scalar():
+    import pytest
+    np = pytest.importorskip("numpy")
+    assert weighted_sum_batch([10, 20], [0.5, 0.5]) == weighted_sum([(10, 0.5), (20, 0.5)])
+    assert weighted_sum_batch([], []) == 0.0
+    assert moving_average_batch([1, 2, 3, 4], 2).tolist() == moving_average([1, 2, 3, 4], 2)
+    assert moving_average_batch([1, 2, 3], 1).tolist() == [1.0, 2.0, 3.0]
+    assert moving_average_batch([1, 2, 3], 5).tolist() == []
+    with pytest.raises(ValueError):
+        moving_average_batch([1, 2, 3], 0)
+    assert revenue_batch([2, 1, None], [5000, 12000, 9999]) == 22000.0
+    assert revenue_batch(np.array([2, np.nan]), np.array([np.nan, 3])) == 0.0
+    scores = [95, 90, 89.9, 81, 74, 60, 59.99, 12, float("nan")]
+    assert grade_batch(scores).tolist() == [grade(s) for s in scores]
+
+
+def test_batch_dataframe_columns():
+    import pytest
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"qty": pd.array([2, 1, None], dtype="Int64"), "unit_price": [5000, 12000, 9999]})
+    assert revenue_batch(df["qty"], df["unit_price"]) == revenue(df.to_dict("records"))
+    assert grade_batch(pd.Series([95.0, 74.0])).tolist() == ["A", "C"]
+
+
+def test_moving_average_stream():
+    import pytest
+    assert list(moving_average_stream(iter([1, 2, 3, 4]), 2)) == moving_average([1, 2, 3, 4], 2)
+    assert list(moving_average_stream((x for x in [1, 2, 3]), 1)) == [1.0, 2.0, 3.0]
+    assert list(moving_average_stream([1, 2, 3], 5)) == []
+    with pytest.raises(ValueError):
+        list(moving_average_stream([1, 2, 3], 0))
+
+
+def test_rolling_stats_windows():
+    import random
+    import statistics
+    rnd = random.Random(7)
+    data = [rnd.uniform(-50, 50) for _ in range(300)]
+    for i, stats in enumerate(rolling_stats(data, (1, 4, 25))):
+        assert sorted(stats) == [w for w in (1, 4, 25) if i + 1 >= w]
+        for w, st in stats.items():
+            win = data[i + 1 - w:i + 1]
+            assert st.min == min(win) and st.max == max(win)
+            assert abs(st.mean - statistics.fmean(win)) < 1e-9
+            assert abs(st.var - statistics.pvariance(win)) < 1e-7
+
+
+def test_rolling_stats_no_drift():
+    import math
+    pattern = [0.1, 1e6 + 0.7, 0.2, -3.3, 1e-3]
+    data = pattern * 10000  # 단순 s += new - old 는 여기서 이미 -1.0329996... 로 어긋난다
+    last = None
+    for last in moving_average_stream(data, 3):
+        pass
+    assert last == math.fsum(data[-3:]) / 3
+
+
+def test_rolling_stats_large_offset():
+    import random
+    import statistics
+    rnd = random.Random(3)
+    # 1e8 근처에서 0 근처로 바뀌는 스트림: 분산 갱신식이 오차를 쌓으면 뒤쪽 윈도우 분산이 수 % 어긋난다
+    data = [1e8 + rnd.random() for _ in range(20000)] + [rnd.random() for _ in range(20000)]
+    for i, stats in enumerate(rolling_stats(data, (10, 500))):
+        if i % 251 and i != len(data) - 1:
+            continue
+        for w, st in stats.items():
+            win = data[i + 1 - w:i + 1]
+            true_var = statistics.pvariance(win)
+            assert abs(st.var - true_var) <= 1e-9 * true_var, (i, w)
+            assert abs(st.mean - statistics.fmean(win)) <= 1e-12 * abs(st.mean)
+
+
 def test_normalize_whitespace():
     assert normalize_whitespace("  a   b    c ") == "a b c"
 
@@ -176,6 +518,22 @@ def test_is_palindrome():
     assert not is_palindrome("hello")
 
 
+def test_text_batch_matches_scalar():
+    import pytest
+    texts = ["  a   b    c ", "\tx\u3000y\n", "", "Never odd or even", "İstanbul", "A\u212a, ka", "abcd@example.com",
+             "a@b", "ab@x.org", "@x.org", "a@b@c", "no-at-sign", "x" * 100, "가나다 다나가"]
+    assert normalize_whitespace_batch(texts) == [normalize_whitespace(t) for t in texts]
+    assert is_palindrome_batch(texts + [None]) == [is_palindrome(t) for t in texts + [None]]
+    assert summarize_batch(texts, max_len=10) == [summarize(t, max_len=10) for t in texts]
+    assert mask_email_batch(iter(texts)) == [mask_email(t) for t in texts]
+    with pytest.raises(ValueError):
+        normalize_whitespace_batch(["a", None])
+    with pytest.raises(TypeError):
+        mask_email_batch(["a@b", None])
+    with pytest.raises(ValueError):
+        summarize_batch(texts, max_len=3)
+
+
 def test_summarize_and_email():
     s = "x" * 100
     assert summarize(s, max_len=10) == "xxxxxxx..."
@@ -183,3 +541,245 @@ def test_summarize_and_email():
     masked = mask_email("abcd@example.com")
     assert masked.startswith("a")
     assert "@example.com" in masked
+
+
+_JUNIT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="a" tests="3" failures="1" errors="0" skipped="1" time="0.5">
+<testcase classname="m.A" name="t1" time="0.25"/>
+<testcase classname="m.A" name="t2" time="0.125"><failure message="x">boom</failure></testcase>
+<testcase classname="m.A" name="t3" time="0"><skipped/></testcase>
+</testsuite><testsuite name="b" tests="1" failures="0" errors="1" skipped="0" time="1.5">
+<testcase classname="m.B" name="t4" time="1.5"><error>e</error><system-out>out</system-out></testcase>
+</testsuite></testsuites>"""
+
+
+def _cobertura(files: dict) -> str:
+    """{filename: {line: hits}} -> 최소한의 Cobertura XML."""
+    classes = "".join(
+        f'<class name="{fn}" filename="{fn}" line-rate="0"><methods/><lines>'
+        + "".join(f'<line number="{n}" hits="{h}"/>' for n, h in lines.items())
+        + "</lines></class>"
+        for fn, lines in files.items())
+    return f'<?xml version="1.0" ?><coverage line-rate="0"><packages><package name="."><classes>{classes}' \
+           '</classes></package></packages></coverage>'
+
+
+def test_quality_stream_matches_default(tmp_path):
+    from quality_to_csv import main
+    (tmp_path / "pytest.xml").write_text(_JUNIT_XML, encoding="utf-8")
+    (tmp_path / "coverage.xml").write_text(_cobertura({"a.py": {1: 1, 2: 0, 3: 0, 5: 2}, "b.py": {1: 1}}),
+                                           encoding="utf-8")
+    (tmp_path / "ruff.json").write_text(
+        '[{"code": "F401", "filename": "a.py", "location": {"row": 1, "column": 8}, "message": "unused"},'
+        ' {"code": "E501", "filename": "b.py", "location": {"row": 3, "column": 1}, "message": "long"}]',
+        encoding="utf-8")
+    inputs = ["--junit", str(tmp_path / "pytest.xml"), "--coverage", str(tmp_path / "coverage.xml"),
+              "--ruff", str(tmp_path / "ruff.json"), "--no-cache", "--jobs", "1"]
+    main(inputs + ["--outdir", str(tmp_path / "default")])
+    main(inputs + ["--outdir", str(tmp_path / "stream"), "--stream"])
+    names = sorted(p.name for p in (tmp_path / "default").glob("*.csv"))
+    assert names == sorted(p.name for p in (tmp_path / "stream").glob("*.csv"))
+    assert "coverage_lines.csv" in names
+    assert (tmp_path / "default" / "tests.csv").read_text(encoding="utf-8").count("\n") == 5
+    for name in names:
+        assert (tmp_path / "stream" / name).read_bytes() == (tmp_path / "default" / name).read_bytes(), name
+
+
+def test_merge_coverage_shards(tmp_path):
+    from quality_to_csv import _intersect_runs, merge_coverage, read_coverage, stream_coverage
+    assert _intersect_runs([[1, 5], [8, 10]], [[3, 9], [10, 12]]) == [[3, 5], [8, 9], [10, 10]]
+    shard1 = tmp_path / "cov1.xml"
+    shard2 = tmp_path / "cov2.xml"
+    # a.py: 샤드1은 3-4행, 샤드2는 2·4행을 못 돌았다 -> 합치면 4행만 미커버
+    shard1.write_text(_cobertura({"a.py": {1: 1, 2: 1, 3: 0, 4: 0}, "b.py": {1: 0, 2: 0, 3: 0, 4: 1}}),
+                      encoding="utf-8")
+    shard2.write_text(_cobertura({"a.py": {1: 1, 2: 0, 3: 1, 4: 0}}), encoding="utf-8")
+    for reader in (read_coverage, stream_coverage):
+        merged = merge_coverage([reader(shard1), reader(shard2)])
+        rates = {f["filename"]: round(f["line_rate"] * 100, 2) for f in merged["files"]}
+        assert rates == {"a.py": 75.0, "b.py": 25.0}
+        assert [(r["filename"], r["start"], r["end"]) for r in merged["uncovered"]] == [("a.py", 4, 4), ("b.py", 1, 3)]
+        assert merged["line_rate"] == 0.5
+
+
+def test_ruff_json_forms(tmp_path):
+    import io
+    import json
+    from pathlib import Path
+    from quality_to_csv import _iter_json_values, iter_ruff
+    diags = [{"code": f"E{i}", "filename": "a.py", "location": {"row": i, "column": 1}, "message": "m" * i}
+             for i in range(1, 40)]
+    texts = {
+        "array": json.dumps(diags, indent=2),
+        "object": json.dumps({"diagnostics": diags}),
+        "object_late_key": json.dumps({"version": "0.1", "diagnostics": diags}),
+        "json_lines": "\n".join(json.dumps(d) for d in diags) + "\n",
+    }
+    expected = [("a.py", i, 1, f"E{i}") for i in range(1, 40)]
+    for form, text in texts.items():
+        # 청크를 값보다 작게 잘라 값이 여러 번 잘리는 경우도 본다
+        values = list(_iter_json_values(io.StringIO(text), chunk_size=7))
+        items = [it for v in values for it in v.get("diagnostics", [v])]
+        assert items == diags, form
+        p = tmp_path / f"{form}.json"
+        p.write_text(text, encoding="utf-8")
+        assert [(r["filename"], r["line"], r["col"], r["code"]) for r in iter_ruff(Path(p))] == expected, form
+    # 진단이 아닌 최상위 객체는 0건
+    for text in ("{}", '{"version": "0.1"}', '{"diagnostics": []}', "[]"):
+        p = tmp_path / "empty.json"
+        p.write_text(text, encoding="utf-8")
+        assert list(iter_ruff(Path(p))) == [], text
+
+
+def test_diff_coverage_groups_classes_by_file(tmp_path):
+    from quality_diff import Baseline, RunDiff
+    tables = {
+        "summary": "metric,value\ncoverage_percent,70\n",
+        "tests": "classname,name,status,time_sec\n",
+        "lint": "filename,line,col,code,message\n",
+        # a.py에 클래스가 둘(행 두 개)
+        "coverage_files": "filename,coverage_percent\na.py,50.0\na.py,100.0\nb.py,80.0\nd.py,10.0\n",
+    }
+    for name, text in tables.items():
+        (tmp_path / f"{name}.csv").write_text(text, encoding="utf-8")
+    diff = RunDiff(Baseline(str(tmp_path)))
+    for fn, rate in [("a.py", 0.5), ("b.py", 0.9), ("a.py", 1.0), ("c.py", 0.25)]:
+        diff.add_file({"filename": fn, "line_rate": rate})
+    coverage = {name: rows for name, _, rows in diff.tables({"coverage_percent": 71.0})}["diff_coverage"]
+    assert coverage == [["b.py", 80.0, 90.0, 10.0], ["c.py", None, 25.0, None], ["d.py", 10.0, None, None]]
+
+
+def test_xlsx_formulas_cached_values(tmp_path):
+    import pytest
+    pytest.importorskip("numpy")
+    op = pytest.importorskip("openpyxl")
+    from xlsx_formulas import fill_cached_values
+    wb = op.Workbook()
+    ws = wb.active
+    ws.append(["이름", "국어", "영어", "수학", "평균", "결과", "인사", "누계"])
+    for r, row in enumerate([["홍길동", 50, 80, 60], ["강감찬", 80, 70, 60], ["김철수", 40, 50, 70]], start=2):
+        ws.append(row + [f"=AVERAGE(B{r}:D{r})", f'=IF(E{r}>=70,"합격","불합격")', f'=A{r}&"님 "&E{r}'])
+    # 누계: H3:H4는 같은 모양이면서 자기 그룹(H3)을 참조한다
+    ws["H2"] = "=E2"
+    ws["H3"] = "=H2+E3"
+    ws["H4"] = "=H3+E4"
+    # 시트 순서상 먼저 나오지만 뒤의 그룹(평균, 누계)을 모두 기다려야 하는 수식
+    ws["J1"] = "=SUM(H2:H4)+MAX(E2:E4)"
+    ws["I1"] = "=E2/0"
+    ws["I2"] = "=I1+1"
+    ws["I3"] = "=SUM(I1,1)"
+    ws["I4"] = "=AVERAGE(K2:K4)"
+    ws["K5"] = "=VLOOKUP(1,A1:B2,2,FALSE)"
+    ws["L5"] = "=K5+1"
+    src = tmp_path / "src.xlsx"
+    wb.save(src)
+
+    stats = fill_cached_values(str(src), str(tmp_path / "out.xlsx"))
+    assert stats == {"evaluated": 17, "unsupported": 1, "skipped": 1}
+    got = op.load_workbook(tmp_path / "out.xlsx", data_only=True).active
+    e = [190 / 3, 70, 160 / 3]
+    assert [got[f"E{r}"].value for r in (2, 3, 4)] == pytest.approx(e)
+    assert [got[f"F{r}"].value for r in (2, 3, 4)] == ["불합격", "합격", "불합격"]
+    assert [got[f"G{r}"].value for r in (2, 3, 4)] == ["홍길동님 63.3333333333333", "강감찬님 70",
+                                                      "김철수님 53.3333333333333"]
+    h = [e[0], e[0] + e[1], sum(e)]
+    assert [got[f"H{r}"].value for r in (2, 3, 4)] == pytest.approx(h)
+    assert got["J1"].value == pytest.approx(sum(h) + 70)
+    assert [got[f"I{r}"].value for r in (1, 2, 3, 4)] == ["#DIV/0!"] * 4
+    assert got["K5"].value is None and got["L5"].value is None
+    # 수식은 그대로 남는다
+    assert op.load_workbook(tmp_path / "out.xlsx").active["H3"].value == "=H2+E3"
+
+
+def _quality_inputs(tmp_path, n_lint: int) -> list:
+    """quality_to_csv 입력 세 개를 만들고 --junit/--coverage/--ruff 인자를 돌려준다(린트 건수로 입력을 구분)."""
+    import json
+    (tmp_path / "pytest.xml").write_text(_JUNIT_XML, encoding="utf-8")
+    (tmp_path / "coverage.xml").write_text(_cobertura({"a.py": {1: 1, 2: 0}}), encoding="utf-8")
+    (tmp_path / "ruff.json").write_text(json.dumps(
+        [{"code": "E501", "filename": "a.py", "location": {"row": i, "column": 1}, "message": "long"}
+         for i in range(1, n_lint + 1)]), encoding="utf-8")
+    return ["--junit", str(tmp_path / "pytest.xml"), "--coverage", str(tmp_path / "coverage.xml"),
+            "--ruff", str(tmp_path / "ruff.json"), "--cache-dir", str(tmp_path / "cache"), "--jobs", "1"]
+
+
+def test_quality_cache_skips_unchanged_groups(tmp_path):
+    from quality_to_csv import main
+    out = tmp_path / "out"
+    args = _quality_inputs(tmp_path, 3) + ["--outdir", str(out)]
+    main(args)
+    lint = out / "lint.csv"
+    lint.write_text(lint.read_text(encoding="utf-8") + "marker\n", encoding="utf-8")
+    main(args)  # 입력이 그대로면 lint.csv를 다시 쓰지 않는다
+    assert lint.read_text(encoding="utf-8").endswith("marker\n")
+    args = _quality_inputs(tmp_path, 5) + ["--outdir", str(out)]
+    main(args)
+    assert lint.read_text(encoding="utf-8").count("\n") == 6
+
+
+def test_quality_cache_manifest_per_format(tmp_path):
+    import pytest
+    pq = pytest.importorskip("pyarrow.parquet")
+    from quality_to_csv import main
+    out = ["--outdir", str(tmp_path / "out")]
+    main(_quality_inputs(tmp_path, 3) + out + ["--format", "parquet"])
+    main(_quality_inputs(tmp_path, 5) + out + ["--format", "csv"])
+    main(_quality_inputs(tmp_path, 5) + out + ["--format", "parquet"])  # csv 실행이 parquet 기록을 덮으면 안 된다
+    assert pq.read_table(tmp_path / "out" / "lint.parquet").num_rows == 5
+
+
+def test_report_stamp_covers_imported_modules(monkeypatch, tmp_path):
+    import pytest
+    pytest.importorskip("pandas")
+    import quality_report
+    (tmp_path / "summary.csv").write_text("metric,value\n", encoding="utf-8")
+    paths = {"summary": str(tmp_path / "summary.csv")}
+    monkeypatch.setattr(quality_report, "_tool_hash", None)
+    before = quality_report._inputs_digest(paths)
+    real = quality_report.file_digest
+    for name in ("quality_report.py",) + tuple(f"{m}.py" for m in quality_report.TOOL_MODULES):
+        # 모듈 하나의 내용이 바뀐 것처럼 만들면 스탬프도 바뀌어야 한다
+        monkeypatch.setattr(quality_report, "_tool_hash", None)
+        monkeypatch.setattr(quality_report, "file_digest", lambda p, name=name: "x" if p.name == name else real(p))
+        assert quality_report._inputs_digest(paths) != before, name
+
+
+def test_report_column_widths_by_chunk():
+    import pytest
+    pd = pytest.importorskip("pandas")
+    from quality_report import _column_widths
+    df = pd.DataFrame({"filename": ["a.py", "src/long_name.py", None], "n": [1, 22, 333], "msg": ["x" * 100, "", "y"]})
+    assert _column_widths(df) == [18, 5, 60]
+    assert _column_widths(df, chunk_rows=1) == _column_widths(df)
+    assert _column_widths(df.iloc[:0]) == [10, 3, 5]
+
+
+def test_report_missing_history_db(tmp_path):
+    import pytest
+    pytest.importorskip("pandas")
+    from quality_report import main
+    missing = tmp_path / "missing.db"
+    with pytest.raises(FileNotFoundError, match="필수 입력 파일이 없습니다"):
+        main(["--input-dir", str(tmp_path), "--output-dir", str(tmp_path / "out"), "--history", str(missing)])
+    assert not missing.exists()
+
+
+def test_report_client_unreachable_server():
+    import socket
+    from quality_report_server import render
+    with socket.socket() as s:  # 비어 있는 포트를 하나 얻고 닫는다
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    result = render(["--help"], f"http://127.0.0.1:{port}", timeout=5)
+    assert result["ok"] is False and "연결할 수 없습니다" in result["error"]
+
+
+def test_grade_sheet_column_index():
+    import pytest
+    pytest.importorskip("openpyxl")
+    from grade_sheet import _column_index
+    header = ["이름", "국어", "평균"]
+    assert [_column_index(s, header) for s in ("E", "e", "5", "평균")] == [4, 4, 4, 2]
+    for bad in ("0", "00", "없는열"):
+        with pytest.raises(ValueError):
+            _column_index(bad, header)
@@ -0,0 +1,86 @@
+# quality_aggregate.py
+"""
+단일 패스 집계: testcase / 파일별 커버리지 / 린트 진단을 한 번씩만 보면서
+규칙별·파일별 린트 건수, 상태별 건수, 가장 느린 N개 테스트, 커버리지 상·하위 N개 파일을 구한다.
+상위 N개는 전체 정렬 대신 크기 N의 힙으로 유지한다.
+
+결과는 aggregates.csv(section, rank, key, value)의 행으로 내보내며 quality_report가 그대로 읽는다.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from itertools import count
+
+COLUMNS = ["section", "rank", "key", "value"]
+
+# section 이름
+RULE_COUNT = "rule_count"
+FILE_LINT_COUNT = "file_lint_count"
+STATUS_COUNT = "status_count"
+SLOWEST_TEST = "slowest_test"
+COVERAGE_TOP = "coverage_top"
+COVERAGE_BOTTOM = "coverage_bottom"
+
+
+class TopN:
+    """값이 큰(largest=False면 작은) 항목 n개를 힙으로 유지한다. 값이 같으면 먼저 들어온 항목이 앞선다."""
+
+    def __init__(self, n: int, largest: bool = True):
+        self.n = n
+        self.sign = 1 if largest else -1
+        self._heap: list = []
+        self._seq = count()
+
+    def push(self, value: float, item) -> None:
+        entry = (self.sign * value, -next(self._seq), item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> list:
+        """(value, item) 목록, 순위 순."""
+        return [(self.sign * v, item) for v, _, item in sorted(self._heap, reverse=True)]
+
+
+class Aggregates:
+    def __init__(self, top_n: int = 5, slowest_n: int = 20, files_n: int = 20):
+        self.rule_counts: Counter = Counter()
+        self.file_lint_counts: Counter = Counter()
+        self.status_counts: Counter = Counter()
+        self.lint_total = 0
+        self.top_n = top_n
+        self.files_n = files_n
+        self.slowest = TopN(slowest_n)
+        self.cov_top = TopN(top_n)
+        self.cov_bottom = TopN(top_n, largest=False)
+
+    def add_case(self, case: dict) -> None:
+        self.status_counts[case["status"]] += 1
+        self.slowest.push(case["time"], f'{case["classname"]}::{case["name"]}')
+
+    def add_file(self, fobj: dict) -> None:
+        pct = round(fobj["line_rate"] * 100, 2)
+        self.cov_top.push(pct, fobj["filename"])
+        self.cov_bottom.push(pct, fobj["filename"])
+
+    def add_lint(self, it: dict) -> None:
+        self.lint_total += 1
+        self.rule_counts[it["code"]] += 1
+        self.file_lint_counts[it["filename"]] += 1
+
+    def rows(self):
+        """aggregates 표의 행 [section, rank, key, value]."""
+        for i, (rule, n) in enumerate(self.rule_counts.most_common(), 1):
+            yield [RULE_COUNT, i, rule, n]
+        for i, (fn, n) in enumerate(self.file_lint_counts.most_common(self.files_n), 1):
+            yield [FILE_LINT_COUNT, i, fn, n]
+        for i, (status, n) in enumerate(self.status_counts.most_common(), 1):
+            yield [STATUS_COUNT, i, status, n]
+        for i, (t, name) in enumerate(self.slowest.items(), 1):
+            yield [SLOWEST_TEST, i, name, round(t, 4)]
+        for i, (pct, fn) in enumerate(self.cov_top.items(), 1):
+            yield [COVERAGE_TOP, i, fn, pct]
+        for i, (pct, fn) in enumerate(self.cov_bottom.items(), 1):
+            yield [COVERAGE_BOTTOM, i, fn, pct]
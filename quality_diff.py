@@ -0,0 +1,178 @@
+# quality_diff.py
+"""
+실행 간 비교 (기준 실행 대비 변경분)
+
+이전 실행의 quality_to_csv 산출물 폴더(CSV 또는 Parquet)를 기준으로 읽어 해시 색인(dict)을 만들고,
+현재 실행의 행을 한 번씩만 보면서 바뀐 것만 남긴다.
+- 테스트: (classname, name) 기준. 새 실패, 고쳐진 실패, 추가/삭제, 그 밖의 상태 변경
+- 린트: (filename, code, message) 기준. 줄 번호는 코드가 움직이면 바뀌므로 키에 넣지 않고, 같은 키가
+  여러 번 나오면 개수 차이만큼만 새 이슈/해결된 이슈로 본다
+- 커버리지: 파일별 커버리지(%) 변화와 추가/삭제된 파일. coverage_files는 클래스마다 한 행이라 같은 파일이
+  여러 번 나올 수 있으므로, 양쪽 모두 파일 이름으로 묶어 클래스 행의 평균으로 비교한다
+- 요약: summary 지표별 기준값, 현재값, 증감
+
+결과 표(diff_*)의 크기는 코드베이스가 아니라 변경분에 비례한다. 기준 색인만 메모리에 둔다.
+"""
+from __future__ import annotations
+
+import csv
+import os
+
+DIFF_COLUMNS = {
+    "diff_summary": ["metric", "base", "current", "delta"],
+    "diff_tests": ["change", "classname", "name", "base_status", "status", "time_sec"],
+    "diff_lint": ["change", "filename", "line", "col", "code", "message"],
+    "diff_coverage": ["filename", "base_percent", "coverage_percent", "delta"],
+}
+
+# 실패로 보는 status (quality_to_csv는 failure/error, 이전 산출물은 failed를 쓰기도 했다)
+FAILED = ("failure", "error", "failed")
+
+_SEEN = object()
+
+
+def table_path(dirpath: str, name: str, fmt: str = "auto") -> str:
+    """표 하나의 파일 경로. auto면 CSV보다 오래되지 않은 .parquet이 있을 때 그것을 쓴다."""
+    csv_path = os.path.join(dirpath, f"{name}.csv")
+    pq_path = os.path.join(dirpath, f"{name}.parquet")
+    use_pq = fmt == "parquet" or (
+        fmt == "auto" and os.path.exists(pq_path)
+        and (not os.path.exists(csv_path) or os.path.getmtime(pq_path) >= os.path.getmtime(csv_path))
+    )
+    return pq_path if use_pq else csv_path
+
+
+def iter_table(path: str, batch_rows: int = 65536):
+    """CSV/Parquet 표를 {컬럼: 값} dict로 한 행씩 읽는다. CSV 값은 문자열이다."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"비교할 표가 없습니다: {path}")
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            yield from batch.to_pylist()
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def _num(x):
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
+
+
+def _add_percent(acc: dict, filename: str, pct) -> None:
+    # 파일별 [합계, 행 수]
+    s = acc.setdefault(filename, [0.0, 0])
+    if pct is not None:
+        s[0] += pct
+        s[1] += 1
+
+
+def _file_percent(s: list):
+    return round(s[0] / s[1], 2) if s[1] else None
+
+
+class Baseline:
+    """기준 실행의 색인. 매칭된 항목은 RunDiff가 지우거나 표시하므로 한 번만 쓴다."""
+
+    def __init__(self, dirpath: str, fmt: str = "auto"):
+        self.dirpath = dirpath
+        self.summary = {r["metric"]: _num(r["value"]) for r in iter_table(table_path(dirpath, "summary", fmt))}
+        self.tests = {(r["classname"], r["name"]): r["status"]
+                      for r in iter_table(table_path(dirpath, "tests", fmt))}
+        files: dict = {}
+        for r in iter_table(table_path(dirpath, "coverage_files", fmt)):
+            _add_percent(files, r["filename"], _num(r["coverage_percent"]))
+        self.coverage = {fn: _file_percent(s) for fn, s in files.items()}
+        self.lint: dict = {}
+        for r in iter_table(table_path(dirpath, "lint", fmt)):
+            self.lint.setdefault((r["filename"], r["code"], r["message"]), []).append((int(r["line"]), int(r["col"])))
+
+
+def _test_change(prev, status):
+    if status in FAILED and prev not in FAILED:
+        return "new_failure"
+    if prev in FAILED and status not in FAILED:
+        return "fixed"
+    if prev is None:
+        return "added"
+    return "changed" if prev != status else None
+
+
+class RunDiff:
+    """iter_tables의 관찰자(observer). 현재 실행의 행을 기준 색인과 맞춰 보고 바뀐 행만 모은다.
+    tables()는 남은 기준 항목(삭제된 테스트, 해결된 린트, 사라진 파일)까지 더해 diff_* 표를 만든다."""
+
+    def __init__(self, baseline: Baseline):
+        self.base = baseline
+        self.tests: list = []
+        self.lint: list = []
+        self._files: dict = {}  # 파일별 [합계, 행 수], 비교는 tables()에서
+
+    def add_case(self, case: dict) -> None:
+        key = (case["classname"], case["name"])
+        prev = self.base.tests.get(key)
+        if prev is _SEEN:  # 같은 테스트가 두 번 나오면 첫 번째만 비교
+            return
+        if prev is not None:
+            self.base.tests[key] = _SEEN
+        change = _test_change(prev, case["status"])
+        if change:
+            self.tests.append([change, case["classname"], case["name"], prev, case["status"], round(case["time"], 4)])
+
+    def add_file(self, fobj: dict) -> None:
+        _add_percent(self._files, fobj["filename"], round(fobj["line_rate"] * 100, 2))
+
+    def add_lint(self, it: dict) -> None:
+        key = (it["filename"], it["code"], it["message"])
+        lines = self.base.lint.get(key)
+        if lines:
+            lines.pop()
+        else:
+            self.lint.append(["new", it["filename"], it["line"], it["col"], it["code"], it["message"]])
+
+    def tables(self, metrics: dict):
+        """(이름, 컬럼, 행) 순서로 diff_* 표를 만든다. metrics는 현재 실행의 summary 지표."""
+        summary = []
+        for m, v in metrics.items():
+            b = self.base.summary.get(m)
+            cur = _num(v)
+            summary.append([m, b, v, None if b is None or cur is None else round(cur - b, 4)])
+        yield "diff_summary", DIFF_COLUMNS["diff_summary"], summary
+
+        removed = ([["removed", cn, n, st, None, None]
+                    for (cn, n), st in self.base.tests.items() if st is not _SEEN])
+        yield "diff_tests", DIFF_COLUMNS["diff_tests"], self.tests + removed
+
+        resolved = [["resolved", fn, line, col, code, msg]
+                    for (fn, code, msg), lines in self.base.lint.items() for line, col in lines]
+        yield "diff_lint", DIFF_COLUMNS["diff_lint"], self.lint + resolved
+
+        coverage = []
+        for fn, s in self._files.items():
+            pct = _file_percent(s)
+            if fn not in self.base.coverage:
+                coverage.append([fn, None, pct, None])
+                continue
+            prev = self.base.coverage.pop(fn)
+            if prev != pct:
+                coverage.append([fn, prev, pct, None if prev is None or pct is None else round(pct - prev, 2)])
+        gone = [[fn, pct, None, None] for fn, pct in self.base.coverage.items()]
+        yield "diff_coverage", DIFF_COLUMNS["diff_coverage"], coverage + gone
+
+
+def diff_outputs(paths: dict, baseline_dir: str, fmt: str = "auto"):
+    """이미 쓰인 두 산출물(현재: 표별 경로 dict, 기준: 폴더)을 비교해 RunDiff.tables()와 같은 표를 만든다."""
+    diff = RunDiff(Baseline(baseline_dir, fmt))
+    for r in iter_table(paths["tests"]):
+        diff.add_case({"classname": r["classname"], "name": r["name"], "status": r["status"],
+                       "time": _num(r["time_sec"]) or 0.0})
+    for r in iter_table(paths["coverage_files"]):
+        diff.add_file({"filename": r["filename"], "line_rate": (_num(r["coverage_percent"]) or 0.0) / 100})
+    for r in iter_table(paths["lint"]):
+        diff.add_lint({"filename": r["filename"], "line": int(r["line"]), "col": int(r["col"]),
+                       "code": r["code"], "message": r["message"]})
+    metrics = {r["metric"]: _num(r["value"]) for r in iter_table(paths["summary"])}
+    return diff.tables(metrics)
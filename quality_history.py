@@ -0,0 +1,164 @@
+# quality_history.py
+"""
+실행 이력 저장소 (SQLite)
+
+quality_to_csv --history DB 로 실행마다 요약 지표, 테스트별 소요 시간/상태, 파일별 커버리지를 쌓고,
+quality_report --history DB 로 최근 N회 커버리지 추이, 플래키 테스트, 린트 증감을 조회한다.
+테스트 이름과 파일 이름은 별도 표로 정규화하고, 결과 표는 (run_id, id) 기본키로 묶어
+실행 수가 수만 건이 되어도 최근 N회 조회가 인덱스 범위 검색으로 끝나게 한다.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_key TEXT NOT NULL UNIQUE,
+    commit_sha TEXT,
+    created_at TEXT NOT NULL,
+    tests_total INTEGER, tests_failed INTEGER, tests_skipped INTEGER, tests_time_sec REAL,
+    coverage_percent REAL, lint_issues INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS runs_created ON runs(created_at);
+CREATE TABLE IF NOT EXISTS tests (
+    test_id INTEGER PRIMARY KEY, classname TEXT NOT NULL, name TEXT NOT NULL, UNIQUE(classname, name)
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL, test_id INTEGER NOT NULL, status TEXT NOT NULL, time_sec REAL,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS test_results_test ON test_results(test_id, run_id);
+CREATE TABLE IF NOT EXISTS files (file_id INTEGER PRIMARY KEY, filename TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS file_coverage (
+    run_id INTEGER NOT NULL, file_id INTEGER NOT NULL, coverage_percent REAL,
+    PRIMARY KEY (run_id, file_id)
+) WITHOUT ROWID;
+"""
+
+FAILED = ("failure", "error")
+
+
+def connect(path: str) -> sqlite3.Connection:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def default_run_key() -> str:
+    # CI 환경변수가 있으면 사용(GitHub Actions), 없으면 현재 시각
+    run = os.environ.get("GITHUB_RUN_ID")
+    if run:
+        return f"{run}.{os.environ.get('GITHUB_RUN_ATTEMPT', '1')}"
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+
+
+class HistoryRecorder:
+    """iter_tables의 관찰자(observer). 행이 지나갈 때 테스트/파일 결과를 모아 배치로 넣고,
+    finish()에서 실행 요약을 기록한다. 같은 run_key로 다시 기록하면 이전 기록을 대체한다."""
+
+    def __init__(self, path: str, run_key: str | None = None, commit: str | None = None, batch: int = 10000):
+        self.conn = connect(path)
+        self.run_key = run_key or default_run_key()
+        self.commit = commit if commit is not None else os.environ.get("GITHUB_SHA")
+        self.batch = batch
+        self._tests: list = []
+        self._files: list = []
+        cur = self.conn.execute("SELECT run_id FROM runs WHERE run_key = ?", (self.run_key,))
+        row = cur.fetchone()
+        if row:
+            self.conn.execute("DELETE FROM test_results WHERE run_id = ?", row)
+            self.conn.execute("DELETE FROM file_coverage WHERE run_id = ?", row)
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", row)
+        self.run_id = self.conn.execute(
+            "INSERT INTO runs (run_key, commit_sha, created_at) VALUES (?, ?, ?)",
+            (self.run_key, self.commit, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+        ).lastrowid
+
+    def add_case(self, case: dict) -> None:
+        self._tests.append((case["classname"], case["name"], case["status"], case["time"]))
+        if len(self._tests) >= self.batch:
+            self._flush_tests()
+
+    def add_file(self, fobj: dict) -> None:
+        self._files.append((fobj["filename"], round(fobj["line_rate"] * 100, 2)))
+        if len(self._files) >= self.batch:
+            self._flush_files()
+
+    def add_lint(self, it: dict) -> None:
+        pass
+
+    def _flush_tests(self) -> None:
+        c = self.conn
+        c.executemany("INSERT OR IGNORE INTO tests (classname, name) VALUES (?, ?)", [t[:2] for t in self._tests])
+        c.executemany(
+            "INSERT OR REPLACE INTO test_results (run_id, test_id, status, time_sec) "
+            "SELECT ?, test_id, ?, ? FROM tests WHERE classname = ? AND name = ?",
+            [(self.run_id, st, t, cn, n) for cn, n, st, t in self._tests],
+        )
+        self._tests.clear()
+
+    def _flush_files(self) -> None:
+        c = self.conn
+        c.executemany("INSERT OR IGNORE INTO files (filename) VALUES (?)", [(f,) for f, _ in self._files])
+        c.executemany(
+            "INSERT OR REPLACE INTO file_coverage (run_id, file_id, coverage_percent) "
+            "SELECT ?, file_id, ? FROM files WHERE filename = ?",
+            [(self.run_id, pct, f) for f, pct in self._files],
+        )
+        self._files.clear()
+
+    def finish(self, metrics: dict) -> None:
+        """metrics: tests_total, tests_failed, tests_skipped, tests_time_sec, coverage_percent, lint_issues"""
+        self._flush_tests()
+        self._flush_files()
+        self.conn.execute(
+            "UPDATE runs SET tests_total = ?, tests_failed = ?, tests_skipped = ?, tests_time_sec = ?, "
+            "coverage_percent = ?, lint_issues = ? WHERE run_id = ?",
+            (metrics["tests_total"], metrics["tests_failed"], metrics["tests_skipped"], metrics["tests_time_sec"],
+             metrics["coverage_percent"], metrics["lint_issues"], self.run_id),
+        )
+        self.conn.commit()
+        self.conn.close()
+
+
+# =========================
+# 조회
+# =========================
+def run_trend(conn: sqlite3.Connection, last_n: int = 20) -> list:
+    """최근 N회 실행 (오래된 순): run_key, commit, created_at, tests_total, tests_failed, coverage_percent,
+    lint_issues, lint_delta"""
+    rows = conn.execute(
+        "SELECT run_key, commit_sha, created_at, tests_total, tests_failed, coverage_percent, lint_issues "
+        "FROM runs ORDER BY run_id DESC LIMIT ?", (last_n + 1,),
+    ).fetchall()[::-1]
+    out = []
+    for i, r in enumerate(rows):
+        prev = rows[i - 1][6] if i else None
+        out.append(r + ((r[6] - prev) if prev is not None and r[6] is not None else None,))
+    return out[-last_n:] if last_n else out
+
+
+def flaky_tests(conn: sqlite3.Connection, last_n: int = 20, limit: int = 20) -> list:
+    """최근 N회 안에서 통과와 실패가 모두 있었던 테스트: classname, name, fails, passes, runs"""
+    return conn.execute(
+        """
+        WITH recent AS (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)
+        SELECT t.classname, t.name,
+               SUM(r.status IN (?, ?)) AS fails, SUM(r.status = 'ok') AS passes, COUNT(*) AS runs
+        FROM test_results r JOIN recent USING (run_id) JOIN tests t USING (test_id)
+        GROUP BY r.test_id
+        HAVING fails > 0 AND passes > 0
+        ORDER BY fails * 1.0 / runs DESC, fails DESC
+        LIMIT ?
+        """,
+        (last_n, *FAILED, limit),
+    ).fetchall()
+
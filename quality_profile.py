@@ -0,0 +1,108 @@
+# quality_profile.py
+"""
+quality_to_csv / quality_report 공용 단계별 계측 (--profile 또는 환경변수 QUALITY_PROFILE)
+
+단계마다 벽시계 시간, CPU 시간, 최대 RSS, 처리 행 수를 기록해 JSON 트레이스로 남긴다. ru_maxrss는 프로세스 전체의
+최고치라서 단계별 사용량이 아니므로, 그 단계까지의 최고치(peak_rss_so_far_mb)와 그 단계에서 최고치가 늘어난 양
+(peak_rss_growth_mb, 앞 단계보다 덜 쓰면 0)을 따로 남긴다.
+cProfile 경로를 주면 모든 단계를 cProfile로 감싸고 가장 느린 단계의 통계만 .prof로 저장한다
+(이 경우 시간 값에 cProfile 오버헤드가 포함된다).
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV_TRACE = "QUALITY_PROFILE"
+ENV_CPROFILE = "QUALITY_PROFILE_CPROFILE"
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def add_profile_args(ap) -> None:
+    ap.add_argument("--profile", metavar="TRACE_JSON", default=os.environ.get(ENV_TRACE),
+                    help=f"단계별 계측 결과를 JSON으로 저장 (환경변수 {ENV_TRACE})")
+    ap.add_argument("--profile-cprofile", metavar="PROF", default=os.environ.get(ENV_CPROFILE),
+                    help=f"가장 느린 단계의 cProfile 통계를 저장 (환경변수 {ENV_CPROFILE})")
+
+
+class Profiler:
+    """with prof.stage("name") as rec: ... 형태로 쓰며, rec["rows"]에 처리 행 수를 넣을 수 있다.
+    비활성 상태에서는 기록하지 않는다."""
+
+    def __init__(self, tool: str, trace_path: str | None = None, cprofile_path: str | None = None):
+        self.tool = tool
+        self.trace_path = trace_path
+        self.cprofile_path = cprofile_path
+        self.enabled = bool(trace_path or cprofile_path)
+        self.stages: list[dict] = []
+        self._profiles: dict = {}
+        self._t0 = time.perf_counter()
+        self._started = datetime.now().isoformat(timespec="seconds")
+
+    @classmethod
+    def from_args(cls, tool: str, args) -> "Profiler":
+        return cls(tool, args.profile, args.profile_cprofile)
+
+    @contextmanager
+    def stage(self, name: str):
+        rec = {"stage": name}
+        if not self.enabled:
+            yield rec
+            return
+        prof = cProfile.Profile() if self.cprofile_path else None
+        t0, c0, rss0 = time.perf_counter(), time.process_time(), peak_rss_mb()
+        if prof:
+            prof.enable()
+        try:
+            yield rec
+        finally:
+            if prof:
+                prof.disable()
+                self._profiles[len(self.stages)] = prof
+            rec["wall_s"] = round(time.perf_counter() - t0, 4)
+            rec["cpu_s"] = round(time.process_time() - c0, 4)
+            rss = peak_rss_mb()
+            rec["peak_rss_so_far_mb"] = rss
+            rec["peak_rss_growth_mb"] = None if rss is None else round(rss - rss0, 1)
+            rec.setdefault("rows", None)
+            self.stages.append(rec)
+
+    def finish(self) -> None:
+        if not self.enabled:
+            return
+        slowest = max(range(len(self.stages)), key=lambda i: self.stages[i]["wall_s"], default=None)
+        if self.cprofile_path and slowest is not None:
+            self._profiles[slowest].dump_stats(self.cprofile_path)
+            print(f"- cProfile ({self.stages[slowest]['stage']}): {self.cprofile_path}")
+        if self.trace_path:
+            trace = {
+                "tool": self.tool,
+                "started_at": self._started,
+                "python": platform.python_version(),
+                "total_wall_s": round(time.perf_counter() - self._t0, 4),
+                "slowest_stage": None if slowest is None else self.stages[slowest]["stage"],
+                "stages": self.stages,
+            }
+            d = os.path.dirname(self.trace_path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            with open(self.trace_path, "w", encoding="utf-8") as f:
+                json.dump(trace, f, indent=2, ensure_ascii=False)
+            print(f"- Profile: {self.trace_path}")
@@ -0,0 +1,236 @@
+# quality_records.py
+"""
+파싱 결과용 열(column) 저장소
+
+testcase / 파일별 커버리지 / 미커버 구간 / 린트 진단을 행마다 dict로 두지 않고, 숫자는 array 열에,
+반복되는 문자열(classname, filename, code, message, status)은 표마다 한 벌씩만 두고 정수 id 열로 가리킨다.
+행 하나에 dict(키 문자열 + 값 객체) 대신 몇 바이트의 숫자만 쓰므로 행 수가 수십만~수백만일 때 메모리와
+캐시(pickle) 크기가 크게 줄어든다.
+
+iter()는 기존과 같은 키의 dict를 한 행씩 만들어 내보내므로 iter_tables, 관찰자, merge_*는 그대로 쓴다
+(행 dict는 소비 후 바로 버려진다). to_frame()은 숫자 열을 복사 없이 numpy로 감싸고 문자열 열은
+pool을 범주(categories)로 하는 Categorical로 만들어 DataFrame을 돌려준다(pandas 필요).
+"""
+from __future__ import annotations
+
+from array import array
+
+STATUSES = ("ok", "failure", "error", "skipped")
+_STATUS_ID = {s: i for i, s in enumerate(STATUSES)}
+
+
+class StringPool:
+    """문자열 -> id. 같은 문자열은 한 번만 저장한다(pickle에는 값 목록만 넣는다)."""
+
+    __slots__ = ("ids", "values")
+
+    def __init__(self, values=()):
+        self.values: list = []
+        self.ids: dict = {}
+        for v in values:
+            self.id(v)
+
+    def id(self, s: str) -> int:
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.values)
+            self.values.append(s)
+        return i
+
+    def remap(self, other: "StringPool") -> list:
+        """other의 id를 이 pool의 id로 바꾸는 표."""
+        return [self.id(v) for v in other.values]
+
+    def __getstate__(self):
+        return self.values
+
+    def __setstate__(self, values):
+        self.values = []
+        self.ids = {}
+        for v in values:
+            self.id(v)
+
+
+def _codes(pool: StringPool, ids: array):
+    import numpy as np
+    import pandas as pd
+    return pd.Categorical.from_codes(np.frombuffer(ids, dtype=np.intc), categories=pool.values)
+
+
+def _view(col: array):
+    import numpy as np
+    return np.frombuffer(col, dtype=np.float64 if col.typecode == "d" else np.dtype(col.typecode))
+
+
+class CaseTable:
+    """testcase 열: classname(pool id), name, status(STATUSES 번호), time"""
+
+    __slots__ = ("classnames", "classname_id", "names", "status_id", "time")
+
+    def __init__(self):
+        self.classnames = StringPool()
+        self.classname_id = array("i")
+        self.names: list = []
+        self.status_id = array("b")
+        self.time = array("d")
+
+    def append(self, classname: str, name: str, status: str, time: float) -> None:
+        self.classname_id.append(self.classnames.id(classname))
+        self.names.append(name)
+        self.status_id.append(_STATUS_ID[status])
+        self.time.append(time)
+
+    def extend(self, other: "CaseTable") -> None:
+        remap = self.classnames.remap(other.classnames)
+        self.classname_id.extend(remap[i] for i in other.classname_id)
+        self.names.extend(other.names)
+        self.status_id.extend(other.status_id)
+        self.time.extend(other.time)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __iter__(self):
+        cls = self.classnames.values
+        for c, n, s, t in zip(self.classname_id, self.names, self.status_id, self.time):
+            yield {"classname": cls[c], "name": n, "time": t, "status": STATUSES[s]}
+
+    def to_frame(self):
+        import pandas as pd
+        status = pd.Categorical.from_codes(_view(self.status_id), categories=list(STATUSES))
+        return pd.DataFrame({"classname": _codes(self.classnames, self.classname_id), "name": self.names,
+                             "status": status, "time": _view(self.time)}, copy=False)
+
+
+class FileTable:
+    """파일별 커버리지 열: filename, line_rate, 라인/분기 카운터"""
+
+    __slots__ = ("filenames", "line_rate", "lines_valid", "lines_covered", "branches_valid", "branches_covered")
+    COUNTERS = ("lines_valid", "lines_covered", "branches_valid", "branches_covered")
+
+    def __init__(self):
+        self.filenames: list = []
+        self.line_rate = array("d")
+        for k in self.COUNTERS:
+            setattr(self, k, array("q"))
+
+    def append(self, fobj: dict) -> None:
+        self.filenames.append(fobj["filename"])
+        self.line_rate.append(fobj["line_rate"])
+        for k in self.COUNTERS:
+            getattr(self, k).append(fobj.get(k, 0))
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __iter__(self):
+        for fn, lr, lv, lc, bv, bc in zip(self.filenames, self.line_rate, self.lines_valid, self.lines_covered,
+                                          self.branches_valid, self.branches_covered):
+            yield {"filename": fn, "line_rate": lr, "lines_valid": lv, "lines_covered": lc,
+                   "branches_valid": bv, "branches_covered": bc}
+
+    def to_frame(self):
+        import pandas as pd
+        cols = {"filename": self.filenames, "line_rate": _view(self.line_rate)}
+        cols.update({k: _view(getattr(self, k)) for k in self.COUNTERS})
+        return pd.DataFrame(cols, copy=False)
+
+
+class RunTable:
+    """미커버 라인 구간 열: filename(pool id), start, end"""
+
+    __slots__ = ("filenames", "file_id", "start", "end")
+
+    def __init__(self):
+        self.filenames = StringPool()
+        self.file_id = array("i")
+        self.start = array("q")
+        self.end = array("q")
+
+    def append(self, filename: str, start: int, end: int) -> None:
+        self.file_id.append(self.filenames.id(filename))
+        self.start.append(start)
+        self.end.append(end)
+
+    def add_line(self, filename: str, n: int) -> None:
+        """미커버 라인 하나. 직전 구간과 같은 파일에서 바로 이어지면 그 구간을 늘린다."""
+        fid = self.filenames.id(filename)
+        if self.file_id and self.file_id[-1] == fid and self.end[-1] == n - 1:
+            self.end[-1] = n
+        else:
+            self.file_id.append(fid)
+            self.start.append(n)
+            self.end.append(n)
+
+    def __len__(self) -> int:
+        return len(self.file_id)
+
+    def __iter__(self):
+        names = self.filenames.values
+        for f, a, b in zip(self.file_id, self.start, self.end):
+            yield {"filename": names[f], "start": a, "end": b}
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({"filename": _codes(self.filenames, self.file_id), "start": _view(self.start),
+                             "end": _view(self.end)}, copy=False)
+
+
+class LintTable:
+    """린트 진단 열: filename/code/message(pool id), line, col"""
+
+    __slots__ = ("filenames", "codes", "messages", "file_id", "line", "col", "code_id", "message_id")
+
+    def __init__(self):
+        self.filenames = StringPool()
+        self.codes = StringPool()
+        self.messages = StringPool()
+        self.file_id = array("i")
+        self.line = array("i")
+        self.col = array("i")
+        self.code_id = array("i")
+        self.message_id = array("i")
+
+    @classmethod
+    def from_records(cls, records) -> "LintTable":
+        t = cls()
+        for it in records:
+            t.append(it)
+        return t
+
+    @classmethod
+    def concat(cls, tables) -> "LintTable":
+        out = cls()
+        for t in tables:
+            out.extend(t)
+        return out
+
+    def append(self, it: dict) -> None:
+        self.file_id.append(self.filenames.id(it["filename"]))
+        self.line.append(it["line"])
+        self.col.append(it["col"])
+        self.code_id.append(self.codes.id(it["code"]))
+        self.message_id.append(self.messages.id(it["message"]))
+
+    def extend(self, other: "LintTable") -> None:
+        for pool, ids, opool, oids in ((self.filenames, self.file_id, other.filenames, other.file_id),
+                                       (self.codes, self.code_id, other.codes, other.code_id),
+                                       (self.messages, self.message_id, other.messages, other.message_id)):
+            remap = pool.remap(opool)
+            ids.extend(remap[i] for i in oids)
+        self.line.extend(other.line)
+        self.col.extend(other.col)
+
+    def __len__(self) -> int:
+        return len(self.line)
+
+    def __iter__(self):
+        fns, codes, msgs = self.filenames.values, self.codes.values, self.messages.values
+        for f, ln, c, k, m in zip(self.file_id, self.line, self.col, self.code_id, self.message_id):
+            yield {"filename": fns[f], "line": ln, "col": c, "code": codes[k], "message": msgs[m]}
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({"filename": _codes(self.filenames, self.file_id), "line": _view(self.line),
+                             "col": _view(self.col), "code": _codes(self.codes, self.code_id),
+                             "message": _codes(self.messages, self.message_id)}, copy=False)
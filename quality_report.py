@@ -1,11 +1,29 @@
+import argparse
+import hashlib
+import multiprocessing
 import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from docx.shared import Pt
+from xml.sax.saxutils import escape
+
+import quality_history
+from quality_diff import DIFF_COLUMNS, diff_outputs, table_path
+from quality_profile import Profiler, add_profile_args
+from quality_timing import COLUMNS as TIMING_COLUMNS
+from quality_to_csv import file_digest
 
 
 # =========================
@@ -23,8 +41,49 @@ CSV_FILES = {
     "coverage_files": "coverage_files.csv",
     "lint": "lint.csv",
     "lint_top5": "lint_top5.csv",
+    "aggregates": "aggregates.csv",
+    "test_durations": "test_durations.csv",
+    "duration_histogram": "duration_histogram.csv",
+    "test_flips": "test_flips.csv",
+}
+# 없어도 되는 입력(이전 버전 산출물 호환, 시간 분석 표는 quality_to_csv --timings일 때만 생긴다)
+OPTIONAL_INPUTS = {"aggregates", *TIMING_COLUMNS}
+
+# tests.csv status 중 실패로 보는 값 (quality_to_csv는 failure/error를 쓴다)
+FAILED_STATUSES = ["failure", "error", "failed"]
+
+# Parquet 입력(quality_to_csv --format parquet)에서 읽을 컬럼
+TABLE_COLUMNS = {
+    "summary": ["metric", "value"],
+    "tests": ["classname", "name", "status", "time_sec"],
+    "coverage_files": ["filename", "coverage_percent"],
+    "lint": ["filename", "line", "col", "code", "message"],
+    "lint_top5": ["rank", "rule", "count"],
+    "aggregates": ["section", "rank", "key", "value"],
+    **TIMING_COLUMNS,
+    **DIFF_COLUMNS,
+}
+
+# 보고서 섹션과 섹션별로 읽어야 하는 표 (--sections)
+SECTIONS = ["summary", "tests", "coverage", "lint", "trends"]
+SECTION_INPUTS = {
+    "summary": ["summary"],
+    "tests": ["tests", "aggregates", *TIMING_COLUMNS],
+    "coverage": ["coverage_files", "aggregates"],
+    "lint": ["lint", "lint_top5", "aggregates"],
+    "trends": [],  # --history DB에서 읽는다
+}
+DIFF_SECTION_INPUTS = {
+    "summary": ["diff_summary"],
+    "tests": ["diff_tests"],
+    "coverage": ["diff_coverage"],
+    "lint": ["diff_lint"],
+    "trends": [],
 }
 
+# 입력 CSV 해시를 기록해 두고, 같으면 보고서를 다시 만들지 않는다
+STAMP_FILE = ".report_inputs"
+
 
 # =========================
 # 유틸
@@ -34,6 +93,67 @@ def _require_file(path: str) -> None:
         raise FileNotFoundError(f"필수 입력 파일이 없습니다: {path}")
 
 
+def _resolve_inputs(input_dir: str, fmt: str = "auto", keys=CSV_FILES) -> dict:
+    """표별 입력 경로. auto면 CSV보다 오래되지 않은 .parquet이 있을 때 그것을 쓴다."""
+    return {k: table_path(input_dir, k, fmt) for k in keys}
+
+
+def _read_table(path: str, key: str) -> pd.DataFrame:
+    # Parquet은 저장된 dtype을 그대로 쓰고 필요한 컬럼만 읽는다
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=TABLE_COLUMNS[key])
+    return pd.read_csv(path)
+
+
+def _agg_section(agg, section: str, key_col: str, value_col: str):
+    """aggregates 표에서 section 하나를 (key_col, value_col) 표로 꺼낸다. aggregates가 없으면 None."""
+    if agg is None:
+        return None
+    part = agg[agg["section"] == section].sort_values("rank")
+    values = part["value"].astype("int64") if section.endswith("_count") else part["value"]
+    return pd.DataFrame({key_col: part["key"].to_numpy(), value_col: values.to_numpy()})
+
+
+def _load_trends(db_path: str, last_n: int) -> dict:
+    """이력 DB에서 최근 N회 실행 추이와 플래키 테스트를 표로 읽는다."""
+    conn = quality_history.connect(db_path)
+    try:
+        runs = pd.DataFrame(
+            quality_history.run_trend(conn, last_n),
+            columns=["run", "commit", "created_at", "tests_total", "tests_failed", "coverage_percent",
+                     "lint_issues", "lint_delta"],
+        )
+        flaky = pd.DataFrame(
+            quality_history.flaky_tests(conn, last_n),
+            columns=["classname", "name", "fails", "passes", "runs"],
+        )
+    finally:
+        conn.close()
+    return {"trend_runs": runs, "flaky_tests": flaky}
+
+
+# 보고서 내용에 영향을 주는 코드: 이 파일과 import하는 모듈(quality_diff/history/timing, 표 형식의 quality_records).
+# 하나라도 바뀌면 입력이 같아도 다시 만든다
+TOOL_MODULES = ("quality_diff", "quality_history", "quality_timing", "quality_records")
+_tool_hash = None
+
+
+def _tool_digest() -> str:
+    global _tool_hash
+    if _tool_hash is None:
+        here = Path(__file__)
+        _tool_hash = ":".join(file_digest(p) for p in [here] + [here.with_name(f"{m}.py") for m in TOOL_MODULES])
+    return _tool_hash
+
+
+def _inputs_digest(paths: dict, options: str = "") -> str:
+    h = hashlib.sha256(f"{_tool_digest()}:{options}".encode())
+    for k in sorted(paths):
+        if os.path.exists(paths[k]):
+            h.update(f"{k}:{file_digest(Path(paths[k]))}".encode())
+    return h.hexdigest()
+
+
 def _safe_float(x, default=0.0) -> float:
     try:
         return float(x)
@@ -41,24 +161,106 @@ def _safe_float(x, default=0.0) -> float:
         return default
 
 
-def _auto_fit_columns(ws) -> None:
-    for col in ws.columns:
-        max_len = 0
-        col_letter = get_column_letter(col[0].column)
-        for cell in col:
-            v = "" if cell.value is None else str(cell.value)
-            if len(v) > max_len:
-                max_len = len(v)
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 60)
-
-
-def _add_table_docx(doc: Document, title: str, df: pd.DataFrame, max_rows: int = 30) -> None:
+def _iter_rows(df: pd.DataFrame, chunk_rows: int = 65536):
+    """df 행을 네이티브 파이썬 값의 튜플로 내보낸다(iterrows 대체).
+    chunk 단위로 열마다 결측을 한 번에 ""로 채우고 tolist()로 한꺼번에 변환한다."""
+    for start in range(0, len(df), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        cols = []
+        for c in part.columns:
+            col = part[c]
+            if col.isna().any():
+                col = col.astype(object).where(col.notna(), "")
+            cols.append(col.tolist())
+        yield from zip(*cols)
+
+
+def _column_widths(df: pd.DataFrame, chunk_rows: int = 65536) -> list:
+    """헤더와 값의 문자열 길이 최댓값 + 2 (최대 60). _iter_rows와 같은 크기의 청크마다 열별 최댓값만 갱신하므로
+    열 전체를 문자열로 복사하지 않는다. 모든 열이 상한(60)에 닿으면 더 보지 않는다."""
+    cap = 60 - 2
+    longest = [len(str(c)) for c in df.columns]
+    for start in range(0, len(df), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        for i, c in enumerate(part.columns):
+            if longest[i] >= cap:
+                continue
+            col = part[c]
+            n = col.astype(str).where(col.notna(), "").str.len().max()
+            longest[i] = max(longest[i], int(n or 0))
+        if all(n >= cap for n in longest):
+            break
+    return [min(n + 2, 60) for n in longest]
+
+
+def _write_sheet(wb: Workbook, title: str, df: pd.DataFrame, placeholder: bool = True) -> None:
+    """write-only 워크북에 시트를 추가하고 df 행을 그대로 흘려 쓴다.
+    write-only 시트는 첫 행을 쓰기 전에 열 너비가 정해져 있어야 하므로 너비를 먼저 계산한다."""
+    ws = wb.create_sheet(title)
+    if df.empty and placeholder:
+        df = pd.DataFrame({"(no data)": []})
+    for i, w in enumerate(_column_widths(df), 1):
+        ws.column_dimensions[get_column_letter(i)].width = w
+    ws.append(list(df.columns))
+    for row in _iter_rows(df):
+        ws.append(row)
+
+
+_xml_bad_chars = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_run_split = re.compile(r"([\t\r\n])")
+
+
+def _run_xml(text: str) -> str:
+    # cell.text와 같은 구조: 탭은 <w:tab/>, 줄바꿈은 <w:br/>
+    parts = []
+    for piece in _run_split.split(_xml_bad_chars.sub("", text)):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+    return f"<w:r>{''.join(parts)}</w:r>"
+
+
+def _append_rows(table, rows, chunk_rows: int = 5000) -> None:
+    """행들의 w:tr XML을 문자열로 만들어 w:tbl에 한 번에 붙인다.
+    add_row().cells는 매번 표 XML을 다시 훑어 행 수에 대해 제곱으로 느려지므로 쓰지 않는다."""
+    tbl = table._tbl
+    tcprs = [
+        f'<w:tcPr><w:tcW w:type="dxa" w:w="{gc.w}"/></w:tcPr>' if gc.w is not None else ""
+        for gc in tbl.tblGrid.gridCol_lst
+    ]
+    buf = []
+
+    def flush():
+        frag = parse_xml(f'<w:tbl {nsdecls("w")}>{"".join(buf)}</w:tbl>')
+        tbl.extend(list(frag))
+        buf.clear()
+
+    for row in rows:
+        cells = "".join(
+            f"<w:tc>{tcpr}<w:p>{_run_xml(str(v))}</w:p></w:tc>" for tcpr, v in zip(tcprs, row)
+        )
+        buf.append(f"<w:tr>{cells}</w:tr>")
+        if len(buf) >= chunk_rows:
+            flush()
+    if buf:
+        flush()
+
+
+def _rows_label(max_rows) -> str:
+    return "all" if max_rows is None else f"top {max_rows}"
+
+
+def _add_table_docx(doc: Document, title: str, df: pd.DataFrame, max_rows=30) -> None:
+    """max_rows가 None이면 전체 행을 넣는다."""
     doc.add_heading(title, level=2)
     if df.empty:
         doc.add_paragraph("(데이터 없음)")
         return
 
-    show_df = df.head(max_rows).copy()
+    show_df = df if max_rows is None else df.head(max_rows)
     table = doc.add_table(rows=1, cols=len(show_df.columns))
     table.style = "Table Grid"
 
@@ -68,117 +270,74 @@ def _add_table_docx(doc: Document, title: str, df: pd.DataFrame, max_rows: int =
         hdr_cells[i].text = str(c)
 
     # rows
-    for _, row in show_df.iterrows():
-        cells = table.add_row().cells
-        for i, c in enumerate(show_df.columns):
-            cells[i].text = "" if pd.isna(row[c]) else str(row[c])
+    _append_rows(table, _iter_rows(show_df))
 
-    if len(df) > max_rows:
+    if max_rows is not None and len(df) > max_rows:
         doc.add_paragraph(f"(표는 상위 {max_rows}행만 표시됨 / 전체 {len(df)}행)")
 
 
 # =========================
 # 메인 로직
 # =========================
-def main() -> None:
-    # 1) 입력 파일 존재 확인
-    paths = {k: os.path.join(INPUT_DIR, v) for k, v in CSV_FILES.items()}
-    for p in paths.values():
-        _require_file(p)
-
-    # 2) CSV 읽기
-    summary_df = pd.read_csv(paths["summary"])
-    tests_df = pd.read_csv(paths["tests"])
-    coverage_df = pd.read_csv(paths["coverage_files"])
-    lint_df = pd.read_csv(paths["lint"])
-    lint_top5_df = pd.read_csv(paths["lint_top5"])
-
-    # 3) summary.csv를 dict로 변환(metric,value)
+def _summary_metrics(summary_df: pd.DataFrame, tests_df=None, lint_df=None) -> dict:
+    # summary.csv를 dict로 변환(metric,value)
     #    예: tests_total, tests_passed, coverage_percent, lint_issues ...
+    #    tests/lint 표는 summary에 값이 없을 때의 대체값에만 쓰며, 읽지 않았으면(None) 0으로 본다
     summary_map = {}
     if not summary_df.empty and {"metric", "value"}.issubset(summary_df.columns):
-        for _, r in summary_df.iterrows():
-            summary_map[str(r["metric"])] = r["value"]
+        summary_map = {str(m): v for m, v in _iter_rows(summary_df[["metric", "value"]])}
+
+    return {
+        "tests_total": int(_safe_float(summary_map.get("tests_total", 0 if tests_df is None else len(tests_df)))),
+        "tests_passed": int(_safe_float(summary_map.get("tests_passed", 0))),
+        "tests_failed": int(_safe_float(summary_map.get("tests_failed", 0))),
+        "tests_skipped": int(_safe_float(summary_map.get("tests_skipped", 0))),
+        "tests_time_sec": _safe_float(summary_map.get("tests_time_sec", 0.0)),
+        "coverage_percent": _safe_float(summary_map.get("coverage_percent", 0.0)),
+        "lint_issues": int(_safe_float(summary_map.get("lint_issues", 0 if lint_df is None else len(lint_df)))),
+    }
+
+
+def build_xlsx(frames: dict, sections=SECTIONS) -> Workbook:
+    """
+    Excel 생성: out/quality_summary.xlsx (sections에 든 섹션의 시트만)
+    - Summary(원본 metric/value)
+    - Tests(테스트 케이스)
+    - Coverage(파일별 커버리지)
+    - Lint(린트 상세)
+    - LintTop5(Top5)
+    """
+    wb = Workbook(write_only=True)
+    if "summary" in sections:
+        _write_sheet(wb, "Summary", frames["summary"].reindex(columns=["metric", "value"]), placeholder=False)
+    if "tests" in sections:
+        _write_sheet(wb, "Tests", frames["tests"])
+    if "coverage" in sections:
+        _write_sheet(wb, "Coverage", frames["coverage_files"])
+    if "lint" in sections:
+        _write_sheet(wb, "Lint", frames["lint"])
+        _write_sheet(wb, "LintTop5", frames["lint_top5"])
+    if "tests" in sections:
+        for key, title in (("test_durations", "TestDurations"), ("duration_histogram", "DurationHistogram"),
+                           ("test_flips", "TestFlips")):
+            if frames.get(key) is not None:
+                _write_sheet(wb, title, frames[key])
+    if "trends" in sections and frames.get("trend_runs") is not None:
+        _write_sheet(wb, "Trends", frames["trend_runs"])
+        _write_sheet(wb, "FlakyTests", frames["flaky_tests"])
+    return wb
+
+
+def build_docx(frames: dict, metrics: dict, list_rows=20, detail_rows=30, sections=SECTIONS) -> Document:
+    """
+    Word 생성: out/quality_report.docx (sections에 든 섹션만, 번호는 순서대로 다시 매김)
+    - 요약(핵심 지표)
+    - 테스트 요약 + 실패 케이스 상위 표시
+    - 커버리지 Top/Bottom
+    - 린트 Top5 + 상세 일부
+    """
+    agg = frames.get("aggregates")
 
-    tests_total = int(_safe_float(summary_map.get("tests_total", len(tests_df))))
-    tests_passed = int(_safe_float(summary_map.get("tests_passed", 0)))
-    tests_failed = int(_safe_float(summary_map.get("tests_failed", 0)))
-    tests_skipped = int(_safe_float(summary_map.get("tests_skipped", 0)))
-    tests_time_sec = _safe_float(summary_map.get("tests_time_sec", 0.0))
-
-    coverage_percent = _safe_float(summary_map.get("coverage_percent", 0.0))
-    lint_issues = int(_safe_float(summary_map.get("lint_issues", len(lint_df))))
-
-    # 4) out 폴더 생성
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    # =========================
-    # A) Excel 생성: out/quality_summary.xlsx
-    # - Summary(원본 metric/value)
-    # - Tests(테스트 케이스)
-    # - Coverage(파일별 커버리지)
-    # - Lint(린트 상세)
-    # - LintTop5(Top5)
-    # =========================
-    wb = Workbook()
-
-    # Sheet 1: Summary
-    ws = wb.active
-    ws.title = "Summary"
-    ws.append(["metric", "value"])
-    for _, r in summary_df.iterrows():
-        ws.append([r.get("metric", ""), r.get("value", "")])
-    _auto_fit_columns(ws)
-
-    # Sheet 2: Tests
-    ws2 = wb.create_sheet("Tests")
-    if not tests_df.empty:
-        ws2.append(list(tests_df.columns))
-        for _, r in tests_df.iterrows():
-            ws2.append([("" if pd.isna(v) else v) for v in r.tolist()])
-    else:
-        ws2.append(["(no data)"])
-    _auto_fit_columns(ws2)
-
-    # Sheet 3: Coverage
-    ws3 = wb.create_sheet("Coverage")
-    if not coverage_df.empty:
-        ws3.append(list(coverage_df.columns))
-        for _, r in coverage_df.iterrows():
-            ws3.append([("" if pd.isna(v) else v) for v in r.tolist()])
-    else:
-        ws3.append(["(no data)"])
-    _auto_fit_columns(ws3)
-
-    # Sheet 4: Lint
-    ws4 = wb.create_sheet("Lint")
-    if not lint_df.empty:
-        ws4.append(list(lint_df.columns))
-        for _, r in lint_df.iterrows():
-            ws4.append([("" if pd.isna(v) else v) for v in r.tolist()])
-    else:
-        ws4.append(["(no data)"])
-    _auto_fit_columns(ws4)
-
-    # Sheet 5: LintTop5
-    ws5 = wb.create_sheet("LintTop5")
-    if not lint_top5_df.empty:
-        ws5.append(list(lint_top5_df.columns))
-        for _, r in lint_top5_df.iterrows():
-            ws5.append([("" if pd.isna(v) else v) for v in r.tolist()])
-    else:
-        ws5.append(["(no data)"])
-    _auto_fit_columns(ws5)
-
-    wb.save(SUMMARY_XLSX)
-
-    # =========================
-    # B) Word 생성: out/quality_report.docx
-    # - 요약(핵심 지표)
-    # - 테스트 요약 + 실패 케이스 상위 표시
-    # - 커버리지 Top/Bottom
-    # - 린트 Top5 + 상세 일부
-    # =========================
     doc = Document()
 
     # 기본 글꼴 크기(선택)
@@ -188,84 +347,457 @@ def main() -> None:
 
     doc.add_heading("Software Quality Report", level=1)
     doc.add_paragraph(f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    n = 0
+
+    if "summary" in sections:
+        # 1) 핵심 요약
+        n += 1
+        doc.add_heading(f"{n}. Executive Summary", level=2)
+        doc.add_paragraph(f"- Total tests: {metrics['tests_total']}")
+        doc.add_paragraph(
+            f"- Passed: {metrics['tests_passed']}, Failed: {metrics['tests_failed']}, Skipped: {metrics['tests_skipped']}"
+        )
+        doc.add_paragraph(f"- Test time (sec): {metrics['tests_time_sec']}")
+        doc.add_paragraph(f"- Coverage (%): {metrics['coverage_percent']}")
+        doc.add_paragraph(f"- Lint issues: {metrics['lint_issues']}")
+
+        # 2) Summary 원본 표
+        n += 1
+        _add_table_docx(doc, f"{n}. Raw Summary (summary.csv)", frames["summary"], max_rows=50)
+
+    if "tests" in sections:
+        # 3) Tests 결과 (실패/스킵 케이스 일부)
+        n += 1
+        _add_tests_docx(doc, n, frames, agg, list_rows, detail_rows)
+
+    if "coverage" in sections:
+        # 4) Coverage 요약
+        n += 1
+        _add_coverage_docx(doc, n, frames["coverage_files"], agg, detail_rows)
+
+    if "lint" in sections:
+        # 5) Lint 요약
+        n += 1
+        _add_lint_docx(doc, n, frames["lint"], frames["lint_top5"], agg, detail_rows)
+
+    # 6) 이력 추이 (--history)
+    runs = frames.get("trend_runs")
+    if "trends" in sections and runs is not None:
+        n += 1
+        doc.add_heading(f"{n}. Trends (last {len(runs)} runs)", level=2)
+        _add_table_docx(doc, f"{n}.1 Coverage / Lint by run", runs, max_rows=None)
+        flaky = frames["flaky_tests"]
+        if flaky.empty:
+            doc.add_paragraph(f"{n}.2 Flaky tests: (none)")
+        else:
+            _add_table_docx(doc, f"{n}.2 Flaky tests", flaky, max_rows=None)
 
-    # 1) 핵심 요약
-    doc.add_heading("1. Executive Summary", level=2)
-    doc.add_paragraph(f"- Total tests: {tests_total}")
-    doc.add_paragraph(f"- Passed: {tests_passed}, Failed: {tests_failed}, Skipped: {tests_skipped}")
-    doc.add_paragraph(f"- Test time (sec): {tests_time_sec}")
-    doc.add_paragraph(f"- Coverage (%): {coverage_percent}")
-    doc.add_paragraph(f"- Lint issues: {lint_issues}")
+    # 결론
+    n += 1
+    doc.add_heading(f"{n}. Conclusion", level=2)
+    doc.add_paragraph(
+        "본 보고서는 테스트(pytest), 커버리지(coverage), 정적분석(ruff) 결과를 CSV로 집계한 뒤, "
+        "Excel과 Word 산출물로 자동 생성한다. 이를 통해 CI 환경에서 품질 지표를 일관되게 확인하고 "
+        "보고서 형태로 공유할 수 있다."
+    )
+
+    return doc
 
-    # 2) Summary 원본 표
-    _add_table_docx(doc, "2. Raw Summary (summary.csv)", summary_df, max_rows=50)
 
-    # 3) Tests 결과 (실패/스킵 케이스 일부)
-    doc.add_heading("3. Test Results (tests.csv)", level=2)
+def _add_tests_docx(doc: Document, n: int, frames: dict, agg, list_rows, detail_rows) -> None:
+    tests_df = frames["tests"]
+    doc.add_heading(f"{n}. Test Results (tests.csv)", level=2)
     if tests_df.empty:
         doc.add_paragraph("(테스트 데이터 없음)")
-    else:
-        doc.add_paragraph(f"Total testcases: {len(tests_df)}")
+        return
+    doc.add_paragraph(f"Total testcases: {len(tests_df)}")
 
-        # 실패/스킵 케이스 우선 표시
-        if "status" in tests_df.columns:
-            failed = tests_df[tests_df["status"].astype(str).str.lower() == "failed"]
-            skipped = tests_df[tests_df["status"].astype(str).str.lower() == "skipped"]
+    # 실패/스킵 케이스 우선 표시
+    if "status" in tests_df.columns:
+        failed = tests_df[tests_df["status"].isin(FAILED_STATUSES)]
+        skipped = tests_df[tests_df["status"] == "skipped"]
 
-            if not failed.empty:
-                _add_table_docx(doc, "3.1 Failed Testcases (top 20)", failed, max_rows=20)
-            else:
-                doc.add_paragraph("3.1 Failed Testcases: (none)")
+        if not failed.empty:
+            _add_table_docx(doc, f"{n}.1 Failed Testcases ({_rows_label(list_rows)})", failed, max_rows=list_rows)
+        else:
+            doc.add_paragraph(f"{n}.1 Failed Testcases: (none)")
 
-            if not skipped.empty:
-                _add_table_docx(doc, "3.2 Skipped Testcases (top 20)", skipped, max_rows=20)
-            else:
-                doc.add_paragraph("3.2 Skipped Testcases: (none)")
+        if not skipped.empty:
+            _add_table_docx(doc, f"{n}.2 Skipped Testcases ({_rows_label(list_rows)})", skipped, max_rows=list_rows)
+        else:
+            doc.add_paragraph(f"{n}.2 Skipped Testcases: (none)")
+    else:
+        _add_table_docx(doc, f"{n}.1 Testcases ({_rows_label(detail_rows)})", tests_df, max_rows=detail_rows)
+
+    slowest = _agg_section(agg, "slowest_test", "test", "time_sec")
+    if slowest is not None and not slowest.empty:
+        _add_table_docx(doc, f"{n}.3 Slowest Testcases", slowest, max_rows=None)
+
+    # quality_to_csv --timings 산출물이 있을 때만
+    durations = frames.get("test_durations")
+    if durations is not None and not durations.empty:
+        _add_table_docx(doc, f"{n}.4 Duration percentiles by class ({_rows_label(list_rows)}, by total)",
+                        durations, max_rows=list_rows)
+    hist = frames.get("duration_histogram")
+    if hist is not None and not hist.empty:
+        _add_table_docx(doc, f"{n}.5 Duration histogram", hist[["bucket", "count", "total_sec"]], max_rows=None)
+    flips = frames.get("test_flips")
+    if flips is not None:
+        if flips.empty:
+            doc.add_paragraph(f"{n}.6 Status flips across junit inputs: (none)")
         else:
-            _add_table_docx(doc, "3.1 Testcases (top 30)", tests_df, max_rows=30)
+            _add_table_docx(doc, f"{n}.6 Status flips across junit inputs ({_rows_label(list_rows)})", flips,
+                            max_rows=list_rows)
 
-    # 4) Coverage 요약
-    doc.add_heading("4. Coverage (coverage_files.csv)", level=2)
+
+def _add_coverage_docx(doc: Document, n: int, coverage_df: pd.DataFrame, agg, detail_rows) -> None:
+    doc.add_heading(f"{n}. Coverage (coverage_files.csv)", level=2)
     if coverage_df.empty:
         doc.add_paragraph("(커버리지 데이터 없음)")
+    elif agg is not None:
+        # quality_to_csv가 한 번의 패스로 구해 둔 상·하위 5개
+        top5 = _agg_section(agg, "coverage_top", "filename", "coverage_percent")
+        bottom5 = _agg_section(agg, "coverage_bottom", "filename", "coverage_percent")
+        _add_table_docx(doc, f"{n}.1 Top 5 Coverage Files", top5, max_rows=5)
+        _add_table_docx(doc, f"{n}.2 Bottom 5 Coverage Files", bottom5, max_rows=5)
+    elif "coverage_percent" in coverage_df.columns:
+        cov_sorted = coverage_df.copy()
+        cov_sorted["coverage_percent"] = cov_sorted["coverage_percent"].apply(_safe_float)
+
+        top5 = cov_sorted.sort_values("coverage_percent", ascending=False).head(5)
+        bottom5 = cov_sorted.sort_values("coverage_percent", ascending=True).head(5)
+
+        _add_table_docx(doc, f"{n}.1 Top 5 Coverage Files", top5, max_rows=5)
+        _add_table_docx(doc, f"{n}.2 Bottom 5 Coverage Files", bottom5, max_rows=5)
     else:
-        if "coverage_percent" in coverage_df.columns:
-            cov_sorted = coverage_df.copy()
-            cov_sorted["coverage_percent"] = cov_sorted["coverage_percent"].apply(_safe_float)
-
-            top5 = cov_sorted.sort_values("coverage_percent", ascending=False).head(5)
-            bottom5 = cov_sorted.sort_values("coverage_percent", ascending=True).head(5)
+        _add_table_docx(doc, f"{n}.1 Coverage Files ({_rows_label(detail_rows)})", coverage_df, max_rows=detail_rows)
 
-            _add_table_docx(doc, "4.1 Top 5 Coverage Files", top5, max_rows=5)
-            _add_table_docx(doc, "4.2 Bottom 5 Coverage Files", bottom5, max_rows=5)
-        else:
-            _add_table_docx(doc, "4.1 Coverage Files (top 30)", coverage_df, max_rows=30)
 
-    # 5) Lint 요약
-    doc.add_heading("5. Lint (ruff) Results", level=2)
+def _add_lint_docx(doc: Document, n: int, lint_df: pd.DataFrame, lint_top5_df: pd.DataFrame, agg,
+                   detail_rows) -> None:
+    doc.add_heading(f"{n}. Lint (ruff) Results", level=2)
     if lint_top5_df.empty:
         doc.add_paragraph("(lint_top5 데이터 없음)")
     else:
-        _add_table_docx(doc, "5.1 Top 5 Lint Rules", lint_top5_df, max_rows=10)
+        _add_table_docx(doc, f"{n}.1 Top 5 Lint Rules", lint_top5_df, max_rows=10)
 
     if lint_df.empty:
-        doc.add_paragraph("5.2 Lint details: (none)")
+        doc.add_paragraph(f"{n}.2 Lint details: (none)")
     else:
-        _add_table_docx(doc, "5.2 Lint details (top 30)", lint_df, max_rows=30)
+        _add_table_docx(doc, f"{n}.2 Lint details ({_rows_label(detail_rows)})", lint_df, max_rows=detail_rows)
+
+    lint_files = _agg_section(agg, "file_lint_count", "filename", "count")
+    if lint_files is not None and not lint_files.empty:
+        _add_table_docx(doc, f"{n}.3 Files with most lint issues", lint_files, max_rows=None)
+
+
+def _diff_frames(tables) -> dict:
+    return {name: pd.DataFrame(rows, columns=cols) for name, cols, rows in tables}
+
+
+def build_diff_xlsx(frames: dict, sections=SECTIONS) -> Workbook:
+    """
+    Excel 생성 (--baseline/--diff): 기준 실행 대비 바뀐 행만
+    - Summary(지표별 기준값/현재값/증감)
+    - Tests / Lint / Coverage(변경분)
+    """
+    wb = Workbook(write_only=True)
+    if "summary" in sections:
+        _write_sheet(wb, "Summary", frames["diff_summary"], placeholder=False)
+    if "tests" in sections:
+        _write_sheet(wb, "Tests", frames["diff_tests"])
+    if "lint" in sections:
+        _write_sheet(wb, "Lint", frames["diff_lint"])
+    if "coverage" in sections:
+        _write_sheet(wb, "Coverage", frames["diff_coverage"])
+    return wb
+
+
+def build_docx_diff(frames: dict, baseline=None, detail_rows=30, sections=SECTIONS) -> Document:
+    """
+    Word 생성 (--baseline/--diff): 새 실패, 새 린트 이슈, 커버리지 증감 위주
+    """
+    doc = Document()
+    style = doc.styles["Normal"]
+    style.font.name = "Malgun Gothic"
+    style.font.size = Pt(10)
 
-    # 6) 결론
-    doc.add_heading("6. Conclusion", level=2)
-    doc.add_paragraph(
-        "본 보고서는 테스트(pytest), 커버리지(coverage), 정적분석(ruff) 결과를 CSV로 집계한 뒤, "
-        "Excel과 Word 산출물로 자동 생성한다. 이를 통해 CI 환경에서 품질 지표를 일관되게 확인하고 "
-        "보고서 형태로 공유할 수 있다."
-    )
+    doc.add_heading("Software Quality Diff Report", level=1)
+    doc.add_paragraph(f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if baseline:
+        doc.add_paragraph(f"Baseline: {baseline}")
+    n = 0
+
+    # 1) 지표 증감
+    if "summary" in sections:
+        n += 1
+        _add_table_docx(doc, f"{n}. Summary changes", frames["diff_summary"], max_rows=None)
+
+    # 2) 테스트 변경
+    if "tests" in sections:
+        n += 1
+        tests = frames["diff_tests"]
+        doc.add_heading(f"{n}. Test changes", level=2)
+        new_fail = tests[tests["change"] == "new_failure"]
+        fixed = tests[tests["change"] == "fixed"]
+        other = tests[~tests["change"].isin(["new_failure", "fixed"])]
+        doc.add_paragraph(f"New failures: {len(new_fail)}, Fixed: {len(fixed)}, Other changes: {len(other)}")
+        if not new_fail.empty:
+            _add_table_docx(doc, f"{n}.1 New failures ({_rows_label(detail_rows)})", new_fail, max_rows=detail_rows)
+        else:
+            doc.add_paragraph(f"{n}.1 New failures: (none)")
+        if not fixed.empty:
+            _add_table_docx(doc, f"{n}.2 Fixed ({_rows_label(detail_rows)})", fixed, max_rows=detail_rows)
+        else:
+            doc.add_paragraph(f"{n}.2 Fixed: (none)")
+        if not other.empty:
+            _add_table_docx(doc, f"{n}.3 Added / removed / changed ({_rows_label(detail_rows)})", other,
+                            max_rows=detail_rows)
+
+    # 3) 린트 변경
+    if "lint" in sections:
+        n += 1
+        lint = frames["diff_lint"]
+        doc.add_heading(f"{n}. Lint changes", level=2)
+        new_lint = lint[lint["change"] == "new"]
+        resolved = lint[lint["change"] == "resolved"]
+        doc.add_paragraph(f"New issues: {len(new_lint)}, Resolved: {len(resolved)}")
+        if not new_lint.empty:
+            _add_table_docx(doc, f"{n}.1 New issues ({_rows_label(detail_rows)})", new_lint, max_rows=detail_rows)
+        else:
+            doc.add_paragraph(f"{n}.1 New issues: (none)")
+        if not resolved.empty:
+            _add_table_docx(doc, f"{n}.2 Resolved issues ({_rows_label(detail_rows)})", resolved,
+                            max_rows=detail_rows)
+
+    # 4) 커버리지 변경 (감소 먼저, 추가/삭제 파일은 뒤에)
+    if "coverage" in sections:
+        n += 1
+        cov = frames["diff_coverage"]
+        if cov.empty:
+            doc.add_heading(f"{n}. Coverage changes", level=2)
+            doc.add_paragraph("(변경 없음)")
+        else:
+            cov = cov.sort_values("delta", na_position="last", kind="stable")
+            _add_table_docx(doc, f"{n}. Coverage changes ({_rows_label(detail_rows)})", cov, max_rows=detail_rows)
+
+    return doc
+
+
+# =========================
+# 렌더링 (직렬 / 병렬)
+# =========================
+# 렌더러는 data(dict: frames, metrics, list_rows, detail_rows, baseline, sections)를 받아 save(path)가 있는 객체를 만든다.
+# 산출물을 늘릴 때는 렌더러를 만들고 main의 outputs에 (이름, 렌더러, 경로)를 더한다.
+def _render_xlsx(data: dict) -> Workbook:
+    return build_xlsx(data["frames"], data["sections"])
+
+
+def _render_docx(data: dict) -> Document:
+    return build_docx(data["frames"], data["metrics"], data["list_rows"], data["detail_rows"], data["sections"])
+
+
+def _render_diff_xlsx(data: dict) -> Workbook:
+    return build_diff_xlsx(data["frames"], data["sections"])
+
+
+def _render_diff_docx(data: dict) -> Document:
+    return build_docx_diff(data["frames"], data["baseline"], data["detail_rows"], data["sections"])
+
+
+_SHARED = None  # 워커 프로세스의 data (fork면 복사 없이 부모 메모리를 물려받는다)
+
+
+def _init_worker(data: dict) -> None:
+    global _SHARED
+    _SHARED = data
+
+
+def _render_one(data: dict, render, path: str) -> dict:
+    t0 = time.perf_counter()
+    obj = render(data)
+    t1 = time.perf_counter()
+    obj.save(path)
+    return {"build_s": round(t1 - t0, 4), "save_s": round(time.perf_counter() - t1, 4)}
+
+
+def _render_worker(task) -> dict:
+    _, render, path = task
+    return _render_one(_SHARED, render, path)
+
+
+def _report_failure(name: str, path: str, exc: BaseException) -> None:
+    # 워커 예외는 원격 traceback을 __cause__로 달고 온다
+    detail = exc.__cause__
+    print(f"✘ {name} 생성 실패 ({path}): {type(exc).__name__}: {exc}", file=sys.stderr)
+    print(str(detail) if detail is not None else "".join(traceback.format_exception(type(exc), exc, exc.__traceback__)),
+          file=sys.stderr)
+    # 실패한 산출물이 이전 실행 결과로 남아 있으면 최신처럼 보이므로 지운다
+    if os.path.isfile(path):
+        os.remove(path)
+
+
+def render_outputs(data: dict, outputs: list, jobs: int = 1, prof=None) -> list:
+    """outputs: [(이름, 렌더러, 경로), ...]. jobs가 2 이상이면 산출물마다 별도 프로세스에서 동시에 만든다.
+    하나가 실패해도 나머지는 끝까지 만들고, 실패한 이름 목록을 돌려준다."""
+    prof = prof or Profiler("quality_report")
+    failed = []
+    if jobs <= 1 or len(outputs) <= 1:
+        for name, render, path in outputs:
+            try:
+                with prof.stage(f"{name}_build"):
+                    obj = render(data)
+                with prof.stage(f"{name}_save"):
+                    obj.save(path)
+            except Exception as e:
+                _report_failure(name, path, e)
+                failed.append(name)
+        return failed
+
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with prof.stage("render") as rec:
+        rec["outputs"] = {}
+        with ProcessPoolExecutor(max_workers=min(jobs, len(outputs)), mp_context=ctx,
+                                 initializer=_init_worker, initargs=(data,)) as ex:
+            futures = [(name, path, ex.submit(_render_worker, (name, render, path))) for name, render, path in outputs]
+            for name, path, fut in futures:
+                try:
+                    rec["outputs"][name] = fut.result()
+                except Exception as e:  # BrokenProcessPool(워커 비정상 종료) 포함
+                    _report_failure(name, path, e)
+                    failed.append(name)
+    return failed
+
+
+def _parse_sections(value: str) -> list:
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in names if v not in SECTIONS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(f"알 수 없는 섹션: {', '.join(unknown) if unknown else repr(value)} (가능: {','.join(SECTIONS)})")
+    return [v for v in SECTIONS if v in names]
+
+
+def _section_inputs(sections: list, table: dict) -> list:
+    """선택한 섹션이 읽는 표 이름 (중복 없이, table 정의 순서)."""
+    keys = []
+    for sec in sections:
+        keys += [k for k in table[sec] if k not in keys]
+    return keys
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input-dir", default=INPUT_DIR)
+    ap.add_argument("--output-dir", default=OUTPUT_DIR)
+    ap.add_argument("--input-format", choices=["auto", "csv", "parquet"], default="auto")
+    ap.add_argument("--docx-max-rows", type=int, default=None,
+                    help="Word 상세 표(실패/스킵/커버리지/린트)의 최대 행 수. 0이면 전체")
+    ap.add_argument("--history", metavar="DB", help="quality_to_csv --history로 쌓은 SQLite 이력(추이 섹션 추가)")
+    ap.add_argument("--history-runs", type=int, default=20, help="추이에 표시할 최근 실행 수")
+    ap.add_argument("--baseline", metavar="DIR", help="기준 실행의 quality_to_csv 출력 폴더(바뀐 것만 보고)")
+    ap.add_argument("--diff", action="store_true", help="입력 폴더의 diff_* 표(quality_to_csv --baseline)로 변경분만 보고")
+    ap.add_argument("--sections", type=_parse_sections, default=SECTIONS,
+                    help=f"만들 섹션(쉼표 구분, 기본: 전체). 선택한 섹션이 쓰는 입력만 읽는다: {','.join(SECTIONS)}")
+    ap.add_argument("--jobs", type=int, default=1, help="2 이상이면 Excel/Word를 별도 프로세스에서 동시에 생성")
+    ap.add_argument("--no-cache", action="store_true", help="입력이 그대로여도 보고서를 다시 생성")
+    add_profile_args(ap)
+    args = ap.parse_args(argv)
+    prof = Profiler.from_args("quality_report", args)
+    try:  # 변경 없음으로 일찍 끝나거나 실패해도 트레이스는 남긴다
+        _run(args, prof)
+    finally:
+        prof.finish()
+
+
+def _run(args, prof: Profiler) -> None:
+    summary_xlsx = os.path.join(args.output_dir, os.path.basename(SUMMARY_XLSX))
+    report_docx = os.path.join(args.output_dir, os.path.basename(REPORT_DOCX))
+    stamp_path = os.path.join(args.output_dir, STAMP_FILE)
+    if args.docx_max_rows is None:
+        list_rows, detail_rows = 20, 30
+    else:
+        list_rows = detail_rows = args.docx_max_rows or None
+
+    sections = args.sections
+    history = args.history if "trends" in sections else None
+
+    # 1) 입력 파일 존재 확인 (선택한 섹션이 쓰는 표만). 이력 DB는 없으면 connect가 빈 DB를 만들어 버리므로 먼저 본다
+    if history:
+        _require_file(history)
+    if args.baseline:
+        keys = ["summary", "tests", "coverage_files", "lint"]  # diff_outputs가 모두 비교한다
+    elif args.diff:
+        keys = _section_inputs(sections, DIFF_SECTION_INPUTS)
+    else:
+        keys = _section_inputs(sections, SECTION_INPUTS)
+    paths = _resolve_inputs(args.input_dir, args.input_format, keys)
+    for k, p in paths.items():
+        if k not in OPTIONAL_INPUTS:
+            _require_file(p)
+
+    # 입력 CSV와 보고서 코드가 그대로이고 산출물이 있으면 건너뛴다
+    options = f"docx_max_rows={args.docx_max_rows};diff={args.diff};sections={','.join(sections)}"
+    if args.baseline:
+        base_paths = _resolve_inputs(args.baseline, "auto", ("summary", "tests", "coverage_files", "lint"))
+        options += f";baseline={os.path.abspath(args.baseline)};" + _inputs_digest(base_paths)
+    if history:
+        st = os.stat(history)
+        options += f";history={os.path.abspath(history)}:{st.st_mtime_ns}:{st.st_size}:{args.history_runs}"
+    with prof.stage("stamp") as rec:
+        digest = _inputs_digest(paths, options)
+        rec["unchanged"] = not args.no_cache and os.path.exists(summary_xlsx) and os.path.exists(report_docx) \
+            and os.path.exists(stamp_path) and Path(stamp_path).read_text(encoding="utf-8") == digest
+    if rec["unchanged"]:
+        print("✔ 입력 변경 없음 (기존 보고서 유지)")
+        print(f"- Excel: {summary_xlsx}")
+        print(f"- Word : {report_docx}")
+        return
 
-    doc.save(REPORT_DOCX)
+    # 기준 실행 대비 변경분만 보고
+    diff_mode = bool(args.baseline or args.diff)
+    if diff_mode:
+        with prof.stage("load") as rec:
+            if args.baseline:
+                frames = _diff_frames(diff_outputs(paths, args.baseline))
+            else:
+                frames = {k: _read_table(p, k) for k, p in paths.items()}
+            rec["rows"] = sum(len(df) for df in frames.values())
+        metrics = None
+        outputs = [("xlsx", _render_diff_xlsx, summary_xlsx), ("docx", _render_diff_docx, report_docx)]
+    else:
+        # 2) CSV(또는 Parquet) 읽기
+        with prof.stage("load") as rec:
+            frames = {k: _read_table(p, k) if os.path.exists(p) else None for k, p in paths.items()}
+            if history:
+                frames.update(_load_trends(history, args.history_runs))
+            rec["rows"] = sum(len(df) for df in frames.values() if df is not None)
+
+        # 3) 요약 지표
+        metrics = None
+        if "summary" in sections:
+            with prof.stage("summary"):
+                metrics = _summary_metrics(frames["summary"], frames.get("tests"), frames.get("lint"))
+        outputs = [("xlsx", _render_xlsx, summary_xlsx), ("docx", _render_docx, report_docx)]
 
-    print("✔ 완료")
-    print(f"- Excel: {SUMMARY_XLSX}")
-    print(f"- Word : {REPORT_DOCX}")
+    # 4) out 폴더 생성
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # 5) Excel / Word (--jobs 2 이상이면 동시에)
+    data = {"frames": frames, "metrics": metrics, "list_rows": list_rows, "detail_rows": detail_rows,
+            "baseline": args.baseline, "sections": sections}
+    failed = render_outputs(data, outputs, args.jobs, prof)
+    if failed:
+        print(f"✘ 실패: {', '.join(failed)}")
+        for name, _, path in outputs:
+            if name not in failed:
+                print(f"- {name}: {path}")
+        raise SystemExit(1)
+    Path(stamp_path).write_text(digest, encoding="utf-8")
+
+    print("✔ 완료 (변경분 보고서)" if diff_mode else "✔ 완료")
+    print(f"- Excel: {summary_xlsx}")
+    print(f"- Word : {report_docx}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,250 @@
+# quality_report_server.py
+"""
+quality_report 상주 서비스 (localhost HTTP)
+
+보고서 한 건마다 pandas/openpyxl/python-docx import와 첫 사용 비용(1초 이상)을 치르지 않도록, 미리 띄워 둔
+워커 프로세스 풀에서 quality_report.main을 실행한다. 워커는 시작할 때 한 번 import와 예열을 끝내 두므로
+요청당 지연은 실제 렌더링 시간에 가깝다. 요청은 CLI와 같은 argv를 받는다.
+
+  python quality_report_server.py --port 8765 --workers 4
+  curl -s localhost:8765/render -d '{"args": ["--input-dir", "/abs/out_csv", "--output-dir", "/abs/out"]}'
+  python quality_report_server.py --submit -- --input-dir out_csv --output-dir out   # 가벼운 클라이언트
+
+- POST /render  {"args": [...], "cwd": "상대 경로 기준 폴더(선택)"}
+                -> {"ok", "exit_code", "stdout", "stderr", "elapsed_s", "worker"}
+                   200 성공, 400 인자 오류, 500 생성 실패, 503 대기열 초과
+- GET  /health  -> {"workers", "running", "done", "failed"}
+
+동시에 만드는 보고서 수는 --workers, 기다릴 수 있는 요청 수는 --max-pending으로 제한한다.
+이 모듈은 표준 라이브러리만 import하며(클라이언트 모드가 가볍게 뜨도록), quality_report는 워커에서만 읽는다.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+# =========================
+# 워커 (별도 프로세스)
+# =========================
+def _init_worker() -> None:
+    # import와 지연 import(read_csv 엔진, openpyxl 스타일, docx 기본 템플릿 등)를 미리 끝낸다
+    import pandas as pd
+    from docx import Document
+    from openpyxl import Workbook
+
+    import quality_report  # noqa: F401
+
+    pd.read_csv(io.StringIO("metric,value\ntests_total,1\n"))
+    wb = Workbook(write_only=True)
+    wb.create_sheet("warm").append(["a", 1])
+    wb.save(io.BytesIO())
+    doc = Document()
+    doc.add_table(rows=1, cols=1).style = "Table Grid"
+    doc.save(io.BytesIO())
+
+
+def _warm_task() -> int:
+    time.sleep(0.1)  # 모든 워커가 뜨도록 잠시 붙잡는다
+    return os.getpid()
+
+
+def _run_job(args: list, cwd: str | None = None) -> dict:
+    import quality_report
+
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    prev = os.getcwd()
+    t0 = time.perf_counter()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with redirect_stdout(out), redirect_stderr(err):
+            quality_report.main(list(args))
+    except SystemExit as e:  # argparse 오류(2), 렌더러 실패(1)
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            code = 1
+            err.write(str(e.code))
+    except Exception:
+        code = 1
+        err.write(traceback.format_exc())
+    finally:
+        os.chdir(prev)
+    return {"ok": code == 0, "exit_code": code, "stdout": out.getvalue(), "stderr": err.getvalue(),
+            "elapsed_s": round(time.perf_counter() - t0, 4), "worker": os.getpid()}
+
+
+# =========================
+# HTTP 서버
+# =========================
+class ReportServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, workers: int = 2, max_pending: int = 32, verbose: bool = False):
+        super().__init__(addr, _Handler)
+        self.workers = workers
+        self.verbose = verbose
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self.stats = {"running": 0, "done": 0, "failed": 0}
+        self.pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # 스레드가 도는 서버 프로세스를 fork하지 않도록 forkserver(없으면 spawn)로 워커를 띄운다
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx, initializer=_init_worker)
+
+    def warm_up(self) -> list:
+        """워커를 모두 띄워 import/예열을 마친다. 워커 pid 목록을 돌려준다."""
+        futures = [self.pool.submit(_warm_task) for _ in range(self.workers)]
+        return sorted({f.result() for f in futures})
+
+    def submit(self, args: list, cwd: str | None) -> dict | None:
+        """작업 하나를 풀에서 실행하고 결과를 돌려준다. 대기열이 가득 차면 None."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            with self._lock:
+                self.stats["running"] += 1
+                pool = self.pool
+            try:
+                result = pool.submit(_run_job, args, cwd).result()
+            except BrokenProcessPool:
+                # 워커가 비정상 종료하면 풀 전체가 못 쓰게 되므로 새로 만든다
+                with self._lock:
+                    if self.pool is pool:
+                        self.pool = self._new_pool()
+                result = {"ok": False, "exit_code": 1, "stdout": "", "stderr": "워커 프로세스가 비정상 종료했습니다",
+                          "elapsed_s": None, "worker": None}
+            with self._lock:
+                self.stats["done" if result["ok"] else "failed"] += 1
+            return result
+        finally:
+            with self._lock:
+                self.stats["running"] -= 1
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "quality-report/1"
+
+    def _json(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            return self._json(404, {"error": "not found"})
+        with self.server._lock:
+            self._json(200, {"workers": self.server.workers, **self.server.stats})
+
+    def do_POST(self) -> None:
+        if self.path != "/render":
+            return self._json(404, {"error": "not found"})
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            args = job.get("args", [])
+            cwd = job.get("cwd")
+            if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+                raise ValueError("args는 문자열 목록이어야 합니다")
+            if cwd is not None and not isinstance(cwd, str):
+                raise ValueError("cwd는 문자열이어야 합니다")
+        except (ValueError, AttributeError) as e:
+            return self._json(400, {"error": f"잘못된 요청: {e}"})
+        result = self.server.submit(args, cwd)
+        if result is None:
+            return self._json(503, {"error": "대기 중인 요청이 너무 많습니다"})
+        status = 200 if result["ok"] else 400 if result["exit_code"] == 2 else 500
+        self._json(status, result)
+
+    def log_message(self, fmt, *args) -> None:
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+
+# =========================
+# 클라이언트
+# =========================
+def render(args: list, url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", cwd: str | None = None,
+           timeout: float = 600) -> dict:
+    """실행 중인 서비스에 보고서 작업을 보내고 결과 dict를 돌려준다. HTTP 오류 응답, 연결 실패, 시간 초과도
+    {"ok": False, "error": ...} 형태의 dict로 돌려준다."""
+    body = json.dumps({"args": list(args), "cwd": cwd or os.getcwd()}).encode("utf-8")
+    req = urllib.request.Request(url.rstrip("/") + "/render", data=body,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        try:
+            return json.loads(e.read() or b"{}") or {"ok": False, "error": str(e)}
+        except ValueError:  # 프록시 등이 JSON이 아닌 오류 페이지를 돌려준 경우
+            return {"ok": False, "error": str(e)}
+    except (urllib.error.URLError, OSError) as e:  # 서버가 없음, 시간 초과(TimeoutError) 등
+        return {"ok": False, "error": f"서비스에 연결할 수 없습니다 ({url}): {getattr(e, 'reason', e)}"}
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="quality_report 상주 서비스")
+    ap.add_argument("--host", default=DEFAULT_HOST)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--workers", type=int, default=max(1, min(4, os.cpu_count() or 1)),
+                    help="동시에 만드는 보고서 수(워커 프로세스 수)")
+    ap.add_argument("--max-pending", type=int, default=32, help="워커를 기다릴 수 있는 요청 수(넘치면 503)")
+    ap.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    ap.add_argument("--submit", action="store_true",
+                    help="서버를 띄우지 않고 -- 뒤의 quality_report 인자로 작업을 보낸다")
+    ap.add_argument("report_args", nargs=argparse.REMAINDER)
+    args = ap.parse_args(argv)
+
+    if args.submit:
+        report_args = args.report_args[1:] if args.report_args[:1] == ["--"] else args.report_args
+        result = render(report_args, f"http://{args.host}:{args.port}")
+        sys.stdout.write(result.get("stdout", ""))
+        err = result.get("stderr") or result.get("error")
+        if err:
+            sys.stderr.write(err if err.endswith("\n") else err + "\n")
+        raise SystemExit(result.get("exit_code", 1))
+
+    server = ReportServer((args.host, args.port), args.workers, args.max_pending, args.verbose)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    pids = server.warm_up()
+    print(f"✔ quality_report 서비스: http://{args.host}:{server.server_address[1]} (워커 {len(pids)}개)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
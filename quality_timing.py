@@ -0,0 +1,139 @@
+# quality_timing.py
+"""
+테스트 소요 시간 분석 (quality_to_csv --timings)
+
+testcase의 classname과 time을 압축 배열(array)에 모아 두고, 끝에서 numpy로 한 번에 계산한다(numpy 필요).
+- test_durations: classname별 개수, 합계, 평균, p50/p90/p99, 최대 (합계 큰 순)
+- duration_histogram: 고정 구간(BUCKETS)별 테스트 수와 합계 시간
+- test_flips: junit 입력이 여러 개일 때(재실행, 샤드 중복) 같은 테스트의 status가 바뀐 경우
+
+write_durations()는 pytest-split이 읽는 .test_durations 형식({"파일::클래스::테스트": 초})으로
+테스트별 소요 시간을 내보내 샤드를 시간 기준으로 나눌 수 있게 한다.
+"""
+from __future__ import annotations
+
+import json
+import os
+from array import array
+
+# 히스토그램 구간 경계(초). 마지막 구간은 상한 없음
+BUCKETS = [0.0, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, float("inf")]
+
+COLUMNS = {
+    "test_durations": ["classname", "count", "total_sec", "mean_sec", "p50_sec", "p90_sec", "p99_sec", "max_sec"],
+    "duration_histogram": ["bucket", "lo_sec", "hi_sec", "count", "total_sec"],
+    "test_flips": ["classname", "name", "runs", "statuses", "final_status"],
+}
+
+
+def nodeid(classname: str, name: str) -> str:
+    """junit classname("pkg.test_mod.TestCls")과 name을 pytest nodeid("pkg/test_mod.py::TestCls::name")로 바꾼다.
+    대문자로 시작하는 뒤쪽 조각을 클래스로 본다."""
+    parts = classname.split(".") if classname else []
+    k = len(parts)
+    while k > 1 and parts[k - 1][:1].isupper():
+        k -= 1
+    if not parts:
+        return name
+    return "::".join(["/".join(parts[:k]) + ".py", *parts[k:], name])
+
+
+class Timings:
+    """iter_tables의 관찰자(observer). track_tests면 테스트별 마지막 status/time을 기억해 status 변화(flip)와
+    .test_durations 출력에 쓴다(테스트 수만큼 메모리를 더 쓴다)."""
+
+    def __init__(self, track_tests: bool = False):
+        self._class_ids: dict = {}
+        self._cls = array("i")
+        self._time = array("d")
+        self._tests: dict | None = {} if track_tests else None
+        self._statuses: dict = {}  # 두 번 이상 나온 테스트만: (classname, name) -> [status, ...]
+
+    def add_case(self, case: dict) -> None:
+        cid = self._class_ids.setdefault(case["classname"], len(self._class_ids))
+        self._cls.append(cid)
+        self._time.append(case["time"])
+        if self._tests is None:
+            return
+        key = (case["classname"], case["name"])
+        prev = self._tests.get(key)
+        if prev is not None:
+            self._statuses.setdefault(key, [prev[0]]).append(case["status"])
+        self._tests[key] = (case["status"], case["time"])
+
+    def add_file(self, fobj: dict) -> None:
+        pass
+
+    def add_lint(self, it: dict) -> None:
+        pass
+
+    def _arrays(self):
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise RuntimeError("테스트 시간 분석에는 numpy가 필요합니다: pip install numpy") from e
+        return np, np.frombuffer(self._cls, dtype=np.intc), np.frombuffer(self._time, dtype=np.float64)
+
+    def class_rows(self) -> list:
+        """classname별 분위수. 정렬 한 번과 구간 인덱스 계산만으로 모든 클래스를 같이 구한다
+        (np.percentile의 linear 보간과 같은 값)."""
+        np, cls, t = self._arrays()
+        if not len(t):
+            return []
+        order = np.lexsort((t, cls))
+        cs, ts = cls[order], t[order]
+        starts = np.flatnonzero(np.r_[True, cs[1:] != cs[:-1]])
+        counts = np.diff(np.r_[starts, len(cs)])
+        totals = np.add.reduceat(ts, starts)
+
+        def pct(q):
+            pos = starts + (counts - 1) * q
+            lo = np.floor(pos).astype(np.intp)
+            hi = np.ceil(pos).astype(np.intp)
+            return ts[lo] + (ts[hi] - ts[lo]) * (pos - lo)
+
+        p50, p90, p99 = pct(0.5), pct(0.9), pct(0.99)
+        names = list(self._class_ids)
+        rows = [
+            [names[c], int(n), round(float(s), 4), round(float(s / n), 4), round(float(a), 4), round(float(b), 4),
+             round(float(d), 4), round(float(m), 4)]
+            for c, n, s, a, b, d, m in zip(cs[starts], counts, totals, p50, p90, p99, ts[starts + counts - 1])
+        ]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows
+
+    def histogram_rows(self) -> list:
+        np, _, t = self._arrays()
+        edges = np.array(BUCKETS)
+        idx = np.searchsorted(edges, t, side="right") - 1
+        counts = np.bincount(idx, minlength=len(edges) - 1)[: len(edges) - 1]
+        totals = np.bincount(idx, weights=t, minlength=len(edges) - 1)[: len(edges) - 1]
+        return [
+            [f"{lo:g}-{hi:g}s" if hi != float("inf") else f">={lo:g}s", lo, None if hi == float("inf") else hi,
+             int(n), round(float(s), 4)]
+            for lo, hi, n, s in zip(BUCKETS, BUCKETS[1:], counts, totals)
+        ]
+
+    def flip_rows(self) -> list:
+        return [
+            [cn, n, len(sts), ">".join(sts), sts[-1]]
+            for (cn, n), sts in self._statuses.items() if len(set(sts)) > 1
+        ]
+
+    def tables(self):
+        """(이름, 컬럼, 행) 순서로 시간 분석 표를 만든다."""
+        yield "test_durations", COLUMNS["test_durations"], self.class_rows()
+        yield "duration_histogram", COLUMNS["duration_histogram"], self.histogram_rows()
+        yield "test_flips", COLUMNS["test_flips"], self.flip_rows()
+
+    def write_durations(self, path: str) -> int:
+        """pytest-split의 .test_durations 파일을 쓴다. 쓴 테스트 수를 돌려준다."""
+        if self._tests is None:
+            raise ValueError("track_tests=True로 만들어야 합니다")
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        durations = {nodeid(cn, n): round(t, 4) for (cn, n), (_, t) in self._tests.items()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(durations, f, indent=1, sort_keys=True, ensure_ascii=False)
+        return len(durations)
@@ -1,13 +1,67 @@
 # quality_to_csv.py
 from __future__ import annotations
-import argparse, json, csv, xml.etree.ElementTree as ET
+import argparse, codecs, glob, gzip, hashlib, json, csv, mmap, os, pickle, re, xml.etree.ElementTree as ET
 from pathlib import Path
-from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from quality_aggregate import Aggregates, COLUMNS as AGG_COLUMNS
+from quality_diff import Baseline, DIFF_COLUMNS, RunDiff
+from quality_history import HistoryRecorder
+from quality_profile import Profiler, add_profile_args
+from quality_records import CaseTable, FileTable, LintTable, RunTable
+from quality_timing import Timings
+
+class _MappedReader:
+    """mmap 위의 순차 read(n). 지나간 구간은 window 단위로 MADV_DONTNEED 해서 매핑된 파일 페이지가
+    프로세스 RSS에 쌓이지 않게 한다(페이지 캐시에는 남는다). madvise가 없는 플랫폼에서는 그냥 읽는다."""
+    def __init__(self, m: mmap.mmap, window: int = 1 << 20):
+        self.m = m; self.window = window; self.released = 0
+        self.can_release = hasattr(m, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+        if hasattr(m, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"): m.madvise(mmap.MADV_SEQUENTIAL)
+    def read(self, n: int = -1) -> bytes:
+        data = self.m.read(n); pos = self.m.tell()
+        if self.can_release and pos - self.released >= self.window:
+            end = pos - pos % mmap.PAGESIZE
+            self.m.madvise(mmap.MADV_DONTNEED, self.released, end - self.released); self.released = end
+        return data
+
+@contextmanager
+def open_input(path: Path):
+    """입력 파일을 바이너리로 연다. gzip(매직 바이트로 판별, *.xml.gz 등)이면 GzipFile로 스트리밍 해제하고,
+    아니면 읽기 전용 mmap을 _MappedReader로 감싸 돌려준다. 파서는 read(n)으로 청크만 가져가므로 파일 전체가
+    힙에 복사되지 않고, 읽고 지나간 페이지는 RSS에서 내려간다. mmap할 수 없는 입력(빈 파일, 파이프)은
+    일반 파일 객체를 돌려준다."""
+    with open(path, "rb") as f:
+        if f.read(2) == b"\x1f\x8b":
+            f.seek(0)
+            with gzip.GzipFile(fileobj=f) as gz:
+                yield gz
+            return
+        f.seek(0)
+        try:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield f
+            return
+        with m:
+            yield _MappedReader(m)
+
+class _TextReader:
+    """바이너리 입력을 증분 디코드해 read(n)으로 문자열 청크를 돌려준다(BOM 제거 포함)."""
+    def __init__(self, raw, encoding: str = "utf-8-sig"):
+        self.raw = raw; self.dec = codecs.getincrementaldecoder(encoding)()
+    def read(self, n: int) -> str:
+        while True:  # 멀티바이트 문자/BOM만 읽힌 경우 빈 문자열(EOF로 오인)을 돌려주지 않는다
+            data = self.raw.read(n); text = self.dec.decode(data, final=not data)
+            if text or not data: return text
 
 def read_junit(path: Path) -> dict:
-    root = ET.parse(path).getroot()
+    with open_input(path) as src:
+        root = ET.parse(src).getroot()
     suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
-    total = failures = errors = skipped = 0; time_sum = 0.0; cases=[]
+    total = failures = errors = skipped = 0; time_sum = 0.0; cases = CaseTable()
     for s in suites:
         total += int(s.get("tests", 0)); failures += int(s.get("failures", 0))
         errors += int(s.get("errors", 0)); skipped += int(s.get("skipped", 0))
@@ -17,99 +71,529 @@ def read_junit(path: Path) -> dict:
             if tc.find("failure") is not None: status="failure"
             elif tc.find("error") is not None: status="error"
             elif tc.find("skipped") is not None: status="skipped"
-            cases.append({
-                "classname": tc.get("classname") or "",
-                "name": tc.get("name") or "",
-                "time": float(tc.get("time", 0.0) or 0.0),
-                "status": status
-            })
+            cases.append(tc.get("classname") or "", tc.get("name") or "", status, float(tc.get("time", 0.0) or 0.0))
     return {"total": total,"failures": failures,"errors": errors,"skipped": skipped,"time": time_sum,"cases": cases}
 
+def iter_junit(path: Path, totals: dict):
+    """iterparse로 testcase를 하나씩 yield한다. suite 합계는 totals에 누적되며,
+    처리가 끝난 요소는 바로 비워서 메모리 사용량이 suite 크기와 무관하게 일정하다."""
+    stack = []; suite_depth = None; suite = case = None; flags = set()
+    with open_input(path) as src:
+        for event, elem in ET.iterparse(src, events=("start", "end")):
+            depth = len(stack)
+            if event == "start":
+                if depth == 0: suite_depth = 0 if elem.tag == "testsuite" else 1
+                if depth == suite_depth and elem.tag == "testsuite":
+                    suite = elem
+                    totals["total"] += int(elem.get("tests", 0)); totals["failures"] += int(elem.get("failures", 0))
+                    totals["errors"] += int(elem.get("errors", 0)); totals["skipped"] += int(elem.get("skipped", 0))
+                    totals["time"] += float(elem.get("time", 0.0) or 0.0)
+                elif suite is not None and depth == suite_depth + 1 and elem.tag == "testcase":
+                    case = elem; flags = set()
+                elif case is not None and depth == suite_depth + 2:
+                    flags.add(elem.tag)
+                stack.append(elem)
+                continue
+            stack.pop()
+            if elem is case:
+                status = "ok"
+                if "failure" in flags: status="failure"
+                elif "error" in flags: status="error"
+                elif "skipped" in flags: status="skipped"
+                yield {
+                    "classname": elem.get("classname") or "",
+                    "name": elem.get("name") or "",
+                    "time": float(elem.get("time", 0.0) or 0.0),
+                    "status": status
+                }
+                case = None
+            elif elem is suite:
+                suite = None
+            # 끝난 자식은 부모에서 떼어낸다(부모의 속성은 start 시점에 이미 읽었음)
+            if stack: del stack[-1][:]
+            else: elem.clear()
+
+def stream_junit(*paths: Path) -> dict:
+    """read_junit과 같은 형태의 dict를 돌려주되 cases는 iter_junit 제너레이터다.
+    여러 경로를 주면 순서대로 이어서 읽는다. 합계 값은 cases를 끝까지 소비한 뒤에 확정된다."""
+    junit = {"total": 0,"failures": 0,"errors": 0,"skipped": 0,"time": 0.0}
+    junit["cases"] = (c for p in paths for c in iter_junit(p, junit))
+    return junit
+
+_cond_re = re.compile(r"\((\d+)/(\d+)\)")
+
+def _new_class(fn: str, lr) -> dict:
+    return {"filename": fn, "line_rate": float(lr) if lr else 0.0,
+            "lines_valid": 0, "lines_covered": 0, "branches_valid": 0, "branches_covered": 0}
+
+def _add_line(fobj: dict, uncovered: RunTable, line) -> None:
+    """<line> 하나를 클래스 카운터에 반영하고, 미커버 라인은 연속 번호끼리 start–end 구간으로 묶는다."""
+    n = int(line.get("number", 0)); fobj["lines_valid"] += 1
+    if int(line.get("hits", 0) or 0) > 0: fobj["lines_covered"] += 1
+    else: uncovered.add_line(fobj["filename"], n)
+    if line.get("branch") == "true":
+        m = _cond_re.search(line.get("condition-coverage") or "")
+        if m: fobj["branches_covered"] += int(m.group(1)); fobj["branches_valid"] += int(m.group(2))
+
 def read_coverage(path: Path) -> dict:
-    root = ET.parse(path).getroot()
+    with open_input(path) as src:
+        root = ET.parse(src).getroot()
     line_rate = float(root.get("line-rate", 0.0) or 0.0)
-    files=[]
+    files = FileTable(); uncovered = RunTable()
     for cls in root.findall(".//class"):
         fn = cls.get("filename")
         lr = cls.get("line-rate")
         if fn:
-            files.append({"filename": fn, "line_rate": float(lr) if lr else 0.0})
-    return {"line_rate": line_rate, "files": files}
-
-def read_ruff(path: Path) -> list[dict]:
-    if not path.exists() or path.stat().st_size == 0: return []
-    data = json.loads(path.read_text(encoding="utf-8"))
-    items = data.get("diagnostics", []) if isinstance(data, dict) else data
-    out=[]
-    for it in items:
-        filename = it.get("filename") or it.get("path") or ""
-        code = it.get("code") or (it.get("rule") or {}).get("code") or "NA"
-        msg = it.get("message") or (it.get("diagnostic") or {}).get("message") or ""
-        line = 0; col = 0
-        if isinstance(it.get("location"), dict):
-            line = it["location"].get("row") or it["location"].get("line") or 0
-            col  = it["location"].get("column") or it["location"].get("col") or 0
-        elif isinstance(it.get("range"), dict):
-            start = it["range"].get("start") or {}
-            line = start.get("line", 0); col = start.get("character", 0)
-        out.append({"filename": filename, "line": int(line), "col": int(col), "code": str(code), "message": msg})
+            fobj = _new_class(fn, lr)
+            for line in cls.findall("lines/line"): _add_line(fobj, uncovered, line)
+            files.append(fobj)
+    return {"line_rate": line_rate, "files": files, "uncovered": uncovered}
+
+def stream_coverage(path: Path) -> dict:
+    """read_coverage의 이벤트 기반 버전. 트리를 만들지 않고 클래스별 카운터만 유지하며
+    <line> 요소는 처리 직후 버린다. methods 아래의 중복 <line>은 세지 않는다."""
+    line_rate = 0.0; files = FileTable(); uncovered = RunTable()
+    stack = []; fobj = None
+    with open_input(path) as src:
+        for event, elem in ET.iterparse(src, events=("start", "end")):
+            if event == "start":
+                if not stack: line_rate = float(elem.get("line-rate", 0.0) or 0.0)
+                elif elem.tag == "class":
+                    fn = elem.get("filename")
+                    fobj = _new_class(fn, elem.get("line-rate")) if fn else None
+                elif elem.tag == "line" and fobj is not None and len(stack) >= 2 \
+                        and stack[-1].tag == "lines" and stack[-2].tag == "class":
+                    _add_line(fobj, uncovered, elem)
+                stack.append(elem)
+                continue
+            stack.pop()
+            if elem.tag == "class":
+                if fobj is not None: files.append(fobj)
+                fobj = None
+            if stack: del stack[-1][:]
+            else: elem.clear()
+    return {"line_rate": line_rate, "files": files, "uncovered": uncovered}
+
+def _ruff_record(it: dict) -> dict:
+    filename = it.get("filename") or it.get("path") or ""
+    code = it.get("code") or (it.get("rule") or {}).get("code") or "NA"
+    msg = it.get("message") or (it.get("diagnostic") or {}).get("message") or ""
+    line = 0; col = 0
+    if isinstance(it.get("location"), dict):
+        line = it["location"].get("row") or it["location"].get("line") or 0
+        col  = it["location"].get("column") or it["location"].get("col") or 0
+    elif isinstance(it.get("range"), dict):
+        start = it["range"].get("start") or {}
+        line = start.get("line", 0); col = start.get("character", 0)
+    return {"filename": filename, "line": int(line), "col": int(col), "code": str(code), "message": msg}
+
+_diagnostics_re = re.compile(r'\{\s*"diagnostics"\s*:\s*\[')
+
+def _iter_json_values(f, chunk_size: int = 1 << 16):
+    """파일에서 최상위 JSON 값을 하나씩 디코드한다. 최상위가 배열이거나 {"diagnostics": [...]}로 시작하는 객체면
+    그 배열의 원소를 하나씩 내보내고(배열이 끝나면 멈춘다), 아니면(JSON Lines 등) 이어지는 값들을 차례로 내보낸다.
+    값이 잘려 디코드에 실패하면 버퍼에 든 만큼 더 읽어(2배씩) 다시 디코드하므로 큰 값 하나도 선형 시간에 읽는다."""
+    dec = json.JSONDecoder(); buf = ""; pos = 0; eof = False; in_array = None
+    while True:
+        while True:  # 공백/구분자 건너뛰기, 모자라면 더 읽기
+            while pos < len(buf) and buf[pos] in " \t\r\n,": pos += 1
+            if pos < len(buf) or eof: break
+            chunk = f.read(chunk_size); buf = buf[pos:] + chunk; pos = 0; eof = not chunk
+        if pos >= len(buf): return
+        if in_array is None:
+            m = _diagnostics_re.match(buf, pos)
+            in_array = buf[pos] == "[" or m is not None
+            if in_array: pos = m.end() if m else pos + 1; continue
+        if in_array and buf[pos] == "]": return
+        try:
+            value, end = dec.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof: raise
+            chunk = f.read(max(chunk_size, len(buf) - pos)); buf = buf[pos:] + chunk; pos = 0; eof = not chunk
+            continue
+        yield value; pos = end
+
+_DIAGNOSTIC_KEYS = frozenset(("code", "rule", "filename", "location"))
+
+def iter_ruff(path: Path):
+    """ruff JSON 배열, {"diagnostics": [...]} 형식, --output-format json-lines를 모두 읽는다.
+    진단마다 filename/code/location/message만 뽑아 하나씩 yield하고 fix.edits 등은 바로 버린다."""
+    if not path.exists() or path.stat().st_size == 0: return
+    with open_input(path) as src:
+        for value in _iter_json_values(_TextReader(src)):
+            if isinstance(value, dict):  # 진단처럼 보이는 객체만 한 건으로 본다({} 등은 진단 0건)
+                items = [value] if _DIAGNOSTIC_KEYS.intersection(value) else value.get("diagnostics", [])
+            else:
+                items = value
+            for it in items:
+                yield _ruff_record(it)
+
+def read_ruff(path: Path) -> LintTable:
+    return LintTable.from_records(iter_ruff(path))
+
+def _norm_runs(runs: list) -> list:
+    runs = sorted(runs); out = []
+    for a, b in runs:
+        if out and a <= out[-1][1] + 1: out[-1][1] = max(out[-1][1], b)
+        else: out.append([a, b])
+    return out
+
+def _intersect_runs(x: list, y: list) -> list:
+    out = []; i = j = 0
+    while i < len(x) and j < len(y):
+        a = max(x[i][0], y[j][0]); b = min(x[i][1], y[j][1])
+        if a <= b: out.append([a, b])
+        if x[i][1] < y[j][1]: i += 1
+        else: j += 1
+    return out
+
+def merge_junit(parts: list[dict]) -> dict:
+    """샤드별 junit 결과를 합친다. 합계는 더하고 testcase는 샤드 순서대로 이어 붙인다."""
+    if len(parts) == 1: return parts[0]
+    junit = {"total": 0,"failures": 0,"errors": 0,"skipped": 0,"time": 0.0,"cases": CaseTable()}
+    for part in parts:
+        for k in ("total", "failures", "errors", "skipped", "time"): junit[k] += part[k]
+        junit["cases"].extend(part["cases"])
+    return junit
+
+def merge_coverage(parts: list[dict]) -> dict:
+    """샤드별 coverage를 파일 단위로 합친다. 어느 한 샤드에서라도 실행된 라인은 커버된 것으로 보고
+    (미커버 구간의 교집합), 비율은 line-rate 평균이 아니라 합친 라인 수로 다시 계산한다.
+    분기는 라인별 정보가 없으므로 샤드 중 최댓값을 쓴다."""
+    if len(parts) == 1: return parts[0]
+    merged = {}  # filename -> (카운터, 미커버 구간)
+    for part in parts:
+        runs = {}
+        for r in part.get("uncovered", []): runs.setdefault(r["filename"], []).append((r["start"], r["end"]))
+        shard = {}
+        for f in part["files"]:  # 한 파일에 클래스가 여러 개면 샤드 안에서 먼저 더한다
+            acc = shard.setdefault(f["filename"], _new_class(f["filename"], None))
+            for k in ("lines_valid", "lines_covered", "branches_valid", "branches_covered"): acc[k] += f.get(k, 0)
+            acc["line_rate"] = max(acc["line_rate"], f["line_rate"])
+        for fn, acc in shard.items():
+            fruns = _norm_runs(runs.get(fn, []))
+            if fn not in merged: merged[fn] = (acc, fruns); continue
+            cur, cur_runs = merged[fn]
+            for k in ("lines_valid", "branches_valid", "branches_covered"): cur[k] = max(cur[k], acc[k])
+            cur["line_rate"] = max(cur["line_rate"], acc["line_rate"])
+            merged[fn] = (cur, _intersect_runs(cur_runs, fruns))
+    files = FileTable(); uncovered = RunTable(); valid = covered = 0
+    for fn, (fobj, fruns) in merged.items():
+        if fobj["lines_valid"]:
+            fobj["lines_covered"] = fobj["lines_valid"] - sum(b - a + 1 for a, b in fruns)
+            fobj["line_rate"] = fobj["lines_covered"] / fobj["lines_valid"]
+        valid += fobj["lines_valid"]; covered += fobj["lines_covered"]
+        files.append(fobj)
+        for a, b in fruns: uncovered.append(fn, a, b)
+    line_rate = covered / valid if valid else max(p["line_rate"] for p in parts)
+    return {"line_rate": line_rate, "files": files, "uncovered": uncovered}
+
+# =========================
+# 파싱 결과 캐시 (입력 내용 해시 + 도구 버전 기준)
+# =========================
+CACHE_DIR = ".quality_cache"
+CACHE_MAX_MB = 512
+_tool_hash = None
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+    return h.hexdigest()
+
+def _cache_key(fn, path: Path) -> str:
+    """파서 이름, 이 스크립트 소스(도구 버전), 입력 내용으로 키를 만든다."""
+    global _tool_hash
+    if _tool_hash is None:  # 캐시에 담기는 레코드 클래스(quality_records)도 도구 버전에 포함
+        _tool_hash = file_digest(Path(__file__)) + file_digest(Path(__file__).with_name("quality_records.py"))
+    if not path.exists(): return ""
+    return hashlib.sha256(f"{fn.__name__}:{_tool_hash}:{file_digest(path)}".encode()).hexdigest()
+
+def cache_load(cache_dir: Path, key: str):
+    p = cache_dir/f"{key}.pkl"
+    try:
+        with open(p, "rb") as f: data = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError):
+        return None
+    os.utime(p)  # LRU 축출용으로 사용 시각 갱신
+    return data
+
+def cache_store(cache_dir: Path, key: str, data, max_mb: float = CACHE_MAX_MB) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cache_dir/f"{key}.tmp"
+    with open(tmp, "wb") as f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_dir/f"{key}.pkl")
+    # 용량 초과 시 가장 오래 쓰지 않은 항목부터 지운다
+    entries = sorted(cache_dir.glob("*.pkl"), key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    for e in entries:
+        if total <= max_mb * 1024 * 1024: break
+        total -= e.stat().st_size; e.unlink()
+
+def _call(task):
+    fn, path = task
+    return fn(path)
+
+def expand_inputs(patterns: list[str]) -> list[Path]:
+    """경로/글롭 목록을 중복 없이 펼친다. 글롭이 아무것도 찾지 못하면 오류."""
+    out = []
+    for pat in patterns:
+        if any(ch in pat for ch in "*?["):
+            hits = sorted(glob.glob(pat, recursive=True))
+            if not hits: raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {pat}")
+        else: hits = [pat]
+        out.extend(Path(h) for h in hits if Path(h) not in out)
     return out
 
-def write_csvs(outdir: Path, junit: dict, cov: dict, ruffs: list[dict]) -> None:
-    outdir.mkdir(parents=True, exist_ok=True)
+# 증분 갱신 단위: 그룹별 입력이 바뀌었을 때만 해당 표를 다시 쓴다
+CSV_GROUPS = {
+    "tests": ["tests"],
+    "coverage": ["coverage_files", "coverage_lines"],
+    "lint": ["lint", "lint_top5"],
+}
 
-    # 1) 요약
+def run_metrics(junit: dict, cov: dict, lint_issues: int) -> dict:
+    """summary 지표(metric -> value). 순서가 summary.csv의 행 순서다."""
     passed = junit["total"] - junit["failures"] - junit["errors"] - junit["skipped"]
-    with open(outdir/"summary.csv","w",newline="",encoding="utf-8") as f:
-        w=csv.writer(f)
-        w.writerow(["metric","value"])
-        w.writerow(["tests_total", junit["total"]])
-        w.writerow(["tests_passed", passed])
-        w.writerow(["tests_failed", junit["failures"] + junit["errors"]])
-        w.writerow(["tests_skipped", junit["skipped"]])
-        w.writerow(["tests_time_sec", round(junit["time"],3)])
-        w.writerow(["coverage_percent", round(cov["line_rate"]*100,2)])
-        w.writerow(["lint_issues", len(ruffs)])
-
-    # 2) 테스트 케이스
-    with open(outdir/"tests.csv","w",newline="",encoding="utf-8") as f:
-        w=csv.writer(f); w.writerow(["classname","name","status","time_sec"])
+    return {
+        "tests_total": junit["total"],
+        "tests_passed": passed,
+        "tests_failed": junit["failures"] + junit["errors"],
+        "tests_skipped": junit["skipped"],
+        "tests_time_sec": round(junit["time"],3),
+        "coverage_percent": round(cov["line_rate"]*100,2),
+        "lint_issues": lint_issues,
+    }
+
+def iter_tables(junit: dict, cov: dict, ruffs, only: set | None = None, observers=()):
+    """출력 표를 (이름, 컬럼, 행 이터러블) 순서로 만든다. only를 주면 해당 그룹("tests", "coverage", "lint")만
+    만들고 summary/aggregates는 항상 만든다. junit cases와 ruffs는 제너레이터여도 되며(스트리밍 모드), 이때 합계가
+    스트림을 다 소비한 뒤에 확정되므로 summary/aggregates는 마지막에 나온다.
+    집계(Aggregates)와 observers(add_case/add_file/add_lint를 가진 객체)는 각 행을 내보내면서 같은 패스에서 받는다."""
+    todo = set(CSV_GROUPS) if only is None else only
+    agg = Aggregates()
+    obs = [agg, *observers]
+
+    def test_rows():
         for c in junit["cases"]:
-            w.writerow([c["classname"], c["name"], c["status"], round(c["time"],4)])
+            for o in obs: o.add_case(c)
+            yield [c["classname"], c["name"], c["status"], round(c["time"],4)]
 
-    # 3) 파일별 커버리지
-    with open(outdir/"coverage_files.csv","w",newline="",encoding="utf-8") as f:
-        w=csv.writer(f); w.writerow(["filename","coverage_percent"])
+    def coverage_rows():
         for fobj in cov["files"]:
-            w.writerow([fobj["filename"], round(fobj["line_rate"]*100,2)])
+            for o in obs: o.add_file(fobj)
+            yield [fobj["filename"], round(fobj["line_rate"]*100,2)]
 
-    # 4) 린트 목록
-    with open(outdir/"lint.csv","w",newline="",encoding="utf-8") as f:
-        w=csv.writer(f); w.writerow(["filename","line","col","code","message"])
+    def lint_rows():
         for it in ruffs:
-            w.writerow([it["filename"], it["line"], it["col"], it["code"], it["message"]])
+            for o in obs: o.add_lint(it)
+            yield [it["filename"], it["line"], it["col"], it["code"], it["message"]]
+
+    # 다시 쓰지 않는 그룹도 집계에는 넣는다(캐시에서 읽은 리스트)
+    for group, rows in (("tests", test_rows), ("coverage", coverage_rows), ("lint", lint_rows)):
+        if group not in todo:
+            for _ in rows(): pass
+
+    # 1) 테스트 케이스
+    if "tests" in todo:
+        yield "tests", ["classname","name","status","time_sec"], test_rows()
 
-    # 5) 린트 규칙 Top5
-    cnt = Counter([it["code"] for it in ruffs])
-    with open(outdir/"lint_top5.csv","w",newline="",encoding="utf-8") as f:
-        w=csv.writer(f); w.writerow(["rank","rule","count"])
-        for i,(rule,n) in enumerate(cnt.most_common(5),1):
-            w.writerow([i, rule, n])
+    if "coverage" in todo:
+        # 2) 파일별 커버리지
+        yield "coverage_files", ["filename","coverage_percent"], coverage_rows()
+        # 2-1) 미커버 라인 구간
+        yield "coverage_lines", ["filename","start","end"], \
+            ([r["filename"], r["start"], r["end"]] for r in cov.get("uncovered", []))
 
-def main():
+    if "lint" in todo:
+        # 3) 린트 목록
+        yield "lint", ["filename","line","col","code","message"], lint_rows()
+        # 4) 린트 규칙 Top5
+        yield "lint_top5", ["rank","rule","count"], \
+            ([i, rule, n] for i,(rule,n) in enumerate(agg.rule_counts.most_common(5),1))
+
+    # 5) 요약
+    yield "summary", ["metric","value"], [[k, v] for k, v in run_metrics(junit, cov, agg.lint_total).items()]
+
+    # 6) 집계(규칙별/파일별 린트 건수, 상태별 건수, 느린 테스트, 커버리지 상·하위)
+    yield "aggregates", AGG_COLUMNS, agg.rows()
+
+def _counting(rows, counts: dict, name: str):
+    n = 0
+    for n, row in enumerate(rows, 1): yield row
+    counts[name] = n
+
+def write_tables_csv(outdir: Path, tables) -> dict:
+    """(이름, 컬럼, 행) 표들을 CSV로 쓰고 표별로 쓴 행 수를 돌려준다."""
+    outdir.mkdir(parents=True, exist_ok=True); counts = {}
+    for name, cols, rows in tables:
+        with open(outdir/f"{name}.csv","w",newline="",encoding="utf-8") as f:
+            w=csv.writer(f); w.writerow(cols)
+            w.writerows(_counting(rows, counts, name))
+    return counts
+
+def write_tables_parquet(outdir: Path, tables, batch_rows: int = 65536) -> dict:
+    """write_tables_csv와 같은 표를 Parquet으로 쓴다. line/col은 정수, time_sec는 실수, status/code는 범주형(dictionary)으로
+    dtype을 보존한다. 행은 batch_rows 단위로 나눠 쓰므로 스트리밍 junit도 메모리가 일정하다. pyarrow 필요.
+    표별로 쓴 행 수를 돌려준다."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet 출력에는 pyarrow가 필요합니다: pip install pyarrow") from e
+    s, f, i, cat = pa.string(), pa.float64(), pa.int64(), pa.dictionary(pa.int32(), pa.string())
+    types = {
+        "tests": [s, s, cat, f], "summary": [s, f], "coverage_files": [s, f],
+        "coverage_lines": [s, i, i], "lint": [s, i, i, cat, s], "lint_top5": [i, s, i],
+        "aggregates": [cat, i, s, f],
+        "diff_summary": [s, f, f, f], "diff_tests": [cat, s, s, cat, cat, f],
+        "diff_lint": [cat, s, i, i, cat, s], "diff_coverage": [s, f, f, f],
+        "test_durations": [s, i, f, f, f, f, f, f], "duration_histogram": [s, f, f, i, f],
+        "test_flips": [s, s, i, s, cat],
+    }
+    outdir.mkdir(parents=True, exist_ok=True); counts = {}
+    for name, cols, rows in tables:
+        schema = pa.schema([pa.field(c, t) for c, t in zip(cols, types[name])])
+        with pq.ParquetWriter(outdir/f"{name}.parquet", schema) as w:
+            rows = _counting(rows, counts, name)
+            batch = list(islice(rows, batch_rows))
+            while True:  # 행이 없어도 빈 표 하나는 써서 스키마를 남긴다
+                arrays = [pa.array([r[k] for r in batch], type=t.value_type).dictionary_encode()
+                          if pa.types.is_dictionary(t) else pa.array([r[k] for r in batch], type=t)
+                          for k, t in enumerate(types[name])]
+                w.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                batch = list(islice(rows, batch_rows))
+                if not batch: break
+    return counts
+
+def write_csvs(outdir: Path, junit: dict, cov: dict, ruffs, only: set | None = None,
+               observers=()) -> dict:
+    """표별로 쓴 행 수를 돌려준다."""
+    return write_tables_csv(outdir, iter_tables(junit, cov, ruffs, only, observers))
+
+def write_parquet(outdir: Path, junit: dict, cov: dict, ruffs, only: set | None = None,
+                  observers=(), batch_rows: int = 65536) -> dict:
+    """write_csvs와 같은 표를 Parquet으로 쓴다(write_tables_parquet 참고)."""
+    return write_tables_parquet(outdir, iter_tables(junit, cov, ruffs, only, observers), batch_rows)
+
+def main(argv=None):
     ap = argparse.ArgumentParser()
-    ap.add_argument("--junit", required=True)
-    ap.add_argument("--coverage", required=True)
-    ap.add_argument("--ruff", required=True)
+    ap.add_argument("--junit", required=True, nargs="+", action="extend", help="경로 또는 글롭(여러 개 가능, gzip 압축 가능)")
+    ap.add_argument("--coverage", required=True, nargs="+", action="extend", help="경로 또는 글롭(여러 개 가능, gzip 압축 가능)")
+    ap.add_argument("--ruff", required=True, nargs="+", action="extend", help="경로 또는 글롭(여러 개 가능, gzip 압축 가능)")
     ap.add_argument("--outdir", default="out_csv")
-    args = ap.parse_args()
+    ap.add_argument("--stream", action="store_true", help="junit/coverage/ruff를 스트리밍 처리(대용량 입력용)")
+    ap.add_argument("--format", choices=["csv", "parquet"], default="csv", help="출력 형식(parquet은 pyarrow 필요)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="샤드 파싱 프로세스 수")
+    ap.add_argument("--cache-dir", default=CACHE_DIR)
+    ap.add_argument("--cache-max-mb", type=float, default=CACHE_MAX_MB)
+    ap.add_argument("--no-cache", action="store_true", help="파싱 캐시를 쓰지 않고 모든 CSV를 다시 생성")
+    ap.add_argument("--timings", action="store_true",
+                    help="테스트 시간 분석 표(test_durations/duration_histogram/test_flips) 추가(numpy 필요)")
+    ap.add_argument("--durations-out", metavar="PATH", help="pytest-split용 .test_durations 파일 경로(numpy 불필요)")
+    ap.add_argument("--history", metavar="DB", help="실행 이력을 쌓을 SQLite 파일")
+    ap.add_argument("--baseline", metavar="DIR", help="비교 기준이 되는 이전 실행의 출력 폴더(diff_* 표 추가)")
+    ap.add_argument("--run-id", help="이력의 실행 키(기본: GITHUB_RUN_ID 또는 현재 시각)")
+    ap.add_argument("--commit", help="이력에 남길 커밋(기본: GITHUB_SHA)")
+    add_profile_args(ap)
+    args = ap.parse_args(argv)
+    outdir = Path(args.outdir)
+    cache_dir = None if args.no_cache else Path(args.cache_dir)
+    prof = Profiler.from_args("quality_to_csv", args)
+
+    junit_paths = expand_inputs(args.junit)
+    cov_paths = expand_inputs(args.coverage)
+    ruff_paths = expand_inputs(args.ruff)
+
+    # 샤드가 여러 개면 프로세스 풀에서 한꺼번에 파싱한다(스트리밍 junit은 메인에서 순서대로 소비)
+    tasks = [] if args.stream else [(read_junit, p) for p in junit_paths]
+    tasks += [(stream_coverage if args.stream else read_coverage, p) for p in cov_paths]
+    tasks += [] if args.stream else [(read_ruff, p) for p in ruff_paths]
+    with prof.stage("parse") as rec:
+        # 캐시에 있는 입력은 건너뛰고 바뀐 입력만 파싱한다
+        keys = [_cache_key(fn, p) if cache_dir else "" for fn, p in tasks]
+        results = [cache_load(cache_dir, k) if k else None for k in keys]
+        miss = [i for i, r in enumerate(results) if r is None]
+        if args.jobs > 1 and len(miss) > 3:
+            with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+                parsed = list(ex.map(_call, [tasks[i] for i in miss]))
+        else:
+            parsed = [_call(tasks[i]) for i in miss]
+        for i, r in zip(miss, parsed):
+            results[i] = r
+            if keys[i]: cache_store(cache_dir, keys[i], r, args.cache_max_mb)
+        rec["inputs"] = len(tasks); rec["cache_hits"] = len(tasks) - len(miss)
+        rec["rows"] = sum(len(r.get("cases", r.get("files", []))) if isinstance(r, dict) else len(r) for r in results)
+
+    nj = 0 if args.stream else len(junit_paths); nc = len(cov_paths)
+    with prof.stage("merge") as rec:
+        junit = stream_junit(*junit_paths) if args.stream else merge_junit(results[:nj])
+        cov   = merge_coverage(results[nj:nj + nc])
+        if args.stream:
+            ruffs = (it for p in ruff_paths for it in iter_ruff(p))
+            rec["rows"] = len(cov["files"])
+        else:
+            ruffs = LintTable.concat(results[nj + nc:])
+            rec["rows"] = len(junit["cases"]) + len(cov["files"]) + len(ruffs)
 
-    junit = read_junit(Path(args.junit))
-    cov   = read_coverage(Path(args.coverage))
-    ruffs = read_ruff(Path(args.ruff))
+    # 입력이 그대로인 그룹의 CSV는 다시 쓰지 않는다(summary.csv는 항상 갱신).
+    # 형식마다 따로 기록한다: {형식: {그룹: 입력 키}} (csv로 다른 입력을 처리한 뒤 parquet 표가 낡은 채 남지 않게)
+    manifest = outdir/".inputs.json"
+    groups = {"tests": None if args.stream else keys[:nj], "coverage": keys[nj:nj + nc],
+              "lint": None if args.stream else keys[nj + nc:]}
+    only = None
+    if cache_dir is None:
+        if manifest.exists(): manifest.unlink()
+    else:
+        recorded = json.loads(manifest.read_text(encoding="utf-8")) if manifest.exists() else {}
+        # 형식별로 나누기 전의 매니페스트({그룹: 키})는 버리고 모두 다시 쓴다
+        recorded = {f: g for f, g in recorded.items() if f in ("csv", "parquet") and isinstance(g, dict)}
+        prev = recorded.get(args.format, {})
+        only = {g for g, k in groups.items()
+                if k is None or "" in k or prev.get(g) != k
+                or not all((outdir/f"{n}.{args.format}").exists() for n in CSV_GROUPS[g])}
 
-    write_csvs(Path(args.outdir), junit, cov, ruffs)
-    print("CSV 생성:", Path(args.outdir).resolve())
+    writer = write_parquet if args.format == "parquet" else write_csvs
+    write_tables = write_tables_parquet if args.format == "parquet" else write_tables_csv
+    observers = []
+    if args.baseline:
+        # 출력 폴더와 같아도 되도록 쓰기 전에 기준 색인을 다 읽어 둔다
+        with prof.stage("baseline") as rec:
+            diff = RunDiff(Baseline(args.baseline))
+            rec["rows"] = len(diff.base.tests) + len(diff.base.coverage) + len(diff.base.lint)
+        observers.append(diff)
+    else:
+        for name in DIFF_COLUMNS:  # 이전 실행에서 남은 diff 표는 지운다
+            (outdir/f"{name}.{args.format}").unlink(missing_ok=True)
+    timings = None
+    if args.timings or args.durations_out:
+        # junit 입력이 여러 개일 때만 같은 테스트가 다시 나올 수 있다(재실행/중복 샤드)
+        timings = Timings(track_tests=bool(args.durations_out) or len(junit_paths) > 1)
+        observers.append(timings)
+    history = HistoryRecorder(args.history, args.run_id, args.commit) if args.history else None
+    if history: observers.append(history)
+    with prof.stage(f"write_{args.format}") as rec:  # 스트리밍 모드에서는 junit/ruff 파싱도 여기 포함
+        counts = writer(outdir, junit, cov, ruffs, only, observers)
+        rec["rows"] = sum(counts.values()); rec["tables"] = counts
+    metrics = run_metrics(junit, cov, counts.get("lint", len(ruffs) if isinstance(ruffs, LintTable) else 0))
+    if args.baseline:
+        with prof.stage("diff") as rec:
+            rec["tables"] = write_tables(outdir, diff.tables(metrics))
+            rec["rows"] = sum(rec["tables"].values())
+    if timings:
+        with prof.stage("timings") as rec:
+            if args.timings:
+                rec["tables"] = write_tables(outdir, timings.tables())
+            if args.durations_out:
+                rec["rows"] = timings.write_durations(args.durations_out)
+    if history:
+        with prof.stage("history"):
+            history.finish(metrics)
+    if cache_dir is not None:
+        recorded[args.format] = groups
+        manifest.write_text(json.dumps(recorded), encoding="utf-8")
+    print("CSV 생성:", outdir.resolve())
+    prof.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,160 @@
+# text_batch.py
+"""
+대용량 문자열 정규화 (input_test의 normalize_whitespace / is_palindrome / mask_email / summarize 일괄 적용)
+
+입력을 --chunk-rows 행씩 잘라 프로세스 풀에서 *_batch 함수로 처리하고, 입력 순서대로 바로 써 나간다.
+동시에 처리 중인 청크는 --jobs의 2배까지만 두므로 입력 크기와 상관없이 메모리는 청크 몇 개 분량이다.
+결과는 스칼라 함수를 한 행씩 부른 것과 같다.
+
+- 텍스트: 한 줄에 값 하나, 결과도 한 줄에 하나
+- CSV(--column): 지정한 열에 적용해 --output-column(기본: 같은 열)에 쓰고 나머지 열은 그대로 둔다
+- 경로가 .gz로 끝나면 gzip으로 읽고 쓴다
+
+실행 예:
+  python text_batch.py normalize_whitespace customers.csv.gz clean.csv.gz --column address --jobs 8
+  python text_batch.py mask_email emails.txt masked.txt
+  python text_batch.py is_palindrome names.csv out.csv --column name --output-column name_is_palindrome
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from typing import Iterable, Iterator
+
+from input_test import is_palindrome_batch, mask_email_batch, normalize_whitespace_batch, summarize_batch
+
+OPS = {
+    "normalize_whitespace": normalize_whitespace_batch,
+    "is_palindrome": is_palindrome_batch,
+    "mask_email": mask_email_batch,
+    "summarize": summarize_batch,
+}
+CHUNK_ROWS = 50_000
+
+
+def _apply(op: str, values: list, max_len: int) -> list:
+    if op == "summarize":
+        return summarize_batch(values, max_len)
+    return OPS[op](values)
+
+
+def _chunks(it: Iterable, size: int) -> Iterator[list]:
+    it = iter(it)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(fn, chunks: Iterable, jobs: int = 1, inflight: int | None = None) -> Iterator:
+    """fn(*chunk)을 청크마다 실행해 입력 순서대로 내보낸다. jobs > 1이면 프로세스 풀에서,
+    제출해 두는 청크는 inflight(기본 jobs*2)개까지만 둔다(ProcessPoolExecutor.map은 입력을 다 읽어 버린다)."""
+    if jobs <= 1:
+        for args in chunks:
+            yield fn(*args)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        pending: deque = deque()
+        for args in chunks:
+            pending.append(ex.submit(fn, *args))
+            if len(pending) >= (inflight or jobs * 2):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def normalize_iter(op: str, values: Iterable[str], jobs: int = 1, chunk_rows: int = CHUNK_ROWS,
+                   max_len: int = 80) -> Iterator:
+    """값 이터러블(리스트, 제너레이터, DataFrame 열)에 op를 적용한 결과를 한 값씩 내보낸다."""
+    if op not in OPS:
+        raise ValueError(f"알 수 없는 작업: {op} (가능: {', '.join(OPS)})")
+    for out in map_chunks(_apply, ((op, c, max_len) for c in _chunks(values, chunk_rows)), jobs):
+        yield from out
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _apply_rows(op: str, rows: list, col: int, out_col: int | None, max_len: int) -> list:
+    # CSV 행 청크: 지정 열 값만 바꾸거나 끝에 새 열로 붙인다
+    results = _apply(op, [r[col] for r in rows], max_len)
+    for r, v in zip(rows, results):
+        if out_col is None:
+            r.append(v)
+        else:
+            r[out_col] = v
+    return rows
+
+
+def process_file(op: str, src: str, dst: str, column: str | None = None, output_column: str | None = None,
+                 jobs: int = 1, chunk_rows: int = CHUNK_ROWS, max_len: int = 80) -> int:
+    """src를 읽어 op를 적용한 결과를 dst에 쓴다. 처리한 행 수(헤더 제외)를 돌려준다."""
+    if op not in OPS:
+        raise ValueError(f"알 수 없는 작업: {op} (가능: {', '.join(OPS)})")
+    if op == "summarize" and max_len < 4:
+        raise ValueError("max_len must be >= 4")
+    n = 0
+    with _open(src, "r") as fin, _open(dst, "w") as fout:
+        if column is None:
+            lines = (line.rstrip("\r\n") for line in fin)
+            for out in map_chunks(_apply, ((op, c, max_len) for c in _chunks(lines, chunk_rows)), jobs):
+                fout.writelines(f"{v}\n" for v in out)
+                n += len(out)
+            return n
+
+        reader, writer = csv.reader(fin), csv.writer(fout)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        if column not in header:
+            raise ValueError(f"CSV에 '{column}' 열이 없습니다 (열: {', '.join(header)})")
+        col = header.index(column)
+        target = output_column or column
+        out_col = header.index(target) if target in header else None
+        writer.writerow(header if out_col is not None else header + [target])
+        tasks = ((op, rows, col, out_col, max_len) for rows in _chunks(reader, chunk_rows))
+        for rows in map_chunks(_apply_rows, tasks, jobs):
+            writer.writerows(rows)
+            n += len(rows)
+    return n
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="input_test 문자열 함수를 대용량 파일에 일괄 적용")
+    ap.add_argument("op", choices=list(OPS))
+    ap.add_argument("src", help="입력 파일(.gz 가능, -는 표준 입력)")
+    ap.add_argument("dst", help="출력 파일(.gz 가능, -는 표준 출력)")
+    ap.add_argument("--column", help="CSV로 읽고 이 열에 적용(없으면 한 줄에 값 하나인 텍스트)")
+    ap.add_argument("--output-column", help="결과를 쓸 CSV 열(기본: --column과 같은 열, 없는 이름이면 끝에 추가)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="처리 프로세스 수(1이면 풀 없이)")
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="프로세스에 한 번에 넘기는 행 수")
+    ap.add_argument("--max-len", type=int, default=80, help="summarize의 max_len")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        n = process_file(args.op, args.src, args.dst, args.column, args.output_column, args.jobs,
+                         args.chunk_rows, args.max_len)
+    except ValueError as e:
+        if args.dst != "-" and os.path.isfile(args.dst):
+            os.remove(args.dst)  # 반쯤 쓴 출력은 남기지 않는다
+        ap.error(str(e))
+    print(f"✔ {args.op}: {n:,}행 ({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,812 @@
+# xlsx_formulas.py
+"""
+xlsx 수식 캐시값 채우기 (SUM / AVERAGE / MIN / MAX / COUNT / IF와 사칙연산, 비교, &)
+
+openpyxl이 쓴 수식 셀에는 계산된 값(<v>)이 없어서, Excel로 한 번 열어 저장하기 전에는
+load_workbook(data_only=True)로 읽으면 None이 나온다(test1/ex10, ex12 -> ex13). 여기서 수식을 직접 계산해
+원본 xlsx의 시트 XML에 캐시값만 끼워 넣는다. 수식, 서식, 그 밖의 파트는 그대로 둔다.
+
+- 같은 모양의 수식(E2의 AVERAGE(B2:D2), E3의 AVERAGE(B3:D3), ...)은 상대 참조로 바꾸면 같으므로 한 그룹으로
+  묶고, 시트 값을 numpy 격자로 만들어 그룹 전체를 한 번에 계산한다(범위는 팬시 인덱싱 + nansum 등)
+- 그룹끼리는 참조 관계 순서(위상 정렬)로 계산한다. 그룹이 자기 셀을 참조하면(누계 F3=F2+E3 등) 셀 단위로 나눈다
+- 지원하지 않는 함수/문법, 순환 참조, 그것에 기대는 수식은 건드리지 않고 개수만 센다
+- Excel 규칙: 범위 안의 문자/논리값/빈 칸은 집계에서 빼고, 값이 없으면 AVERAGE는 #DIV/0!, MIN/MAX는 0
+
+실행 예:
+  python xlsx_formulas.py result.xlsx                 # 제자리 갱신
+  python xlsx_formulas.py scores.xlsx scores_cached.xlsx
+"""
+from __future__ import annotations
+
+import argparse
+import codecs
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+from collections import defaultdict, deque
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+import numpy as np
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
+
+FUNCTIONS = ("SUM", "AVERAGE", "MIN", "MAX", "COUNT", "IF")
+
+
+class FormulaError(str):
+    """#DIV/0! 같은 수식 오류 값. 셀에는 t="e"로 쓴다."""
+
+
+DIV0, VALUE = FormulaError("#DIV/0!"), FormulaError("#VALUE!")
+
+
+class Unsupported(ValueError):
+    pass
+
+
+# =========================
+# 토큰화 / 파싱
+# =========================
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<str>"(?:[^"]|"")*")
+  | (?P<ref>(?:(?:'(?:[^']|'')+'|[^\W\d][\w.]*)!)?\$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?)(?![\w(!])
+  | (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[^\W\d][\w.]*)
+  | (?P<op><=|>=|<>|[-+*/^&=<>(),])
+)""", re.X)
+_CELL = re.compile(r"(\$?)([A-Za-z]{1,3})(\$?)(\d+)")
+
+
+def _ref_spec(text: str, row: int, col: int) -> tuple:
+    """'Sheet'!$B2 -> (시트, 행, 행 고정, 열, 열 고정). 고정이 아니면 행/열은 기준 셀과의 차이다."""
+    sheet = None
+    if "!" in text:
+        sheet, text = text.rsplit("!", 1)
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+    out = []
+    for part in text.split(":"):
+        ca, c, ra, r = _CELL.fullmatch(part).groups()
+        c, r = column_index_from_string(c.upper()), int(r)
+        out.append((r if ra else r - row, bool(ra), c if ca else c - col, bool(ca)))
+    return (sheet, *out)
+
+
+def tokenize(formula: str, row: int, col: int) -> tuple:
+    """수식 문자열('=' 제외)을 토큰 튜플로 바꾼다. 참조는 기준 셀(row, col) 상대값이라 같은 모양이면 같은 튜플이 된다."""
+    pos, out = 0, []
+    formula = formula.rstrip()
+    while pos < len(formula):
+        m = _TOKEN.match(formula, pos)
+        if not m or m.end() == pos:
+            raise Unsupported(f"해석할 수 없는 수식: ={formula}")
+        pos = m.end()
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == "ref":
+            out.append(("ref", _ref_spec(text, row, col)))
+        elif kind == "str":
+            out.append(("str", text[1:-1].replace('""', '"')))
+        elif kind == "num":
+            out.append(("num", float(text)))
+        elif kind == "name":
+            out.append(("name", text.upper()))
+        else:
+            out.append(("op", text))
+    return tuple(out)
+
+
+# 묶기용 키: 문자열/따옴표 시트 이름은 그대로, 셀 참조의 상대 행/열만 기준 셀과의 차이로 바꾼다
+_SHAPE = re.compile(r"""("(?:[^"]|"")*"|'(?:[^']|'')*')|(?<![\w.$])(\$?)([A-Za-z]{1,3})(\$?)(\d+)(?![\w(!])""")
+
+
+def shape_key(formula: str, row: int, col: int) -> str:
+    """같은 모양(상대 참조로 같은 수식)이면 같은 문자열. tokenize보다 훨씬 싸다."""
+    def rel(m):
+        if m.group(1):
+            return m.group(1)
+        ca, c, ra, r = m.group(2, 3, 4, 5)
+        c = column_index_from_string(c.upper())
+        return f"\x00{'$' + str(c) if ca else c - col},{'$' + r if ra else int(r) - row}\x00"
+    return _SHAPE.sub(rel, formula)
+
+
+class _Parser:
+    # 우선순위: 비교 < & < +- < */ < ^ < 단항 -
+    def __init__(self, tokens: tuple):
+        self.toks = tokens
+        self.i = 0
+
+    def peek(self):
+        return self.toks[self.i] if self.i < len(self.toks) else (None, None)
+
+    def take(self, op=None):
+        tok = self.peek()
+        if op is not None and tok != ("op", op):
+            raise Unsupported(f"'{op}'가 필요합니다")
+        self.i += 1
+        return tok
+
+    def parse(self):
+        node = self.compare()
+        if self.i != len(self.toks):
+            raise Unsupported("수식 끝에 해석하지 못한 부분이 있습니다")
+        return node
+
+    def compare(self):
+        node = self.concat()
+        while self.peek()[0] == "op" and self.peek()[1] in ("=", "<>", "<", "<=", ">", ">="):
+            node = ("cmp", self.take()[1], node, self.concat())
+        return node
+
+    def concat(self):
+        node = self.additive()
+        while self.peek() == ("op", "&"):
+            self.take()
+            node = ("cat", node, self.additive())
+        return node
+
+    def additive(self):
+        node = self.term()
+        while self.peek()[0] == "op" and self.peek()[1] in "+-":
+            node = ("bin", self.take()[1], node, self.term())
+        return node
+
+    def term(self):
+        node = self.power()
+        while self.peek()[0] == "op" and self.peek()[1] in "*/":
+            node = ("bin", self.take()[1], node, self.power())
+        return node
+
+    def power(self):
+        node = self.unary()
+        while self.peek() == ("op", "^"):
+            self.take()
+            node = ("bin", "^", node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek()[0] == "op" and self.peek()[1] in "+-":
+            sign = self.take()[1]
+            node = self.unary()
+            return ("neg", node) if sign == "-" else node
+        return self.primary()
+
+    def primary(self):
+        kind, val = self.take()
+        if kind in ("num", "str"):
+            return (kind, val)
+        if kind == "ref":
+            return ("range" if len(val) == 3 else "ref", val)
+        if kind == "name":
+            if self.peek() != ("op", "("):
+                if val in ("TRUE", "FALSE"):
+                    return ("bool", val == "TRUE")
+                raise Unsupported(f"지원하지 않는 이름: {val}")
+            if val not in FUNCTIONS:
+                raise Unsupported(f"지원하지 않는 함수: {val}")
+            self.take("(")
+            args = []
+            if self.peek() != ("op", ")"):
+                args.append(self.compare())
+                while self.peek() == ("op", ","):
+                    self.take()
+                    args.append(self.compare())
+            self.take(")")
+            if val == "IF" and not 2 <= len(args) <= 3:
+                raise Unsupported("IF는 인자가 2~3개여야 합니다")
+            return ("call", val, args)
+        if (kind, val) == ("op", "("):
+            node = self.compare()
+            self.take(")")
+            return node
+        raise Unsupported(f"예상하지 못한 토큰: {val}")
+
+
+def _refs(node):
+    """AST 안의 참조/범위 노드를 모두 낸다."""
+    if node[0] in ("ref", "range"):
+        yield node
+    elif node[0] == "call":
+        for a in node[2]:
+            yield from _refs(a)
+    elif node[0] in ("bin", "cmp"):
+        yield from _refs(node[2])
+        yield from _refs(node[3])
+    elif node[0] == "cat":
+        yield from _refs(node[1])
+        yield from _refs(node[2])
+    elif node[0] == "neg":
+        yield from _refs(node[1])
+
+
+# =========================
+# 시트 격자
+# =========================
+class _Grid:
+    """시트 값을 격자로 들고 있는다(1부터 시작하는 행/열). obj는 파이썬 값, num은 숫자 셀만 float(나머지 NaN)."""
+
+    def __init__(self, rows: list, width: int):
+        h, w = len(rows) + 1, width + 1
+        self.obj = np.full((h, w), None, dtype=object)
+        self.num = np.full((h, w), np.nan)
+        self.err = np.zeros((h, w), dtype=bool)
+        self.unit = np.full((h, w), -1, dtype=np.int64)
+        for r, vals in enumerate(rows, start=1):
+            for c, v in vals:
+                self.set(r, c, v)
+
+    def set(self, r: int, c: int, v) -> None:
+        self.obj[r, c] = v
+        self.num[r, c] = v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan
+        self.err[r, c] = isinstance(v, FormulaError)
+
+    def grow(self, h: int, w: int) -> None:
+        """참조가 시트 끝을 넘으면 빈 칸으로 늘린다."""
+        oh, ow = self.obj.shape
+        if h <= oh and w <= ow:
+            return
+        h, w = max(h, oh), max(w, ow)
+        for name, fill in (("obj", None), ("num", np.nan), ("err", False), ("unit", -1)):
+            old = getattr(self, name)
+            new = np.full((h, w), fill, dtype=old.dtype)
+            new[:oh, :ow] = old
+            setattr(self, name, new)
+
+
+def _num1(v):
+    """Excel 산술용 값 하나: 빈 칸 0, 논리값 1/0, 숫자 문자열은 숫자, 나머지 문자열은 #VALUE!"""
+    if isinstance(v, FormulaError):
+        return v
+    if v is None:
+        return 0.0
+    if isinstance(v, (bool, int, float)):
+        return float(v)
+    if isinstance(v, str):
+        try:
+            return float(v)
+        except ValueError:
+            return VALUE
+    return VALUE
+
+
+def _arith1(op, a, b):
+    a, b = _num1(a), _num1(b)
+    if isinstance(a, FormulaError):
+        return a
+    if isinstance(b, FormulaError):
+        return b
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        return DIV0 if b == 0 else a / b
+    try:
+        return float(a ** b)
+    except (ZeroDivisionError, OverflowError, TypeError):
+        return DIV0 if a == 0 else VALUE
+
+
+def _rank(v):
+    # Excel 비교 순서: 숫자 < 문자 < 논리값 (문자는 대소문자 무시)
+    if isinstance(v, bool):
+        return 2, v
+    if isinstance(v, (int, float)):
+        return 0, v
+    return 1, str(v).lower()
+
+
+def _cmp1(op, a, b):
+    if isinstance(a, FormulaError):
+        return a
+    if isinstance(b, FormulaError):
+        return b
+    if a is None:
+        a = "" if isinstance(b, str) else False if isinstance(b, bool) else 0.0
+    if b is None:
+        b = "" if isinstance(a, str) else False if isinstance(a, bool) else 0.0
+    x, y = _rank(a), _rank(b)
+    return {"=": x == y, "<>": x != y, "<": x < y, "<=": x <= y, ">": x > y, ">=": x >= y}[op]
+
+
+def _cat1(a, b):
+    for v in (a, b):
+        if isinstance(v, FormulaError):
+            return v
+    return _text(a) + _text(b)
+
+
+def _text(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return "TRUE" if v else "FALSE"
+    if isinstance(v, float):  # Excel 일반 서식처럼 유효숫자 15자리
+        return f"{v:.15G}".replace("E+", "E")
+    return str(v)
+
+
+def _truth1(v):
+    if isinstance(v, FormulaError):
+        return v
+    if v is None:
+        return False
+    if isinstance(v, (bool, int, float)):
+        return bool(v)
+    return {"TRUE": True, "FALSE": False}.get(str(v).upper(), VALUE)
+
+
+_arith = np.frompyfunc(_arith1, 3, 1)
+_cmp = np.frompyfunc(_cmp1, 3, 1)
+_cat = np.frompyfunc(_cat1, 2, 1)
+_truth = np.frompyfunc(_truth1, 1, 1)
+_NUMOPS = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide, "^": np.power}
+_CMPOPS = {"=": np.equal, "<>": np.not_equal, "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+
+class _Vec:
+    """그룹의 기준 셀 수만큼의 값. 모두 숫자면 num(float 배열)만, 아니면 obj(object 배열)로 들고 있는다."""
+
+    __slots__ = ("num", "_obj")
+
+    def __init__(self, num=None, obj=None):
+        self.num = num
+        self._obj = obj
+
+    @property
+    def obj(self):
+        if self._obj is None:
+            self._obj = self.num.astype(object)
+        return self._obj
+
+
+def _from_obj(obj) -> _Vec:
+    kinds = {type(v) for v in obj}
+    if kinds <= {float, int} and kinds:
+        return _Vec(num=np.asarray(obj, dtype=np.float64))
+    return _Vec(obj=obj)
+
+
+# =========================
+# 계산
+# =========================
+class _Unit:
+    """한 번에 계산하는 수식 셀 묶음: 같은 모양(상대 참조)의 수식이 있는 셀들."""
+
+    __slots__ = ("sheet", "ast", "rows", "cols", "deps")
+
+    def __init__(self, sheet: str, ast, rows, cols):
+        self.sheet = sheet
+        self.ast = ast
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.deps: set = set()
+
+
+class Evaluator:
+    def __init__(self, grids: dict):
+        self.grids = grids
+
+    @staticmethod
+    def _targets(unit: _Unit, spec):
+        r, r_abs, c, c_abs = spec
+        rows = np.full(len(unit.rows), r) if r_abs else unit.rows + r
+        cols = np.full(len(unit.cols), c) if c_abs else unit.cols + c
+        return rows, cols
+
+    def _grid(self, unit, sheet):
+        if sheet is not None and sheet not in self.grids:
+            raise Unsupported(f"없는 시트: {sheet}")
+        return self.grids[sheet or unit.sheet]
+
+    def cells(self, unit: _Unit, node):
+        """참조/범위 노드가 가리키는 셀: (격자, 행 배열, 열 배열)을 기준 셀마다. 범위 크기가 모두 같으면 2차원
+        배열(기준 셀 x 범위 칸) 하나로, 아니면 None과 기준 셀별 슬라이스 목록을 돌려준다."""
+        sheet = node[1][0]
+        grid = self._grid(unit, sheet)
+        if node[0] == "ref":
+            r1, c1 = self._targets(unit, node[1][1])
+            grid.grow(int(r1.max()) + 1, int(c1.max()) + 1)
+            return grid, r1[:, None], c1[:, None], None
+        ra, ca = self._targets(unit, node[1][1])
+        rb, cb = self._targets(unit, node[1][2])
+        r1, r2 = np.minimum(ra, rb), np.maximum(ra, rb)
+        c1, c2 = np.minimum(ca, cb), np.maximum(ca, cb)
+        grid.grow(int(r2.max()) + 1, int(c2.max()) + 1)
+        h, w = r2 - r1 + 1, c2 - c1 + 1
+        if (h == h[0]).all() and (w == w[0]).all():
+            dr, dc = np.divmod(np.arange(h[0] * w[0]), w[0])
+            return grid, r1[:, None] + dr, c1[:, None] + dc, None
+        return grid, None, None, [(slice(a, b + 1), slice(x, y + 1)) for a, b, x, y in zip(r1, r2, c1, c2)]
+
+    def eval(self, unit: _Unit, node) -> _Vec:
+        n = len(unit.rows)
+        kind = node[0]
+        if kind == "num":
+            return _Vec(num=np.full(n, node[1]))
+        if kind in ("str", "bool"):
+            return _Vec(obj=np.full(n, node[1], dtype=object))
+        if kind == "ref":
+            grid, rr, cc, _ = self.cells(unit, node)
+            rr, cc = rr[:, 0], cc[:, 0]
+            num = grid.num[rr, cc]
+            if not np.isnan(num).any():
+                return _Vec(num=num)
+            return _Vec(obj=grid.obj[rr, cc])
+        if kind == "range":  # 집계 함수 밖의 범위(암시적 교차)는 지원하지 않는다
+            raise Unsupported("함수 인자가 아닌 범위 참조")
+        if kind == "neg":
+            v = self.eval(unit, node[1])
+            if v.num is not None:
+                return _Vec(num=-v.num)
+            return _from_obj(_arith("*", v.obj, -1.0))
+        if kind == "bin":
+            a, b = self.eval(unit, node[2]), self.eval(unit, node[3])
+            if a.num is not None and b.num is not None:
+                with np.errstate(all="ignore"):
+                    res = _NUMOPS[node[1]](a.num, b.num)
+                bad = ~np.isfinite(res)
+                if not bad.any():
+                    return _Vec(num=res)
+                obj = res.astype(object)
+                obj[bad] = DIV0 if node[1] == "/" else VALUE
+                return _Vec(obj=obj)
+            return _from_obj(_arith(node[1], a.obj, b.obj))
+        if kind == "cmp":
+            a, b = self.eval(unit, node[2]), self.eval(unit, node[3])
+            if a.num is not None and b.num is not None:
+                return _Vec(obj=_CMPOPS[node[1]](a.num, b.num).astype(object))
+            return _Vec(obj=_cmp(node[1], a.obj, b.obj))
+        if kind == "cat":
+            return _Vec(obj=_cat(self.eval(unit, node[1]).obj, self.eval(unit, node[2]).obj))
+        if node[1] == "IF":
+            return self._if(unit, node[2])
+        return self._aggregate(unit, node[1], node[2])
+
+    def _if(self, unit, args) -> _Vec:
+        cond = self.eval(unit, args[0])
+        if cond.num is not None:
+            truth, errs = cond.num != 0, None
+        else:
+            t = _truth(cond.obj)
+            errs = np.array([isinstance(v, FormulaError) for v in t])
+            truth = np.array([v is True for v in t])
+        a = self.eval(unit, args[1])
+        b = self.eval(unit, args[2]) if len(args) > 2 else _Vec(obj=np.full(len(truth), False, dtype=object))
+        if errs is None and a.num is not None and b.num is not None:
+            return _Vec(num=np.where(truth, a.num, b.num))
+        out = np.where(truth, a.obj, b.obj)
+        if errs is not None and errs.any():
+            out[errs] = t[errs]
+        return _from_obj(out)
+
+    def _aggregate(self, unit, fn: str, args) -> _Vec:
+        n = len(unit.rows)
+        total, count = np.zeros(n), np.zeros(n)
+        lo, hi = np.full(n, np.inf), np.full(n, -np.inf)
+        error = np.full(n, None, dtype=object)
+
+        def add(vals, cnt):
+            # vals: 기준 셀 x 칸 (숫자가 아닌 칸은 NaN)
+            nonlocal total, count, lo, hi
+            missing = np.isnan(vals)
+            total = total + np.where(missing, 0.0, vals).sum(axis=1)
+            count = count + cnt
+            lo = np.minimum(lo, np.where(missing, np.inf, vals).min(axis=1, initial=np.inf))
+            hi = np.maximum(hi, np.where(missing, -np.inf, vals).max(axis=1, initial=-np.inf))
+
+        for a in args:
+            if a[0] in ("ref", "range"):
+                # 참조/범위: 숫자 칸만 집계, 오류 칸이 있으면 그 오류
+                grid, rr, cc, slices = self.cells(unit, a)
+                if slices is None:
+                    vals, errs = grid.num[rr, cc], grid.err[rr, cc]
+                    add(vals, (~np.isnan(vals)).sum(axis=1))
+                    for i in np.flatnonzero(errs.any(axis=1)):
+                        if error[i] is None:
+                            error[i] = grid.obj[rr[i], cc[i]][errs[i]][0]
+                else:
+                    # 범위 크기가 기준 셀마다 다르면($B$2:B2 같은 누적 범위) 기준 셀마다 잘라 본다
+                    for i, (rs, cs) in enumerate(slices):
+                        block = grid.num[rs, cs].ravel()
+                        ok = block[~np.isnan(block)]
+                        total[i] += ok.sum()
+                        count[i] += len(ok)
+                        if len(ok):
+                            lo[i] = min(lo[i], ok.min())
+                            hi[i] = max(hi[i], ok.max())
+                        e = grid.err[rs, cs]
+                        if e.any() and error[i] is None:
+                            error[i] = grid.obj[rs, cs][e][0]
+                continue
+            v = self.eval(unit, a)
+            if v.num is not None:
+                add(v.num[:, None], np.ones(n))
+                continue
+            # 직접 준 값: 논리값/숫자 문자열도 숫자로 본다(COUNT는 숫자로 바뀌는 것만 센다)
+            nums = np.full(n, np.nan)
+            for i, x in enumerate(v.obj):
+                y = _num1(x)
+                if isinstance(y, FormulaError):
+                    if fn != "COUNT" and error[i] is None:
+                        error[i] = y
+                else:
+                    nums[i] = y
+            add(nums[:, None], (~np.isnan(nums)).astype(float))
+
+        if fn == "COUNT":
+            return _Vec(num=count)
+        if fn == "SUM":
+            res = total
+        elif fn == "AVERAGE":
+            with np.errstate(all="ignore"):
+                res = total / count
+        elif fn == "MIN":
+            res = np.where(count > 0, lo, 0.0)
+        else:
+            res = np.where(count > 0, hi, 0.0)
+        bad = np.array([e is not None for e in error]) | (count == 0 if fn == "AVERAGE" else False)
+        if not np.any(bad):
+            return _Vec(num=res)
+        obj = res.astype(object)
+        for i in np.flatnonzero(bad):
+            obj[i] = error[i] if error[i] is not None else DIV0
+        return _Vec(obj=obj)
+
+
+def _result(v):
+    # 수식 결과가 빈 칸 참조면 Excel은 0을 보여 준다
+    if v is None:
+        return 0.0
+    if isinstance(v, (np.floating, np.integer)):
+        return float(v)
+    if isinstance(v, np.bool_):
+        return bool(v)
+    return v
+
+
+def evaluate_workbook(path: str) -> tuple:
+    """수식을 계산해 ({시트: {(행, 열): 값}}, 통계)를 돌려준다. 통계는 수식 셀 수:
+    evaluated(계산함), unsupported(지원하지 않는 함수/문법), skipped(순환 참조이거나 계산 못 한 셀을 참조)."""
+    wb = load_workbook(path, read_only=True)
+    grids, formulas = {}, []
+    try:
+        for ws in wb.worksheets:
+            rows, width = [], 0
+            for r, row in enumerate(ws.iter_rows(), start=1):
+                vals = []
+                for cell in row:
+                    if cell.value is None:
+                        continue
+                    c = cell.column
+                    width = max(width, c)
+                    if cell.data_type == "f" and isinstance(cell.value, str):
+                        formulas.append((ws.title, r, c, cell.value[1:]))
+                    else:
+                        vals.append((c, cell.value))
+                rows.append(vals)
+            grids[ws.title] = _Grid(rows, width)
+    finally:
+        wb.close()
+
+    # 1) 같은 모양끼리 묶기 (상대 참조 키로 묶고, 토큰화/파싱은 모양마다 한 번)
+    groups: dict = defaultdict(list)
+    for sheet, r, c, text in formulas:
+        groups[(sheet, shape_key(text, r, c))].append((r, c, text))
+    units: list = []
+    bad_units: set = set()
+    for (sheet, _), cells in groups.items():
+        r0, c0, text = cells[0]
+        try:
+            ast = _Parser(tokenize(text, r0, c0)).parse()
+        except Unsupported:
+            ast = None  # 계산은 못 해도 이 셀을 참조하는 수식이 빈 칸으로 보지 않도록 단위는 남긴다
+        units.append(_Unit(sheet, ast, [r for r, _, _ in cells], [c for _, c, _ in cells]))
+        if ast is None:
+            bad_units.add(len(units) - 1)
+
+    ev = Evaluator(grids)
+    for i, u in enumerate(units):
+        g = grids[u.sheet]
+        g.grow(int(u.rows.max()) + 1, int(u.cols.max()) + 1)
+        g.unit[u.rows, u.cols] = i
+
+    # 2) 참조 관계. 자기 셀을 참조하는 그룹은 셀 하나씩으로 나눈다
+    def deps_of(u: _Unit) -> set:
+        out = set()
+        for node in _refs(u.ast):
+            grid, rr, cc, slices = ev.cells(u, node)
+            if slices is None:
+                out.update(np.unique(grid.unit[rr, cc]).tolist())
+            else:
+                for rs, cs in slices:
+                    out.update(np.unique(grid.unit[rs, cs]).tolist())
+        out.discard(-1)
+        return out
+
+    k = 0
+    split = set()
+    while k < len(units):
+        u = units[k]
+        if u.ast is not None and k not in bad_units:
+            try:
+                u.deps = deps_of(u)
+            except Unsupported:
+                bad_units.add(k)
+            if k in u.deps and len(u.rows) > 1:
+                for r, c in zip(u.rows[1:], u.cols[1:]):
+                    units.append(_Unit(u.sheet, u.ast, [r], [c]))
+                    grids[u.sheet].unit[r, c] = len(units) - 1
+                u.rows, u.cols = u.rows[:1], u.cols[:1]
+                split.add(k)
+                continue  # 나눈 뒤 다시 계산
+        k += 1
+    # 나뉘기 전에 참조 관계를 구한 단위는 나뉜 그룹을 첫 셀 하나로만 알고 있으므로, 그런 단위는 다시 구한다
+    # (나뉜 그룹의 셀을 참조하는 단위는 반드시 그 그룹 번호를 deps에 갖고 있다)
+    if split:
+        for i, u in enumerate(units):
+            if i not in bad_units and u.deps & split:
+                try:
+                    u.deps = deps_of(u)
+                except Unsupported:
+                    bad_units.add(i)
+
+    # 3) 위상 정렬 순서로 계산
+    users = defaultdict(list)
+    waiting = {}
+    for i, u in enumerate(units):
+        if i in bad_units:
+            continue
+        waiting[i] = len(u.deps)
+        for d in u.deps:
+            users[d].append(i)
+    ready = deque(i for i, n in waiting.items() if n == 0)
+    values: dict = defaultdict(dict)
+    done = set()
+    while ready:
+        i = ready.popleft()
+        u = units[i]
+        try:
+            res = ev.eval(u, u.ast).obj
+        except Unsupported:
+            bad_units.add(i)
+            continue
+        g = grids[u.sheet]
+        for r, c, v in zip(u.rows.tolist(), u.cols.tolist(), res):
+            v = _result(v)
+            g.set(r, c, v)
+            values[u.sheet][(r, c)] = v
+        done.add(i)
+        for j in users[i]:
+            waiting[j] -= 1
+            if waiting[j] == 0:
+                ready.append(j)
+
+    stats = {"evaluated": sum(len(units[i].rows) for i in done),
+             "unsupported": sum(len(units[i].rows) for i in bad_units),
+             "skipped": sum(len(u.rows) for i, u in enumerate(units) if i not in done and i not in bad_units)}
+    return dict(values), stats
+
+
+# =========================
+# 캐시값 쓰기 (시트 XML 패치)
+# =========================
+_NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+       "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+       "rel": "http://schemas.openxmlformats.org/package/2006/relationships"}
+_CELL_XML = re.compile(r"<c\b([^>]*?)(?<!/)>(.*?)</c>", re.S)
+_F_XML = re.compile(r"<f\b[^>]*/>|<f\b[^>]*>.*?</f>", re.S)
+_R_ATTR = re.compile(r'\sr="([A-Za-z]+)(\d+)"')
+_T_ATTR = re.compile(r'\st="[^"]*"')
+
+
+def sheet_parts(zf: zipfile.ZipFile) -> dict:
+    """시트 이름 -> zip 안의 워크시트 XML 경로"""
+    wb = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    target = {r.get("Id"): r.get("Target") for r in rels.findall("rel:Relationship", _NS)}
+    out = {}
+    for s in wb.find("m:sheets", _NS):
+        t = target.get(s.get(f"{{{_NS['r']}}}id"))
+        if t:
+            out[s.get("name")] = t.lstrip("/") if t.startswith("/") else posixpath.normpath(posixpath.join("xl", t))
+    return out
+
+
+def _cached(v) -> tuple:
+    """값 -> (t 속성, <v> 내용)"""
+    if isinstance(v, FormulaError):
+        return "e", str(v)
+    if isinstance(v, bool):
+        return "b", "1" if v else "0"
+    if isinstance(v, float):
+        return None, str(int(v)) if v.is_integer() and abs(v) < 1e15 else repr(v)
+    if isinstance(v, int):
+        return None, str(v)
+    return "str", escape(str(v))
+
+
+def _patch_cell(m, values: dict):
+    attrs, inner = m.group(1), m.group(2)
+    ref = _R_ATTR.search(attrs)
+    f = _F_XML.search(inner)
+    if not ref or not f:
+        return m.group(0)
+    v = values.get((int(ref.group(2)), column_index_from_string(ref.group(1).upper())))
+    if v is None:
+        return m.group(0)
+    t, text = _cached(v)
+    attrs = _T_ATTR.sub("", attrs) + (f' t="{t}"' if t else "")
+    return f"<c{attrs}>{f.group(0)}<v>{text}</v></c>"
+
+
+def _patch_stream(src, dst, values: dict, chunk_size: int = 1 << 20) -> None:
+    # </row> 단위로 끊어 처리하므로 시트 XML 전체를 메모리에 올리지 않는다
+    dec = codecs.getincrementaldecoder("utf-8")()
+    carry = ""
+    while True:
+        block = src.read(chunk_size)
+        text = carry + dec.decode(block, final=not block)
+        if not block:
+            dst.write(_CELL_XML.sub(lambda m: _patch_cell(m, values), text).encode("utf-8"))
+            return
+        cut = text.rfind("</row>")
+        if cut < 0:
+            carry = text
+            continue
+        cut += len("</row>")
+        dst.write(_CELL_XML.sub(lambda m: _patch_cell(m, values), text[:cut]).encode("utf-8"))
+        carry = text[cut:]
+
+
+def write_cached_values(src: str, dst: str, values: dict) -> None:
+    """src를 dst로 복사하면서 values({시트: {(행, 열): 값}})의 수식 셀에 캐시값을 넣는다."""
+    with zipfile.ZipFile(src) as zin:
+        parts = {p: values[name] for name, p in sheet_parts(zin).items() if values.get(name)}
+        with zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                out_info = zipfile.ZipInfo(info.filename, info.date_time)
+                out_info.compress_type = info.compress_type
+                out_info.external_attr = info.external_attr
+                with zin.open(info) as fin, zout.open(out_info, "w", force_zip64=info.file_size > 1 << 30) as fout:
+                    if info.filename in parts:
+                        _patch_stream(fin, fout, parts[info.filename])
+                    else:
+                        shutil.copyfileobj(fin, fout, 1 << 20)
+
+
+def fill_cached_values(src: str, dst: str | None = None) -> dict:
+    """src의 수식을 계산해 캐시값을 넣은 파일을 dst(기본: src 제자리)에 쓴다. 통계를 돌려준다."""
+    values, stats = evaluate_workbook(src)
+    dst = dst or src
+    fd, tmp = tempfile.mkstemp(suffix=".xlsx", dir=os.path.dirname(os.path.abspath(dst)))
+    os.close(fd)
+    try:
+        write_cached_values(src, tmp, values)
+        os.replace(tmp, dst)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return stats
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="xlsx 수식(SUM/AVERAGE/MIN/MAX/COUNT/IF)을 계산해 캐시값을 저장")
+    ap.add_argument("src")
+    ap.add_argument("dst", nargs="?", help="출력 파일(기본: src를 제자리 갱신)")
+    args = ap.parse_args(argv)
+    stats = fill_cached_values(args.src, args.dst)
+    print(f"✔ {args.dst or args.src}: 수식 {stats['evaluated']:,}개 계산"
+          + (f", 지원하지 않는 수식 {stats['unsupported']:,}개" if stats["unsupported"] else "")
+          + (f", 계산하지 못한 수식 {stats['skipped']:,}개(순환 참조/미지원 수식 참조)" if stats["skipped"] else ""))
+
+
+if __name__ == "__main__":
+    main()